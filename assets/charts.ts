@@ -20,6 +20,7 @@ interface DisplayInfo {
   plain: object;
   logic: {
     color: string,
+    cursor: number,
     epoch: number,
     stamp: string,
   };
@@ -109,6 +110,8 @@ class Graph {
   private template: HTMLTemplateElement;
   private bucket: HTMLElement;
   private chart: ZoomChart;
+  private slugs: string[] = [];
+  private cursor: (number | null) = null;
 
   private config: AxiosRequestConfig = {
     baseURL: conf.apiPlotBaseUrl,
@@ -220,9 +223,21 @@ class Graph {
     clone.classList.remove("is-hidden");
   }
 
+  private advance(payload: DispChartDataSets[]): void {
+    for (const obj of payload) {
+      const cursor: (number | undefined) = obj.display?.logic.cursor;
+      if (cursor !== undefined && (this.cursor === null || cursor > this.cursor)) {
+        this.cursor = cursor;
+      }
+    }
+  }
+
   private attach(payload: DispChartDataSets[]): void {
     if (!this.chart.data || !this.chart.data.datasets) { return; }
     this.chart.data.datasets = [];
+    this.slugs = [];
+    this.cursor = null;
+    this.advance(payload);
 
     for (const idx in payload) {
       if (payload.hasOwnProperty(idx)) {
@@ -232,6 +247,7 @@ class Graph {
           obj.backgroundColor = colorLighten(obj.borderColor as string);
         }
         if (obj.display) {
+          this.slugs[idx] = (obj.display.plain as any).slug;
           this.paint(obj.display);
           delete obj.display;
         }
@@ -242,14 +258,56 @@ class Graph {
     this.chart.update({duration: 0});
   }
 
+  private extend(payload: DispChartDataSets[]): boolean {
+    const datasets = this.chart.data?.datasets;
+    if (!datasets || datasets.length !== payload.length) { return false; }
+
+    const horizon: number = Date.now() - conf.apiPlotBacklogMs;
+    const limit: number = 2 * conf.apiPlotPoints;
+
+    for (const idx in payload) {
+      if (payload.hasOwnProperty(idx)) {
+        const obj: DispChartDataSets = payload[idx];
+        if (!obj.display) { return false; }
+        if (this.slugs[idx] !== (obj.display.plain as any).slug) {
+          return false;
+        }
+
+        const fresh = (obj.data ?? []) as Chart.ChartPoint[];
+        const kept = (datasets[idx].data ?? []) as Chart.ChartPoint[];
+        const data = fresh.concat(
+          kept.filter((point) => (point.x as number) > horizon),
+        ).sort((one, two) => (two.x as number) - (one.x as number));
+        if (limit > 0 && data.length > limit) { return false; }
+
+        datasets[idx].data = data;
+        this.paint(obj.display);
+      }
+    }
+
+    this.advance(payload);
+    this.chart.update({duration: 0});
+    return true;
+  }
+
   private refresh(): void {
+    const since: (number | null) = this.cursor;
+    let reload: boolean = false;
+
     this.showBar();
     this.hideBucket();
     this.clearBucket();
 
-    axios.get(this.slug, this.config)
+    const params: object = (since === null) ? {} : { since };
+    axios.get(this.slug, { ...this.config, params })
       .then((res: AxiosResponse): void => {
-        this.attach(res.data as DispChartDataSets[]);
+        const payload: DispChartDataSets[] = res.data as DispChartDataSets[];
+        if (since === null) {
+          this.attach(payload);
+        } else if (!this.extend(payload)) {
+          this.cursor = null;
+          reload = true;
+        }
       })
       .catch((err: AxiosError): void => {
         // tslint:disable-next-line
@@ -259,6 +317,7 @@ class Graph {
         this.hideBar();
         this.dropdownBucket();
         this.showBucket();
+        if (reload) { this.refresh(); }
       });
   }
 
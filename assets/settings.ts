@@ -10,7 +10,9 @@ class Settings {
     }
   }
 
+  public get apiPlotBacklogMs(): number { return parseInt(this.store.apiPlotBacklogMs || "0", 10); }
   public get apiPlotBaseUrl(): string { return this.store.apiPlotBaseUrl || ""; }
+  public get apiPlotPoints(): number { return parseInt(this.store.apiPlotPoints || "0", 10); }
   public get apiPlotRefreshMs(): number { return parseInt(this.store.apiPlotRefreshMs || "10000", 10); }
   public get apiSpaceApiUrl(): string { return this.store.apiSpaceApiUrl || ""; }
   public get momentDefaultFormat(): string { return this.store.momentDefaultFormat || ""; }
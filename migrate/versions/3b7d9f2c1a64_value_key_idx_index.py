@@ -0,0 +1,52 @@
+'''
+value key idx index
+
+Revision ID: 3b7d9f2c1a64
+Revises: e93b5d2a6c18
+Create Date: 2021-01-25 09:12:38.540217
+'''
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d9f2c1a64'
+down_revision = 'e93b5d2a6c18'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_value_key_idx'
+
+
+def _present():
+    inspector = sa.inspect(op.get_bind())
+    if 'value' not in inspector.get_table_names():
+        return None
+    return set(idx['name'] for idx in inspector.get_indexes('value'))
+
+
+def upgrade():
+    present = _present()
+    if present is None or INDEX in present:
+        return
+
+    op.execute(
+        '''
+        DELETE FROM value WHERE prime NOT IN (
+            SELECT newest FROM (
+                SELECT MAX(prime) AS newest FROM value
+                GROUP BY "key", idx
+            ) AS keep
+        )
+        '''
+    )
+    op.create_index(INDEX, 'value', ['key', 'idx'], unique=True)
+
+
+def downgrade():
+    present = _present()
+    if present is None or INDEX not in present:
+        return
+
+    op.drop_index(INDEX, table_name='value')
@@ -0,0 +1,49 @@
+'''
+point time series index
+
+Revision ID: 5e2c4a1f7b90
+Revises:
+Create Date: 2021-01-23 14:05:12.417302
+'''
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2c4a1f7b90'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDICES = {
+    'ix_point_sensor_prime_created': ['sensor_prime', 'created'],
+    'ix_point_user_prime_created': ['user_prime', 'created'],
+}
+
+
+def _present():
+    inspector = sa.inspect(op.get_bind())
+    if 'point' not in inspector.get_table_names():
+        return None
+    return set(idx['name'] for idx in inspector.get_indexes('point'))
+
+
+def upgrade():
+    present = _present()
+    if present is None:
+        return
+
+    for name, columns in INDICES.items():
+        if name not in present:
+            op.create_index(name, 'point', columns, unique=False)
+
+
+def downgrade():
+    present = _present()
+    if present is None:
+        return
+
+    for name in INDICES:
+        if name in present:
+            op.drop_index(name, table_name='point')
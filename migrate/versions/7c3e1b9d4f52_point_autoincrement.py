@@ -0,0 +1,59 @@
+'''
+point autoincrement
+
+Revision ID: 7c3e1b9d4f52
+Revises: 3b7d9f2c1a64
+Create Date: 2021-01-26 10:41:07.318264
+'''
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e1b9d4f52'
+down_revision = '3b7d9f2c1a64'
+branch_labels = None
+depends_on = None
+
+
+def _present():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return None
+    schema = bind.execute(
+        sa.text(
+            '''
+            SELECT sql FROM sqlite_master
+            WHERE type = 'table' AND name = 'point'
+            '''
+        )
+    ).scalar()
+    if schema is None:
+        return None
+    return 'AUTOINCREMENT' in schema.upper()
+
+
+def _recreate(autoincrement):
+    with op.batch_alter_table(
+        'point',
+        recreate='always',
+        table_kwargs={'sqlite_autoincrement': autoincrement},
+    ):
+        pass
+
+
+def upgrade():
+    present = _present()
+    if present is None or present:
+        return
+
+    _recreate(True)
+
+
+def downgrade():
+    present = _present()
+    if present is None or not present:
+        return
+
+    _recreate(False)
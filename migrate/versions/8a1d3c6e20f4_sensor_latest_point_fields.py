@@ -0,0 +1,80 @@
+'''
+sensor latest point fields
+
+Revision ID: 8a1d3c6e20f4
+Revises: 5e2c4a1f7b90
+Create Date: 2021-01-24 11:32:47.129455
+'''
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a1d3c6e20f4'
+down_revision = '5e2c4a1f7b90'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('latest_value', 'latest_created', 'latest_user_prime')
+
+
+def _present():
+    inspector = sa.inspect(op.get_bind())
+    if 'sensor' not in inspector.get_table_names():
+        return None
+    return set(col['name'] for col in inspector.get_columns('sensor'))
+
+
+def _newest(column):
+    return f'''(
+        SELECT point.{column} FROM point
+        WHERE point.sensor_prime = sensor.prime
+        ORDER BY point.created DESC, point.prime DESC
+        LIMIT 1
+    )'''
+
+
+def upgrade():
+    present = _present()
+    if present is None or all(col in present for col in COLUMNS):
+        return
+
+    with op.batch_alter_table('sensor') as batch_op:
+        batch_op.add_column(
+            sa.Column('latest_value', sa.Float(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column('latest_created', sa.DateTime(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column(
+                'latest_user_prime',
+                sa.Integer(),
+                sa.ForeignKey(
+                    'user.prime',
+                    name='fk_sensor_latest_user_prime_user',
+                    ondelete='SET NULL',
+                ),
+                nullable=True,
+            )
+        )
+
+    op.execute(
+        f'''
+        UPDATE sensor SET
+            latest_value = {_newest('value')},
+            latest_created = {_newest('created')},
+            latest_user_prime = {_newest('user_prime')}
+        '''
+    )
+
+
+def downgrade():
+    present = _present()
+    if present is None or not any(col in present for col in COLUMNS):
+        return
+
+    with op.batch_alter_table('sensor') as batch_op:
+        for column in COLUMNS:
+            batch_op.drop_column(column)
@@ -0,0 +1,58 @@
+'''
+point count columns
+
+Revision ID: c47f0b9e3d21
+Revises: 8a1d3c6e20f4
+Create Date: 2021-01-24 14:08:19.503761
+'''
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47f0b9e3d21'
+down_revision = '8a1d3c6e20f4'
+branch_labels = None
+depends_on = None
+
+TABLES = (('sensor', 'sensor_prime'), ('user', 'user_prime'))
+
+
+def _tables(*, present):
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    for table, column in TABLES:
+        if table not in tables:
+            continue
+        columns = set(col['name'] for col in inspector.get_columns(table))
+        if ('point_count' in columns) == present:
+            yield table, column
+
+
+def upgrade():
+    for table, column in _tables(present=False):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(
+                sa.Column(
+                    'point_count',
+                    sa.Integer(),
+                    nullable=False,
+                    server_default='0',
+                )
+            )
+
+        op.execute(
+            f'''
+            UPDATE "{table}" SET point_count = (
+                SELECT COUNT(*) FROM point
+                WHERE point.{column} = "{table}".prime
+            )
+            '''
+        )
+
+
+def downgrade():
+    for table, _ in _tables(present=True):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('point_count')
@@ -0,0 +1,60 @@
+'''
+rollup table
+
+Revision ID: e93b5d2a6c18
+Revises: c47f0b9e3d21
+Create Date: 2021-01-24 16:41:03.872215
+'''
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e93b5d2a6c18'
+down_revision = 'c47f0b9e3d21'
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    return sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade():
+    if 'rollup' in _tables():
+        return
+
+    op.create_table(
+        'rollup',
+        sa.Column('prime', sa.Integer(), nullable=False),
+        sa.Column('sensor_prime', sa.Integer(), nullable=False),
+        sa.Column(
+            'tier',
+            sa.Enum('MINUTE', 'HOUR', 'DAY', name='enumtier'),
+            nullable=False,
+        ),
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('length', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('minimum', sa.Float(), nullable=False),
+        sa.Column('maximum', sa.Float(), nullable=False),
+        sa.Column('last_value', sa.Float(), nullable=False),
+        sa.Column('last_created', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_prime'], ['sensor.prime']),
+        sa.PrimaryKeyConstraint('prime'),
+        sa.UniqueConstraint(
+            'sensor_prime',
+            'tier',
+            'bucket',
+            name='uq_rollup_sensor_prime_tier_bucket',
+        ),
+    )
+
+
+def downgrade():
+    if 'rollup' not in _tables():
+        return
+
+    op.drop_table('rollup')
+    sa.Enum(name='enumtier').drop(op.get_bind(), checkfirst=True)
@@ -1,6 +1,6 @@
 from flask import Flask
 
-from observatory.instance import SPACE_API
+from observatory.instance import RETENTION, SPACE_API
 from observatory.lib.cli import BP_CLI
 from observatory.rest.charts import BP_REST_CHARTS
 from observatory.rest.mapper import BP_REST_MAPPER
@@ -8,6 +8,7 @@ from observatory.rest.owners import BP_REST_OWNERS
 from observatory.rest.prompt import BP_REST_PROMPT
 from observatory.rest.sensor import BP_REST_SENSOR
 from observatory.rest.sp_api import BP_REST_SP_API
+from observatory.rest.stream import BP_REST_STREAM
 from observatory.shared import (
     errorhandler,
     form_drop_mapper,
@@ -67,6 +68,7 @@ def create_app(config_obj):
     register_template_functions(app)
 
     configure_jinja(app)
+    register_background(app)
 
     return app
 
@@ -98,6 +100,7 @@ def register_blueprints(app):
     app.register_blueprint(BP_REST_PROMPT)
     app.register_blueprint(BP_REST_SENSOR)
     app.register_blueprint(BP_REST_SP_API)
+    app.register_blueprint(BP_REST_STREAM)
 
 
 def register_template_functions(app):
@@ -143,3 +146,12 @@ def register_template_functions(app):
 def configure_jinja(app):
     app.jinja_env.lstrip_blocks = True
     app.jinja_env.trim_blocks = True
+
+
+def register_background(app):
+    if app.config.get('SP_API_ENABLE', False) and app.config.get(
+        'SP_API_BACKGROUND', False
+    ):
+        SPACE_API.start(app)
+    if app.config.get('RETENTION_BACKGROUND', False):
+        RETENTION.start(app)
@@ -1,7 +1,10 @@
 from datetime import datetime
 from logging import getLogger
 
+from sqlalchemy import func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.sql.expression import FunctionElement
 
 from observatory.lib.clock import (
     epoch_milliseconds,
@@ -23,6 +26,30 @@ TXT_LEN_SHORT = 256
 # pylint: disable=too-many-ancestors
 
 
+class epoch_bucket(FunctionElement):  # pylint: disable=invalid-name
+    type = DB.Integer()
+    name = 'epoch_bucket'
+
+    def __init__(self, column, span):
+        self.span = int(span)
+        super().__init__(column)
+
+
+@compiles(epoch_bucket)
+def _epoch_bucket(element, compiler, **kwargs):
+    column = compiler.process(element.clauses, **kwargs)
+    return f'FLOOR(EXTRACT(EPOCH FROM {column}) / {element.span}) * {element.span}'
+
+
+@compiles(epoch_bucket, 'sqlite')
+def _epoch_bucket_sqlite(element, compiler, **kwargs):
+    column = compiler.process(element.clauses, **kwargs)
+    return (
+        f"CAST(strftime('%s', {column}) AS INTEGER)"
+        f' / {element.span} * {element.span}'
+    )
+
+
 class CRUDMixin:
     @classmethod
     def create(cls, _commit=True, **kwargs):
@@ -97,6 +124,12 @@ class CommonMixin:
     def by_slug(cls, slug):
         return cls.query.filter(cls.slug == slug).first()
 
+    @classmethod
+    def by_slugs(cls, slugs):
+        if not slugs:
+            return []
+        return cls.query.filter(cls.slug.in_(set(slugs))).all()
+
 
 class CreatedMixin:
     @declared_attr
@@ -123,6 +156,53 @@ class CreatedMixin:
         return query.order_by(cls.created.desc())
 
 
+class CountMixin:
+    @declared_attr
+    def point_count(_):
+        return DB.Column(
+            DB.Integer(), nullable=False, default=0, server_default='0'
+        )
+
+    @classmethod
+    def _get_class_count_column(cls):
+        table, column = cls.count_column.split('.')
+        return cls.metadata.tables[table].c[column]
+
+    @property
+    def length(self):
+        return self.point_count
+
+    @classmethod
+    def count_shift(cls, connection, shifts):
+        table = cls.__table__
+        for prime, delta in shifts.items():
+            if not delta:
+                continue
+            connection.execute(
+                table.update()
+                .where(table.c.prime == prime)
+                .values(point_count=table.c.point_count + delta)
+            )
+
+    @classmethod
+    def count_rebuild(cls, connection, *, primes=None):
+        table = cls.__table__
+        column = cls._get_class_count_column()
+
+        query = table.update()
+        if primes is not None:
+            query = query.where(table.c.prime.in_(primes))
+
+        return connection.execute(
+            query.values(
+                point_count=DB.select([func.count()])
+                .select_from(column.table)
+                .where(column == table.c.prime)
+                .as_scalar()
+            )
+        ).rowcount
+
+
 class SortMixin:
     @declared_attr
     def sortkey(cls):
@@ -1,3 +1,9 @@
+from observatory.logic.charts_cache import ChartsCache
+from observatory.logic.retention import Retention
 from observatory.logic.space_api import SpaceApi
+from observatory.logic.stream import Stream
 
+CHARTS_CACHE = ChartsCache()
+RETENTION = Retention()
 SPACE_API = SpaceApi()
+STREAM = Stream()
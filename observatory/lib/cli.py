@@ -4,9 +4,11 @@ from math import pi, sin
 import click
 from flask import Blueprint
 
+from observatory.instance import RETENTION
 from observatory.lib.clock import epoch_seconds
 from observatory.lib.text import is_slugable
 from observatory.models.point import Point
+from observatory.models.rollup import Rollup
 from observatory.models.sensor import Sensor
 from observatory.models.user import User
 from observatory.start.extensions import DB
@@ -70,11 +72,53 @@ def sensorclear(slug):
         click.secho(f'{slug} not present!', fg='red')
         return
 
-    number = Point.query.with_parent(sensor).delete()
+    query = Point.query.with_parent(sensor)
+    users = [
+        elem.user_prime
+        for elem in query.with_entities(Point.user_prime).distinct()
+    ]
+    number = query.delete()
+    Rollup.query.filter(Rollup.sensor_prime == sensor.prime).delete()
+
+    connection = DB.session.connection()
+    Sensor.latest_rebuild(connection, primes=[sensor.prime])
+    Sensor.count_rebuild(connection, primes=[sensor.prime])
+    User.count_rebuild(connection, primes=users)
     DB.session.commit()
     click.echo(f'deleted {number} points from {slug}')
 
 
+@BP_CLI.cli.command('retention', help='Remove outdated points')
+def retention():
+    number = RETENTION.sweep()
+    click.echo(f'deleted {number} outdated points')
+
+
+@BP_CLI.cli.command('pointcount', help='Rebuild point counters')
+def pointcount():
+    connection = DB.session.connection()
+    sensors = Sensor.count_rebuild(connection)
+    users = User.count_rebuild(connection)
+    DB.session.commit()
+    click.echo(f'counted points for {sensors} sensors and {users} users')
+
+
+@BP_CLI.cli.command('rollup', help='Rebuild rollups from points')
+@click.option('--slug', default=None)
+def rollup(slug):
+    primes = None
+    if slug is not None:
+        sensor = Sensor.by_slug(slug)
+        if not sensor:
+            click.secho(f'{slug} not present!', fg='red')
+            return
+        primes = [sensor.prime]
+
+    number = Rollup.backfill(DB.session.connection(), sensor_primes=primes)
+    DB.session.commit()
+    click.echo(f'created {number} rollup buckets')
+
+
 @BP_CLI.cli.command('sensorcurve', help='Draw a curve of points on sensor')
 @click.option('--slug', prompt=True)
 @click.option('--username', prompt=True)
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from observatory.start.environment import BACKLOG_DAYS, FMT_STRFTIME
 
@@ -16,8 +16,26 @@ def epoch_milliseconds(stamp):
     return 1000 * seconds
 
 
+def from_epoch_milliseconds(value):
+    if isinstance(value, bool) or not isinstance(value, (float, int)):
+        return None
+    return datetime.utcfromtimestamp(0) + timedelta(milliseconds=value)
+
+
+def naive_utc(stamp):
+    if not isinstance(stamp, datetime):
+        return None
+    if stamp.tzinfo is None:
+        return stamp
+    return stamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def outdated_since(days=BACKLOG_DAYS):
+    return datetime.utcnow() - timedelta(days=days)
+
+
 def is_outdated(stamp, days=BACKLOG_DAYS):
-    return stamp <= datetime.utcnow() - timedelta(days=days)
+    return stamp <= outdated_since(days)
 
 
 def time_format(stamp, fmt=FMT_STRFTIME):
@@ -0,0 +1,63 @@
+from math import floor
+
+
+def _edges(num, every):
+    return int(floor(num * every)) + 1, int(floor((num + 1) * every)) + 1
+
+
+def lttb(points, threshold, *, xkey='x', ykey='y'):
+    size = len(points)
+    if not threshold or size <= max(3, threshold):
+        return list(points)
+
+    threshold = max(3, threshold)
+    every = (size - 2) / (threshold - 2)
+
+    result = [points[0]]
+    anchor = points[0]
+    for num in range(threshold - 2):
+        low, high = _edges(num, every)
+        nlow, nhigh = _edges(num + 1, every)
+        nxt = points[nlow : min(nhigh, size)] or [points[-1]]
+
+        avg_x = sum(elem[xkey] for elem in nxt) / len(nxt)
+        avg_y = sum(elem[ykey] for elem in nxt) / len(nxt)
+
+        best, area = None, -1.0
+        for elem in points[low:high]:
+            cur = abs(
+                (anchor[xkey] - avg_x) * (elem[ykey] - anchor[ykey])
+                - (anchor[xkey] - elem[xkey]) * (avg_y - anchor[ykey])
+            )
+            if cur > area:
+                best, area = elem, cur
+
+        if best is not None:
+            result.append(best)
+            anchor = best
+
+    result.append(points[-1])
+    return result
+
+
+def minmax(points, threshold, *, ykey='y'):
+    size = len(points)
+    if not threshold or size <= max(4, threshold):
+        return list(points)
+
+    buckets = max(1, (threshold - 2) // 2)
+    every = (size - 2) / buckets
+
+    result = [points[0]]
+    for num in range(buckets):
+        low, high = _edges(num, every)
+        chunk = range(low, min(high, size - 1))
+        if not chunk:
+            continue
+
+        lowest = min(chunk, key=lambda idx: points[idx][ykey])
+        highest = max(chunk, key=lambda idx: points[idx][ykey])
+        result.extend(points[idx] for idx in sorted({lowest, highest}))
+
+    result.append(points[-1])
+    return result
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+
+from observatory.start.environment import API_PLOT_CACHE
+
+
+class ChartsCache:
+    def __init__(self, *, size=API_PLOT_CACHE):
+        self._log = getLogger(self.__class__.__name__)
+
+        self.size = size
+
+        self._content = {}
+        self._sensors = {}
+        self._lock = Lock()
+
+    def get(self, slug, key, *, etag):
+        with self._lock:
+            entry = self._content.get(slug, {}).get(key, None)
+        if entry is None:
+            return None
+
+        have, body = entry
+        if have != etag:
+            return None
+        return body
+
+    def put(self, slug, key, *, etag, sensors, body):
+        if self.size <= 0:
+            return body
+
+        with self._lock:
+            entries = self._content.setdefault(slug, OrderedDict())
+            entries.pop(key, None)
+            entries[key] = (etag, body)
+            while len(entries) > self.size:
+                entries.popitem(last=False)
+
+            self._sensors[slug] = frozenset(sensors)
+        return body
+
+    def _drop(self, slugs):
+        result = 0
+        for slug in slugs:
+            result += len(self._content.pop(slug, {}))
+            self._sensors.pop(slug, None)
+
+        if result:
+            self._log.info('invalidated %d cached charts', result)
+        return result
+
+    def invalidate(self, *slugs):
+        with self._lock:
+            return self._drop(slugs)
+
+    def invalidate_sensors(self, *primes):
+        primes = set(primes)
+        with self._lock:
+            return self._drop(
+                [
+                    slug
+                    for slug, sensors in self._sensors.items()
+                    if not primes.isdisjoint(sensors)
+                ]
+            )
+
+    def clear(self):
+        with self._lock:
+            self._content.clear()
+            self._sensors.clear()
+            return all((not self._content, not self._sensors))
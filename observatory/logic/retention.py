@@ -0,0 +1,88 @@
+from datetime import datetime
+from logging import getLogger
+from threading import Event, Lock, Thread
+
+from observatory.models.sensor import Sensor
+from observatory.start.environment import RETENTION_REFRESH, RETENTION_WRITES
+
+
+class Retention:
+    def __init__(self, *, writes=RETENTION_WRITES, refresh=RETENTION_REFRESH):
+        self._log = getLogger(self.__class__.__name__)
+
+        self.writes = writes
+        self.refresh = refresh
+
+        self._count = 0
+        self._last = None
+        self._lock = Lock()
+
+        self._halt = Event()
+        self._wake = Event()
+        self._thread = None
+
+    @property
+    def due(self):
+        if self._last is None:
+            return True
+        if 0 < self.writes <= self._count:
+            return True
+        if (datetime.utcnow() - self._last).total_seconds() > self.refresh:
+            return True
+        return False
+
+    def sweep(self, _commit=True):
+        with self._lock:
+            count, self._count = self._count, 0
+            self._last = datetime.utcnow()
+        self._log.info('sweeping outdated points after %d writes', count)
+        return Sensor.cleanup(_commit=_commit)
+
+    def tick(self, num=1):
+        with self._lock:
+            self._count += num
+        if self.due:
+            self._wake.set()
+            return True
+        return False
+
+    def start(self, app, *, interval=None):
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        interval = (
+            interval if interval is not None else max(1, self.refresh // 2)
+        )
+
+        def _run():
+            while not self._halt.is_set():
+                self._wake.wait(interval)
+                self._wake.clear()
+                if self._halt.is_set() or not self.due:
+                    continue
+                with app.app_context():
+                    try:
+                        self.sweep()
+                    except Exception:  # pylint: disable=broad-except
+                        self._log.exception('background sweep failed')
+
+        self._log.info('starting background sweep every %ds', interval)
+        self._halt.clear()
+        self._thread = Thread(target=_run, name='retention', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._halt.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        return self._thread is None
+
+    def clear(self):
+        self._wake.clear()
+        with self._lock:
+            self._count = 0
+            self._last = None
+        return all((self._count == 0, self._last is None))
@@ -1,9 +1,17 @@
+from contextlib import contextmanager
 from datetime import datetime
+from hashlib import sha1
 from logging import getLogger
+from threading import Event, Lock, Thread, local
 
 from observatory.models.mapper import EnumConvert, EnumHorizon
+from observatory.models.point import Point
 from observatory.models.value import Value
-from observatory.start.environment import SP_API_PREFIX, SP_API_REFRESH
+from observatory.start.environment import (
+    SP_API_LIVE_REFRESH,
+    SP_API_PREFIX,
+    SP_API_REFRESH,
+)
 
 # pylint: disable=too-many-arguments
 # pylint: disable=too-many-public-methods
@@ -15,14 +23,47 @@ class SpaceApi:
 
         self._content = None
         self._last = None
+        self._live = None
+        self._live_last = None
+        self._merged = None
+        self._local = local()
+        self._lock = Lock()
+        self._payload = None
 
-    @staticmethod
-    def _by_key(*, key):
-        return Value.by_key(key=f'{SP_API_PREFIX}.{key}')
+        self._halt = Event()
+        self._thread = None
 
     @staticmethod
-    def _get(*, key, idx=0):
-        return Value.get(key=f'{SP_API_PREFIX}.{key}', idx=idx)
+    def load():
+        start = len(f'{SP_API_PREFIX}.')
+        return {
+            (elem.key[start:], elem.idx): elem
+            for elem in Value.by_prefix(prefix=SP_API_PREFIX)
+        }
+
+    @contextmanager
+    def snapshot(self):
+        past = getattr(self._local, 'values', None)
+        self._local.values = past if past is not None else self.load()
+        try:
+            yield self._local.values
+        finally:
+            self._local.values = past
+
+    def _values(self):
+        values = getattr(self._local, 'values', None)
+        return values if values is not None else self.load()
+
+    def _by_key(self, *, key, values=None):
+        values = values if values is not None else self._values()
+        return sorted(
+            (elem for (name, _), elem in values.items() if name == key),
+            key=lambda elem: elem.idx,
+        )
+
+    def _get(self, *, key, idx=0):
+        elem = self._values().get((key, idx), None)
+        return elem.elem if elem is not None else None
 
     def _get_all(self, *, key):
         return [
@@ -36,28 +77,39 @@ class SpaceApi:
 
     def latest_value(self, *, key, idx=0, convert):
         sensor = self._get(key=key, idx=idx)
-        if sensor is None or sensor.latest is None:
+        if sensor is None or sensor.latest_value is None:
             return None
 
-        return sensor.latest.translate(
-            horizon=EnumHorizon.NORMAL, convert=convert, numeric=False
+        return Point.translate_value(
+            sensor.latest_value,
+            horizon=EnumHorizon.NORMAL,
+            convert=convert,
+            numeric=False,
         )
 
     def _indices_any(self, *keys):
+        values = self._values()
         result = set()
         for key in keys:
             result = result.union(
-                elem.idx for elem in self._by_key(key=key) if elem is not None
+                elem.idx
+                for elem in self._by_key(key=key, values=values)
+                if elem is not None
             )
         return sorted(result)
 
     def _indices_all(self, first, *keys):
+        values = self._values()
         result = set(
-            elem.idx for elem in self._by_key(key=first) if elem is not None
+            elem.idx
+            for elem in self._by_key(key=first, values=values)
+            if elem is not None
         )
         for key in keys:
             result = result.intersection(
-                elem.idx for elem in self._by_key(key=key) if elem is not None
+                elem.idx
+                for elem in self._by_key(key=key, values=values)
+                if elem is not None
             )
         return sorted(result)
 
@@ -203,6 +255,337 @@ class SpaceApi:
         return []
 
     def build(self):
+        with self.snapshot():
+            return {**self.build_static(), **self.build_live()}
+
+    def build_static(self):
+        with self.snapshot():
+            return self._build_static()
+
+    def build_live(self):
+        with self.snapshot():
+            return {
+                'state': self.get_state(),
+                'sensors': self._build_sensors(),
+            }
+
+    def _build_sensors(self):
+        return {
+            'temperature': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.temperature.value',
+                        idx=idx,
+                        convert=EnumConvert.NATURAL,
+                    ),
+                    'unit': self._get(key='sensors.temperature.unit', idx=idx),
+                    'location': self._get(
+                        key='sensors.temperature.location', idx=idx
+                    ),
+                    'name': self._get(key='sensors.temperature.name', idx=idx),
+                    'description': self._get(
+                        key='sensors.temperature.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_temperature_indices
+            ],
+            'door_locked': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.door_locked.value',
+                        idx=idx,
+                        convert=EnumConvert.BOOLEAN,
+                    ),
+                    'location': self._get(
+                        key='sensors.door_locked.location', idx=idx
+                    ),
+                    'name': self._get(key='sensors.door_locked.name', idx=idx),
+                    'description': self._get(
+                        key='sensors.door_locked.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_door_locked_indices
+            ],
+            'barometer': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.barometer.value',
+                        idx=idx,
+                        convert=EnumConvert.NATURAL,
+                    ),
+                    'unit': self._get(key='sensors.barometer.unit', idx=idx),
+                    'location': self._get(
+                        key='sensors.barometer.location', idx=idx
+                    ),
+                    'name': self._get(key='sensors.barometer.name', idx=idx),
+                    'description': self._get(
+                        key='sensors.barometer.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_barometer_indices
+            ],
+            'radiation': {
+                sub: [
+                    {
+                        '_idx': idx,
+                        'value': self.latest_value(
+                            key=f'sensors.radiation.{sub}.value',
+                            idx=idx,
+                            convert=EnumConvert.NATURAL,
+                        ),
+                        'unit': self._get(
+                            key=f'sensors.radiation.{sub}.unit', idx=idx
+                        ),
+                        'dead_time': self._get(
+                            key=f'sensors.radiation.{sub}.dead_time',
+                            idx=idx,
+                        ),
+                        'conversion_factor': self._get(
+                            key=f'sensors.radiation.{sub}.conversion_factor',
+                            idx=idx,
+                        ),
+                        'location': self._get(
+                            key=f'sensors.radiation.{sub}.location',
+                            idx=idx,
+                        ),
+                        'name': self._get(
+                            key=f'sensors.radiation.{sub}.name', idx=idx
+                        ),
+                        'description': self._get(
+                            key=f'sensors.radiation.{sub}.description',
+                            idx=idx,
+                        ),
+                    }
+                    for idx in self.sensors_radiation_indices(sub)
+                ]
+                for sub in ['alpha', 'beta', 'gamma', 'beta_gamma']
+            },
+            'humidity': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.humidity.value',
+                        idx=idx,
+                        convert=EnumConvert.INTEGER,
+                    ),
+                    'unit': self._get(key='sensors.humidity.unit', idx=idx),
+                    'location': self._get(
+                        key='sensors.humidity.location', idx=idx
+                    ),
+                    'name': self._get(key='sensors.humidity.name', idx=idx),
+                    'description': self._get(
+                        key='sensors.humidity.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_humidity_indices
+            ],
+            'beverage_supply': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.beverage_supply.value',
+                        idx=idx,
+                        convert=EnumConvert.INTEGER,
+                    ),
+                    'unit': self._get(
+                        key='sensors.beverage_supply.unit', idx=idx
+                    ),
+                    'location': self._get(
+                        key='sensors.beverage_supply.location', idx=idx
+                    ),
+                    'name': self._get(
+                        key='sensors.beverage_supply.name', idx=idx
+                    ),
+                    'description': self._get(
+                        key='sensors.beverage_supply.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_beverage_supply_indices
+            ],
+            'power_consumption': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.power_consumption.value',
+                        idx=idx,
+                        convert=EnumConvert.INTEGER,
+                    ),
+                    'unit': self._get(
+                        key='sensors.power_consumption.unit', idx=idx
+                    ),
+                    'location': self._get(
+                        key='sensors.power_consumption.location', idx=idx
+                    ),
+                    'name': self._get(
+                        key='sensors.power_consumption.name', idx=idx
+                    ),
+                    'description': self._get(
+                        key='sensors.power_consumption.description',
+                        idx=idx,
+                    ),
+                }
+                for idx in self.sensors_power_consumption_indices
+            ],
+            'wind': [
+                {
+                    '_idx': idx,
+                    'properties': {
+                        'speed': {
+                            'value': self.latest_value(
+                                key='sensors.wind.properties.speed.value',
+                                idx=idx,
+                                convert=EnumConvert.NATURAL,
+                            ),
+                            'unit': self._get(
+                                key='sensors.wind.properties.speed.unit',
+                                idx=idx,
+                            ),
+                        },
+                        'gust': {
+                            'value': self.latest_value(
+                                key='sensors.wind.properties.gust.value',
+                                idx=idx,
+                                convert=EnumConvert.NATURAL,
+                            ),
+                            'unit': self._get(
+                                key='sensors.wind.properties.gust.unit',
+                                idx=idx,
+                            ),
+                        },
+                        'direction': {
+                            'value': self.latest_value(
+                                key=(
+                                    'sensors.wind.properties.'
+                                    'direction.value'
+                                ),
+                                idx=idx,
+                                convert=EnumConvert.INTEGER,
+                            ),
+                            'unit': self._get(
+                                key='sensors.wind.properties.direction.unit',
+                                idx=idx,
+                            ),
+                        },
+                        'elevation': {
+                            'value': self._get(
+                                key=(
+                                    'sensors.wind.properties.'
+                                    'elevation.value'
+                                ),
+                                idx=idx,
+                            ),
+                            'unit': self._get(
+                                key='sensors.wind.properties.elevation.unit',
+                                idx=idx,
+                            ),
+                        },
+                    },
+                    'location': self._get(
+                        key='sensors.wind.location', idx=idx
+                    ),
+                    'name': self._get(key='sensors.wind.name', idx=idx),
+                    'description': self._get(
+                        key='sensors.wind.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_wind_indices
+            ],
+            'network_connections': [],
+            'account_balance': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.account_balance.value',
+                        idx=idx,
+                        convert=EnumConvert.NATURAL,
+                    ),
+                    'unit': self._get(
+                        key='sensors.account_balance.unit', idx=idx
+                    ),
+                    'location': self._get(
+                        key='sensors.account_balance.location', idx=idx
+                    ),
+                    'name': self._get(
+                        key='sensors.account_balance.name', idx=idx
+                    ),
+                    'description': self._get(
+                        key='sensors.account_balance.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_account_balance_indices
+            ],
+            'total_member_count': [
+                {
+                    '_idx': idx,
+                    'value': self.latest_value(
+                        key='sensors.total_member_count.value',
+                        idx=idx,
+                        convert=EnumConvert.INTEGER,
+                    ),
+                    'location': self._get(
+                        key='sensors.total_member_count.location', idx=idx
+                    ),
+                    'name': self._get(
+                        key='sensors.total_member_count.name', idx=idx
+                    ),
+                    'description': self._get(
+                        key='sensors.total_member_count.description',
+                        idx=idx,
+                    ),
+                }
+                for idx in self.sensors_total_member_count_indices
+            ],
+            'people_now_present': [],
+            'network_traffic': [
+                {
+                    '_idx': idx,
+                    'properties': {
+                        'bits_per_second': {
+                            'value': self.latest_value(
+                                key=(
+                                    'sensors.network_traffic.properties.'
+                                    'bits_per_second.value'
+                                ),
+                                idx=idx,
+                                convert=EnumConvert.NATURAL,
+                            ),
+                            'maximum': self._get(
+                                key=(
+                                    'sensors.network_traffic.properties.'
+                                    'bits_per_second.maximum'
+                                ),
+                                idx=idx,
+                            ),
+                        },
+                        'packets_per_second': {
+                            'value': self.latest_value(
+                                key=(
+                                    'sensors.network_traffic.properties.'
+                                    'packets_per_second.value'
+                                ),
+                                idx=idx,
+                                convert=EnumConvert.NATURAL,
+                            ),
+                        },
+                    },
+                    'location': self._get(
+                        key='sensors.network_traffic.location', idx=idx
+                    ),
+                    'name': self._get(
+                        key='sensors.network_traffic.name', idx=idx
+                    ),
+                    'description': self._get(
+                        key='sensors.network_traffic.description', idx=idx
+                    ),
+                }
+                for idx in self.sensors_network_traffic_indices
+            ],
+        }
+
+    def _build_static(self):
         return {
             'api_compatibility': ['14'],
             'space': self._get(key='space'),
@@ -219,7 +602,6 @@ class SpaceApi:
                 'spacesaml': self._get(key='spacefed.spacesaml'),
             },
             'cam': self._get_all(key='cam'),
-            'state': self.get_state(),
             'events': self.get_events(),
             'contact': {
                 'phone': self._get(key='contact.phone'),
@@ -268,343 +650,6 @@ class SpaceApi:
                 'matrix': self._get(key='contact.matrix'),
                 'mumble': self._get(key='contact.mumble'),
             },
-            'sensors': {
-                'temperature': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.temperature.value',
-                            idx=idx,
-                            convert=EnumConvert.NATURAL,
-                        ),
-                        'unit': self._get(
-                            key='sensors.temperature.unit', idx=idx
-                        ),
-                        'location': self._get(
-                            key='sensors.temperature.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.temperature.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.temperature.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_temperature_indices
-                ],
-                'door_locked': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.door_locked.value',
-                            idx=idx,
-                            convert=EnumConvert.BOOLEAN,
-                        ),
-                        'location': self._get(
-                            key='sensors.door_locked.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.door_locked.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.door_locked.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_door_locked_indices
-                ],
-                'barometer': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.barometer.value',
-                            idx=idx,
-                            convert=EnumConvert.NATURAL,
-                        ),
-                        'unit': self._get(
-                            key='sensors.barometer.unit', idx=idx
-                        ),
-                        'location': self._get(
-                            key='sensors.barometer.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.barometer.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.barometer.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_barometer_indices
-                ],
-                'radiation': {
-                    sub: [
-                        {
-                            '_idx': idx,
-                            'value': self.latest_value(
-                                key=f'sensors.radiation.{sub}.value',
-                                idx=idx,
-                                convert=EnumConvert.NATURAL,
-                            ),
-                            'unit': self._get(
-                                key=f'sensors.radiation.{sub}.unit', idx=idx
-                            ),
-                            'dead_time': self._get(
-                                key=f'sensors.radiation.{sub}.dead_time',
-                                idx=idx,
-                            ),
-                            'conversion_factor': self._get(
-                                key=(
-                                    f'sensors.radiation.{sub}.'
-                                    'conversion_factor'
-                                ),
-                                idx=idx,
-                            ),
-                            'location': self._get(
-                                key=f'sensors.radiation.{sub}.location',
-                                idx=idx,
-                            ),
-                            'name': self._get(
-                                key=f'sensors.radiation.{sub}.name', idx=idx
-                            ),
-                            'description': self._get(
-                                key=f'sensors.radiation.{sub}.description',
-                                idx=idx,
-                            ),
-                        }
-                        for idx in self.sensors_radiation_indices(sub)
-                    ]
-                    for sub in ['alpha', 'beta', 'gamma', 'beta_gamma']
-                },
-                'humidity': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.humidity.value',
-                            idx=idx,
-                            convert=EnumConvert.INTEGER,
-                        ),
-                        'unit': self._get(
-                            key='sensors.humidity.unit', idx=idx
-                        ),
-                        'location': self._get(
-                            key='sensors.humidity.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.humidity.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.humidity.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_humidity_indices
-                ],
-                'beverage_supply': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.beverage_supply.value',
-                            idx=idx,
-                            convert=EnumConvert.INTEGER,
-                        ),
-                        'unit': self._get(
-                            key='sensors.beverage_supply.unit', idx=idx
-                        ),
-                        'location': self._get(
-                            key='sensors.beverage_supply.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.beverage_supply.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.beverage_supply.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_beverage_supply_indices
-                ],
-                'power_consumption': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.power_consumption.value',
-                            idx=idx,
-                            convert=EnumConvert.INTEGER,
-                        ),
-                        'unit': self._get(
-                            key='sensors.power_consumption.unit', idx=idx
-                        ),
-                        'location': self._get(
-                            key='sensors.power_consumption.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.power_consumption.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.power_consumption.description',
-                            idx=idx,
-                        ),
-                    }
-                    for idx in self.sensors_power_consumption_indices
-                ],
-                'wind': [
-                    {
-                        '_idx': idx,
-                        'properties': {
-                            'speed': {
-                                'value': self.latest_value(
-                                    key='sensors.wind.properties.speed.value',
-                                    idx=idx,
-                                    convert=EnumConvert.NATURAL,
-                                ),
-                                'unit': self._get(
-                                    key='sensors.wind.properties.speed.unit',
-                                    idx=idx,
-                                ),
-                            },
-                            'gust': {
-                                'value': self.latest_value(
-                                    key='sensors.wind.properties.gust.value',
-                                    idx=idx,
-                                    convert=EnumConvert.NATURAL,
-                                ),
-                                'unit': self._get(
-                                    key='sensors.wind.properties.gust.unit',
-                                    idx=idx,
-                                ),
-                            },
-                            'direction': {
-                                'value': self.latest_value(
-                                    key=(
-                                        'sensors.wind.properties.'
-                                        'direction.value'
-                                    ),
-                                    idx=idx,
-                                    convert=EnumConvert.INTEGER,
-                                ),
-                                'unit': self._get(
-                                    key=(
-                                        'sensors.wind.properties.'
-                                        'direction.unit'
-                                    ),
-                                    idx=idx,
-                                ),
-                            },
-                            'elevation': {
-                                'value': self._get(
-                                    key=(
-                                        'sensors.wind.properties.'
-                                        'elevation.value'
-                                    ),
-                                    idx=idx,
-                                ),
-                                'unit': self._get(
-                                    key=(
-                                        'sensors.wind.properties.'
-                                        'elevation.unit'
-                                    ),
-                                    idx=idx,
-                                ),
-                            },
-                        },
-                        'location': self._get(
-                            key='sensors.wind.location', idx=idx
-                        ),
-                        'name': self._get(key='sensors.wind.name', idx=idx),
-                        'description': self._get(
-                            key='sensors.wind.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_wind_indices
-                ],
-                'network_connections': [],
-                'account_balance': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.account_balance.value',
-                            idx=idx,
-                            convert=EnumConvert.NATURAL,
-                        ),
-                        'unit': self._get(
-                            key='sensors.account_balance.unit', idx=idx
-                        ),
-                        'location': self._get(
-                            key='sensors.account_balance.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.account_balance.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.account_balance.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_account_balance_indices
-                ],
-                'total_member_count': [
-                    {
-                        '_idx': idx,
-                        'value': self.latest_value(
-                            key='sensors.total_member_count.value',
-                            idx=idx,
-                            convert=EnumConvert.INTEGER,
-                        ),
-                        'location': self._get(
-                            key='sensors.total_member_count.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.total_member_count.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.total_member_count.description',
-                            idx=idx,
-                        ),
-                    }
-                    for idx in self.sensors_total_member_count_indices
-                ],
-                'people_now_present': [],
-                'network_traffic': [
-                    {
-                        '_idx': idx,
-                        'properties': {
-                            'bits_per_second': {
-                                'value': self.latest_value(
-                                    key=(
-                                        'sensors.network_traffic.properties.'
-                                        'bits_per_second.value'
-                                    ),
-                                    idx=idx,
-                                    convert=EnumConvert.NATURAL,
-                                ),
-                                'maximum': self._get(
-                                    key=(
-                                        'sensors.network_traffic.properties.'
-                                        'bits_per_second.maximum'
-                                    ),
-                                    idx=idx,
-                                ),
-                            },
-                            'packets_per_second': {
-                                'value': self.latest_value(
-                                    key=(
-                                        'sensors.network_traffic.properties.'
-                                        'packets_per_second.value'
-                                    ),
-                                    idx=idx,
-                                    convert=EnumConvert.NATURAL,
-                                ),
-                            },
-                        },
-                        'location': self._get(
-                            key='sensors.network_traffic.location', idx=idx
-                        ),
-                        'name': self._get(
-                            key='sensors.network_traffic.name', idx=idx
-                        ),
-                        'description': self._get(
-                            key='sensors.network_traffic.description', idx=idx
-                        ),
-                    }
-                    for idx in self.sensors_network_traffic_indices
-                ],
-            },
             'feeds': {
                 'blog': {
                     'type': self._get(key='feeds.blog.type'),
@@ -652,28 +697,116 @@ class SpaceApi:
             ],
         }
 
-    @property
-    def outdated(self):
-        if self._content is None:
+    @staticmethod
+    def _expired(content, last, refresh, lead=0):
+        if content is None:
             return True
-        if self._last is None:
+        if last is None:
             return True
-        if (datetime.utcnow() - self._last).total_seconds() > SP_API_REFRESH:
+        if (datetime.utcnow() - last).total_seconds() > refresh - lead:
             return True
         return False
 
     @property
-    def content(self):
-        if self.outdated:
-            self._log.info('rebuilding content')
-            self._content = self.build()
+    def outdated(self):
+        return self._expired(self._content, self._last, SP_API_REFRESH)
+
+    @property
+    def live_outdated(self):
+        return self._expired(self._live, self._live_last, SP_API_LIVE_REFRESH)
+
+    def _rebuild(self, *, lead=0):
+        outdated = self._expired(
+            self._content, self._last, SP_API_REFRESH, lead
+        )
+        live_outdated = self._expired(
+            self._live, self._live_last, SP_API_LIVE_REFRESH, lead
+        )
+        if outdated:
+            self._log.info('rebuilding static content')
+            self._content = self.build_static()
             self._last = datetime.utcnow()
-        return self._content
+        if live_outdated:
+            self._log.info('rebuilding live content')
+            self._live = self.build_live()
+            self._live_last = datetime.utcnow()
+        if outdated or live_outdated or self._merged is None:
+            self._merged = {**self._content, **self._live}
+        return self._merged
+
+    @property
+    def content(self):
+        merged = self._merged
+        if merged is not None and not (self.outdated or self.live_outdated):
+            return merged
+
+        if not self._lock.acquire(blocking=merged is None):
+            self._log.info('serving stale content')
+            return merged
+        try:
+            return self._rebuild()
+        finally:
+            self._lock.release()
+
+    def refresh(self, *, lead=0):
+        with self._lock:
+            return self._rebuild(lead=lead)
+
+    def start(self, app, *, interval=None):
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        interval = (
+            interval
+            if interval is not None
+            else max(1, SP_API_LIVE_REFRESH // 2)
+        )
+
+        def _run():
+            while not self._halt.wait(interval):
+                with app.app_context():
+                    try:
+                        self.refresh(lead=interval)
+                    except Exception:  # pylint: disable=broad-except
+                        self._log.exception('background refresh failed')
+
+        self._log.info('starting background refresh every %ds', interval)
+        self._halt.clear()
+        self._thread = Thread(target=_run, name='space-api', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._halt.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        return self._thread is None
+
+    def payload(self, render):
+        content = self.content
+        if self._payload is None or self._payload[0] is not content:
+            self._log.info('encoding content')
+            body, status = render(content)
+            self._payload = (content, body, status, sha1(body).hexdigest())
+        return self._payload[1:]
 
     def clear(self):
-        self._content = None
-        self._last = None
-        return all((self._content is None, self._last is None))
+        with self._lock:
+            self._content = None
+            self._last = None
+            self._live = None
+            self._live_last = None
+            self._merged = None
+            self._payload = None
+        return all(
+            (
+                self._content is None,
+                self._last is None,
+                self._live is None,
+                self._live_last is None,
+            )
+        )
 
     def reset(self):
         self._log.info('resetting content')
@@ -0,0 +1,38 @@
+from logging import getLogger
+from threading import Condition
+
+from observatory.start.environment import STREAM_LIFETIME, STREAM_POLL
+
+
+class Stream:
+    def __init__(self, *, poll=STREAM_POLL, lifetime=STREAM_LIFETIME):
+        self._log = getLogger(self.__class__.__name__)
+
+        self.poll = poll
+        self.lifetime = lifetime
+
+        self._cond = Condition()
+        self._serial = 0
+
+    @property
+    def serial(self):
+        return self._serial
+
+    def notify(self):
+        with self._cond:
+            self._serial += 1
+            self._cond.notify_all()
+            return self._serial
+
+    def wait(self, serial, *, timeout=None):
+        timeout = timeout if timeout is not None else self.poll
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._serial != serial, timeout=timeout
+            )
+            return self._serial
+
+    def clear(self):
+        with self._cond:
+            self._serial = 0
+            return self._serial == 0
@@ -1,16 +1,34 @@
+from array import array
+from logging import getLogger
+
+from sqlalchemy import event, func
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Session, object_session
 
-from observatory.database import CreatedMixin, Model
-from observatory.lib.clock import is_outdated
+from observatory.database import CreatedMixin, Model, epoch_bucket
+from observatory.lib.clock import is_outdated, outdated_since
 from observatory.models.mapper import EnumConvert, EnumHorizon
 from observatory.start.environment import BACKLOG_DAYS
 from observatory.start.extensions import DB
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+LOG = getLogger(__name__)
+
 # pylint: disable=no-member
 # pylint: disable=too-many-ancestors
 
 
 class Point(CreatedMixin, Model):
+    __table_args__ = (
+        DB.Index('ix_point_sensor_prime_created', 'sensor_prime', 'created'),
+        DB.Index('ix_point_user_prime_created', 'user_prime', 'created'),
+        {'sqlite_autoincrement': True},
+    )
+
     value = DB.Column(DB.Float(), nullable=False)
 
     sensor_prime = DB.Column(
@@ -24,6 +42,20 @@ class Point(CreatedMixin, Model):
         nullable=False,
     )
 
+    @staticmethod
+    def flushed_deletes(session):
+        return session.info.get('point_deleted', [])
+
+    @classmethod
+    def bulk_create(cls, rows, _commit=True):
+        LOG.info('bulk creating %d new points', len(rows))
+
+        if rows:
+            DB.session.execute(cls.__table__.insert(), rows)
+        if _commit:
+            DB.session.commit()
+        return len(rows)
+
     @hybrid_property
     def outdated(self):
         return is_outdated(self.created, BACKLOG_DAYS)
@@ -31,11 +63,69 @@ class Point(CreatedMixin, Model):
     @classmethod
     def query_outdated(cls, *, outdated=True, query=None):
         query = query if query is not None else cls.query
-        return query.filter(cls.outdated == outdated)
+        since = outdated_since(BACKLOG_DAYS)
+        if outdated:
+            return query.filter(cls.created <= since)
+        return query.filter(cls.created > since)
 
-    def translate(self, *, horizon, convert, elevate=1.0, numeric=False):
+    @classmethod
+    def query_window(cls, *, start=None, end=None, query=None):
+        query = query if query is not None else cls.query
+        if start is None:
+            query = cls.query_outdated(outdated=False, query=query)
+        else:
+            query = query.filter(cls.created >= start)
+        if end is not None:
+            query = query.filter(cls.created <= end)
+        return query
+
+    @classmethod
+    def aggregate(cls, *, span, query=None, size=500):
+        query = query if query is not None else cls.query
+        bucket = epoch_bucket(cls.created, span).label('bucket')
+        rows = (
+            query.with_entities(
+                bucket,
+                func.count(cls.value),
+                func.sum(cls.value),
+                func.min(cls.value),
+                func.max(cls.value),
+                func.max(cls.created),
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+            .all()
+        )
+
+        stamps = [row[-1] for row in rows]
+        newest = {}
+        for pos in range(0, len(stamps), size):
+            for created, value in (
+                query.filter(cls.created.in_(stamps[pos : pos + size]))
+                .with_entities(cls.created, cls.value)
+                .order_by(cls.prime.asc())
+            ):
+                newest[created] = value
+
+        return [
+            dict(
+                bucket=stamp,
+                length=length,
+                total=total,
+                minimum=minimum,
+                maximum=maximum,
+                last_value=newest.get(created, None),
+                last_created=created,
+            )
+            for stamp, length, total, minimum, maximum, created in rows
+        ]
+
+    @staticmethod
+    def translate_value(
+        value, *, horizon, convert, elevate=1.0, numeric=False
+    ):
         _flip = -1 if horizon == EnumHorizon.INVERT else +1
-        value = float(_flip * self.value) + 0.0
+        value = float(_flip * value) + 0.0
 
         if convert == EnumConvert.BOOLEAN:
             value = bool(round(value))
@@ -48,6 +138,70 @@ class Point(CreatedMixin, Model):
 
         return float(elevate * value)
 
+    @staticmethod
+    def _translate_numpy(values, *, flip, convert, elevate, numeric):
+        data = numpy.asarray(values, dtype=numpy.float64) * flip + 0.0
+        if convert == EnumConvert.NATURAL:
+            return (elevate * data).tolist()
+
+        if convert == EnumConvert.INTEGER:
+            data = elevate * data
+        data = numpy.rint(data)
+        if not numpy.isfinite(data).all():
+            return None
+
+        if convert == EnumConvert.BOOLEAN:
+            data = data != 0
+            if not numeric:
+                return data.tolist()
+            return numpy.where(data, flip * elevate, 0.0).tolist()
+
+        if numpy.abs(data).max(initial=0) >= 2 ** 62:
+            return None
+        return data.astype(numpy.int64).tolist()
+
+    @staticmethod
+    def _translate_array(values, *, flip, convert, elevate, numeric):
+        data = array('d', values)
+
+        if convert == EnumConvert.BOOLEAN:
+            if not numeric:
+                return [bool(round(flip * value + 0.0)) for value in data]
+            high = flip * elevate
+            return [
+                high if round(flip * value + 0.0) else 0.0 for value in data
+            ]
+
+        if convert == EnumConvert.INTEGER:
+            return [round(elevate * (flip * value + 0.0)) for value in data]
+
+        return [float(elevate * (flip * value + 0.0)) for value in data]
+
+    @classmethod
+    def translate_values(
+        cls, values, *, horizon, convert, elevate=1.0, numeric=False
+    ):
+        params = dict(
+            flip=-1 if horizon == EnumHorizon.INVERT else +1,
+            convert=convert,
+            elevate=elevate,
+            numeric=numeric,
+        )
+        if numpy is not None:
+            result = cls._translate_numpy(values, **params)
+            if result is not None:
+                return result
+        return cls._translate_array(values, **params)
+
+    def translate(self, *, horizon, convert, elevate=1.0, numeric=False):
+        return self.translate_value(
+            self.value,
+            horizon=horizon,
+            convert=convert,
+            elevate=elevate,
+            numeric=numeric,
+        )
+
     def translate_map(self, mapper, numeric=False):
         return self.translate(
             horizon=mapper.horizon,
@@ -55,3 +209,26 @@ class Point(CreatedMixin, Model):
             elevate=mapper.elevate,
             numeric=numeric,
         )
+
+
+@event.listens_for(Point, 'after_delete')
+def _point_after_delete(_, __, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('point_deleted', []).append(
+            dict(
+                sensor_prime=target.sensor_prime,
+                user_prime=target.user_prime,
+                created=target.created,
+            )
+        )
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _session_after_flush_postexec(session, _):
+    session.info.pop('point_deleted', None)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _session_after_soft_rollback(session, _):
+    session.info.pop('point_deleted', None)
@@ -0,0 +1,315 @@
+from datetime import timedelta
+from enum import Enum
+from logging import getLogger
+
+from sqlalchemy import and_, case, event, func
+from sqlalchemy.orm import Session
+
+from observatory.database import Model
+from observatory.lib.clock import (
+    epoch_milliseconds,
+    epoch_seconds,
+    time_format,
+)
+from observatory.models.point import Point
+from observatory.start.extensions import DB
+
+LOG = getLogger(__name__)
+
+
+class EnumTier(Enum):
+    MINUTE = 60
+    HOUR = 60 * 60
+    DAY = 60 * 60 * 24
+
+    @property
+    def span(self):
+        return timedelta(seconds=self.value)
+
+    def bucket(self, stamp):
+        fields = dict(second=0, microsecond=0)
+        if self in (EnumTier.HOUR, EnumTier.DAY):
+            fields.update(minute=0)
+        if self == EnumTier.DAY:
+            fields.update(hour=0)
+        return stamp.replace(**fields)
+
+
+# pylint: disable=no-member
+# pylint: disable=too-many-ancestors
+
+
+class Rollup(Model):
+    __table_args__ = (
+        DB.UniqueConstraint(
+            'sensor_prime',
+            'tier',
+            'bucket',
+            name='uq_rollup_sensor_prime_tier_bucket',
+        ),
+    )
+
+    sensor_prime = DB.Column(
+        DB.Integer(),
+        DB.ForeignKey('sensor.prime'),
+        nullable=False,
+    )
+    tier = DB.Column(
+        DB.Enum(EnumTier),
+        nullable=False,
+    )
+    bucket = DB.Column(DB.DateTime(), nullable=False)
+
+    length = DB.Column(DB.Integer(), nullable=False)
+    total = DB.Column(DB.Float(), nullable=False)
+    minimum = DB.Column(DB.Float(), nullable=False)
+    maximum = DB.Column(DB.Float(), nullable=False)
+    last_value = DB.Column(DB.Float(), nullable=False)
+    last_created = DB.Column(DB.DateTime(), nullable=False)
+
+    @property
+    def average(self):
+        if not self.length:
+            return None
+        return self.total / self.length
+
+    @property
+    def bucket_fmt(self):
+        return time_format(self.bucket)
+
+    @property
+    def bucket_epoch_ms(self):
+        return epoch_milliseconds(self.bucket)
+
+    @classmethod
+    def query_tier(cls, *, tier, sensor=None, query=None):
+        query = query if query is not None else cls.query
+        query = query.filter(cls.tier == tier)
+        if sensor is not None:
+            query = query.filter(cls.sensor_prime == sensor.prime)
+        return query.order_by(cls.bucket.asc())
+
+    @classmethod
+    def covers(cls, *, tier, sensor, start):
+        first = (
+            DB.session.query(func.min(cls.bucket))
+            .filter(cls.tier == tier, cls.sensor_prime == sensor.prime)
+            .scalar()
+        )
+        if first is None:
+            return False
+        if first <= start:
+            return True
+
+        oldest = (
+            DB.session.query(func.min(Point.created))
+            .filter(Point.sensor_prime == sensor.prime)
+            .scalar()
+        )
+        return oldest is not None and first <= tier.bucket(oldest)
+
+    @classmethod
+    def aggregate(cls, *, span, tier, sensor, start, end):
+        result = {}
+        for row in cls.query_tier(tier=tier, sensor=sensor).filter(
+            cls.bucket >= start, cls.bucket < end
+        ):
+            stamp = span * (epoch_seconds(row.bucket) // span)
+            have = result.get(stamp, None)
+            if have is None:
+                result[stamp] = dict(
+                    bucket=stamp,
+                    length=row.length,
+                    total=row.total,
+                    minimum=row.minimum,
+                    maximum=row.maximum,
+                    last_value=row.last_value,
+                    last_created=row.last_created,
+                )
+                continue
+
+            have['length'] += row.length
+            have['total'] += row.total
+            have['minimum'] = min(have['minimum'], row.minimum)
+            have['maximum'] = max(have['maximum'], row.maximum)
+            if have['last_created'] <= row.last_created:
+                have['last_value'] = row.last_value
+                have['last_created'] = row.last_created
+        return [result[stamp] for stamp in sorted(result)]
+
+    @staticmethod
+    def fold(rows, *, tiers=tuple(EnumTier), result=None):
+        result = result if result is not None else {}
+        for row in rows:
+            for tier in tiers:
+                key = (row['sensor_prime'], tier, tier.bucket(row['created']))
+                have = result.get(key, None)
+                if have is None:
+                    result[key] = dict(
+                        sensor_prime=key[0],
+                        tier=key[1],
+                        bucket=key[2],
+                        length=1,
+                        total=row['value'],
+                        minimum=row['value'],
+                        maximum=row['value'],
+                        last_value=row['value'],
+                        last_created=row['created'],
+                    )
+                    continue
+
+                have['length'] += 1
+                have['total'] += row['value']
+                have['minimum'] = min(have['minimum'], row['value'])
+                have['maximum'] = max(have['maximum'], row['value'])
+                if have['last_created'] <= row['created']:
+                    have['last_value'] = row['value']
+                    have['last_created'] = row['created']
+        return result
+
+    @classmethod
+    def _where(cls, table, agg):
+        return and_(
+            table.c.sensor_prime == agg['sensor_prime'],
+            table.c.tier == agg['tier'],
+            table.c.bucket == agg['bucket'],
+        )
+
+    @classmethod
+    def absorb(cls, connection, rows):
+        table = cls.__table__
+        for agg in cls.fold(rows).values():
+            newer = table.c.last_created <= agg['last_created']
+            done = connection.execute(
+                table.update()
+                .where(cls._where(table, agg))
+                .values(
+                    length=table.c.length + agg['length'],
+                    total=table.c.total + agg['total'],
+                    minimum=case(
+                        [(table.c.minimum > agg['minimum'], agg['minimum'])],
+                        else_=table.c.minimum,
+                    ),
+                    maximum=case(
+                        [(table.c.maximum < agg['maximum'], agg['maximum'])],
+                        else_=table.c.maximum,
+                    ),
+                    last_value=case(
+                        [(newer, agg['last_value'])],
+                        else_=table.c.last_value,
+                    ),
+                    last_created=case(
+                        [(newer, agg['last_created'])],
+                        else_=table.c.last_created,
+                    ),
+                )
+            ).rowcount
+            if not done:
+                connection.execute(table.insert(), agg)
+
+    @staticmethod
+    def spans(rows, *, tier):
+        result = {}
+        for row in rows:
+            result.setdefault(row['sensor_prime'], set()).add(
+                tier.bucket(row['created'])
+            )
+
+        for sensor_prime, buckets in result.items():
+            start = end = None
+            for bucket in sorted(buckets):
+                if end is not None and bucket > end:
+                    yield sensor_prime, start, end
+                    start = None
+                if start is None:
+                    start = bucket
+                end = bucket + tier.span
+            yield sensor_prime, start, end
+
+    @classmethod
+    def rebuild(cls, connection, rows):
+        table = cls.__table__
+        for tier in EnumTier:
+            for sensor_prime, start, end in cls.spans(rows, tier=tier):
+                points = connection.execute(
+                    DB.select([Point.sensor_prime, Point.value, Point.created])
+                    .where(
+                        and_(
+                            Point.sensor_prime == sensor_prime,
+                            Point.created >= start,
+                            Point.created < end,
+                        )
+                    )
+                    .order_by(Point.created.asc())
+                ).fetchall()
+
+                connection.execute(
+                    table.delete().where(
+                        and_(
+                            table.c.sensor_prime == sensor_prime,
+                            table.c.tier == tier,
+                            table.c.bucket >= start,
+                            table.c.bucket < end,
+                        )
+                    )
+                )
+                folded = cls.fold(points, tiers=(tier,))
+                if folded:
+                    connection.execute(table.insert(), list(folded.values()))
+
+    @classmethod
+    def backfill(cls, connection, *, sensor_primes=None, size=1000):
+        table = cls.__table__
+        query = table.delete()
+        select = DB.select(
+            [Point.sensor_prime, Point.value, Point.created]
+        ).order_by(Point.sensor_prime.asc(), Point.created.asc())
+        if sensor_primes is not None:
+            query = query.where(table.c.sensor_prime.in_(sensor_primes))
+            select = select.where(Point.sensor_prime.in_(sensor_primes))
+        connection.execute(query)
+
+        result, current, folded = 0, None, {}
+
+        def _flush():
+            if folded:
+                connection.execute(table.insert(), list(folded.values()))
+            return len(folded)
+
+        proxy = connection.execution_options(stream_results=True).execute(
+            select
+        )
+        while True:
+            rows = proxy.fetchmany(size)
+            if not rows:
+                break
+            for row in rows:
+                if current != row['sensor_prime']:
+                    result += _flush()
+                    current, folded = row['sensor_prime'], {}
+                cls.fold([row], result=folded)
+        result += _flush()
+
+        LOG.info('backfilled %d rollup buckets', result)
+        return result
+
+
+@event.listens_for(Point, 'after_insert')
+def _point_after_insert(_, connection, target):
+    Rollup.absorb(
+        connection,
+        [
+            dict(
+                sensor_prime=target.sensor_prime,
+                value=target.value,
+                created=target.created,
+            )
+        ],
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def _session_after_flush(session, _):
+    rows = Point.flushed_deletes(session)
+    if rows:
+        Rollup.rebuild(session.connection(), rows)
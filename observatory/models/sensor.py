@@ -1,7 +1,26 @@
+from collections import Counter
+from datetime import datetime
 from logging import getLogger
 
-from observatory.database import CommonMixin, CreatedMixin, Model, SortMixin
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.orm import Session
+
+from observatory.database import (
+    CommonMixin,
+    CountMixin,
+    CreatedMixin,
+    Model,
+    SortMixin,
+)
+from observatory.lib.clock import (
+    epoch_milliseconds,
+    outdated_since,
+    time_format,
+)
 from observatory.models.point import Point
+from observatory.models.rollup import EnumTier, Rollup
+from observatory.models.user import User
+from observatory.start.environment import BACKLOG_DAYS, RETENTION_CHUNK
 from observatory.start.extensions import DB
 
 LOG = getLogger(__name__)
@@ -10,7 +29,9 @@ LOG = getLogger(__name__)
 # pylint: disable=too-many-ancestors
 
 
-class Sensor(CommonMixin, SortMixin, CreatedMixin, Model):
+class Sensor(CommonMixin, SortMixin, CreatedMixin, CountMixin, Model):
+    count_column = 'point.sensor_prime'
+
     points = DB.relationship(
         'Point',
         backref=DB.backref('sensor', lazy=True),
@@ -18,6 +39,13 @@ class Sensor(CommonMixin, SortMixin, CreatedMixin, Model):
         cascade='all,delete-orphan',
         lazy=True,
     )
+    rollups = DB.relationship(
+        'Rollup',
+        backref=DB.backref('sensor', lazy=True),
+        order_by='Rollup.bucket.asc()',
+        cascade='all,delete-orphan',
+        lazy=True,
+    )
     values = DB.relationship(
         'Value',
         backref=DB.backref('sensor', lazy=True),
@@ -32,6 +60,29 @@ class Sensor(CommonMixin, SortMixin, CreatedMixin, Model):
         default=False,
     )
 
+    latest_value = DB.Column(
+        DB.Float(),
+        nullable=True,
+    )
+    latest_created = DB.Column(
+        DB.DateTime(),
+        nullable=True,
+    )
+    latest_user_prime = DB.Column(
+        DB.Integer(),
+        DB.ForeignKey(
+            'user.prime',
+            name='fk_sensor_latest_user_prime_user',
+            ondelete='SET NULL',
+        ),
+        nullable=True,
+    )
+    latest_user = DB.relationship(
+        'User',
+        primaryjoin='Sensor.latest_user_prime == User.prime',
+        lazy=True,
+    )
+
     @property
     def active(self):
         return any(self.mapping_active)
@@ -45,40 +96,231 @@ class Sensor(CommonMixin, SortMixin, CreatedMixin, Model):
     def query_points(self):
         return Point.query_sorted(query=Point.query.with_parent(self))
 
-    @property
-    def length(self):
-        return self.query_points.count()
-
     @property
     def latest(self):
         return self.query_points.first()
 
+    @property
+    def latest_created_fmt(self):
+        return time_format(self.latest_created)
+
+    @property
+    def latest_created_epoch_ms(self):
+        return epoch_milliseconds(self.latest_created)
+
+    def latest_translate_map(self, mapper, numeric=False):
+        if self.latest_value is None:
+            return None
+        return Point.translate_value(
+            self.latest_value,
+            horizon=mapper.horizon,
+            convert=mapper.convert,
+            elevate=mapper.elevate,
+            numeric=numeric,
+        )
+
     @classmethod
-    def cleanup(cls, _commit=True):
-        result = []
-        for sensor in cls.query.all():
-            query = Point.query_outdated(
-                outdated=True,
-                query=sensor.query_points,
+    def latest_absorb(cls, connection, rows):
+        newest = {}
+        for row in rows:
+            have = newest.get(row['sensor_prime'], None)
+            if have is None or have['created'] <= row['created']:
+                newest[row['sensor_prime']] = row
+
+        table = cls.__table__
+        for prime, row in newest.items():
+            connection.execute(
+                table.update()
+                .where(
+                    and_(
+                        table.c.prime == prime,
+                        or_(
+                            table.c.latest_created.is_(None),
+                            table.c.latest_created <= row['created'],
+                        ),
+                    )
+                )
+                .values(
+                    latest_value=row['value'],
+                    latest_created=row['created'],
+                    latest_user_prime=row['user_prime'],
+                )
+            )
+
+    @classmethod
+    def latest_rebuild(cls, connection, *, primes=None, since=None):
+        table = cls.__table__
+
+        def _newest(column):
+            return (
+                DB.select([column])
+                .where(Point.sensor_prime == table.c.prime)
+                .order_by(Point.created.desc(), Point.prime.desc())
+                .limit(1)
+                .as_scalar()
+            )
+
+        query = table.update()
+        if primes is not None:
+            query = query.where(table.c.prime.in_(primes))
+        if since is not None:
+            query = query.where(table.c.latest_created <= since)
+
+        return connection.execute(
+            query.values(
+                latest_value=_newest(Point.value),
+                latest_created=_newest(Point.created),
+                latest_user_prime=_newest(Point.user_prime),
             )
-            if sensor.sticky:
-                query = query.offset(1)
+        ).rowcount
 
-            LOG.info(
-                'cleanup "%d" outdated points for "%s"',
-                query.count(),
-                sensor.slug,
+    def sweep(self, *, chunk=RETENTION_CHUNK, _commit=True):
+        query = Point.query_outdated(
+            outdated=True,
+            query=Point.query.with_parent(self),
+        )
+        if self.sticky:
+            keep = (
+                Point.query_sorted(query=query)
+                .with_entities(Point.prime)
+                .first()
+            )
+            if keep is not None:
+                query = query.filter(Point.prime != keep.prime)
+
+        result = 0
+        while True:
+            edge = (
+                query.order_by(Point.created.asc())
+                .with_entities(Point.created)
+                .offset(max(1, chunk) - 1)
+                .first()
+            )
+            batch = (
+                query.filter(Point.created <= edge.created)
+                if edge is not None
+                else query
             )
-            result.append(
-                all(point.delete(_commit=_commit) for point in query.all())
+            users = dict(
+                batch.with_entities(Point.user_prime, func.count(Point.prime))
+                .group_by(Point.user_prime)
+                .all()
             )
+            number = batch.delete(synchronize_session=False)
 
-        return all(result)
+            connection = DB.session.connection()
+            self.count_shift(connection, {self.prime: -number})
+            User.count_shift(
+                connection, {prime: -num for prime, num in users.items()}
+            )
+
+            result += number
+            if _commit:
+                DB.session.commit()
+            if edge is None or not number:
+                break
+
+        if result:
+            since = outdated_since(BACKLOG_DAYS)
+            self.latest_rebuild(
+                DB.session.connection(), primes=[self.prime], since=since
+            )
+            Rollup.query.filter(
+                Rollup.sensor_prime == self.prime,
+                Rollup.tier == EnumTier.MINUTE,
+                Rollup.bucket <= since,
+            ).delete(synchronize_session=False)
+            if _commit:
+                DB.session.commit()
+        if not _commit:
+            DB.session.expire(
+                self,
+                [
+                    'points',
+                    'rollups',
+                    'point_count',
+                    'latest_value',
+                    'latest_created',
+                    'latest_user',
+                ],
+            )
+
+        LOG.info('cleanup "%d" outdated points for "%s"', result, self.slug)
+        return result
+
+    @classmethod
+    def cleanup(cls, _commit=True):
+        return sum(sensor.sweep(_commit=_commit) for sensor in cls.query.all())
 
     def append(self, *, user, value, _commit=True):
-        self.cleanup(_commit=_commit)
         LOG.info('creating new point with "%f" for "%s"', value, self.slug)
 
         return Point.create(
             sensor=self, user=user, value=value, _commit=_commit
         )
+
+    def extend(self, *, user, points, _commit=True):
+        LOG.info('creating %d new points for "%s"', len(points), self.slug)
+
+        return self.bulk_append(
+            user=user,
+            entries=[(self, value, stamp) for value, stamp in points],
+            _commit=_commit,
+        )
+
+    @classmethod
+    def bulk_append(cls, *, user, entries, _commit=True):
+        now = datetime.utcnow()
+        rows = [
+            dict(
+                sensor_prime=sensor.prime,
+                user_prime=user.prime,
+                value=value,
+                created=stamp if stamp is not None else now,
+            )
+            for sensor, value, stamp in entries
+        ]
+
+        result = Point.bulk_create(rows, _commit=False)
+        connection = DB.session.connection()
+        cls.latest_absorb(connection, rows)
+        Rollup.absorb(connection, rows)
+        cls.count_shift(
+            connection, Counter(row['sensor_prime'] for row in rows)
+        )
+        User.count_shift(connection, {user.prime: len(rows)})
+        if _commit:
+            DB.session.commit()
+        return result
+
+
+@event.listens_for(Point, 'after_insert')
+def _point_after_insert(_, connection, target):
+    Sensor.count_shift(connection, {target.sensor_prime: +1})
+    Sensor.latest_absorb(
+        connection,
+        [
+            dict(
+                sensor_prime=target.sensor_prime,
+                user_prime=target.user_prime,
+                value=target.value,
+                created=target.created,
+            )
+        ],
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def _session_after_flush(session, _):
+    rows = Point.flushed_deletes(session)
+    if rows:
+        connection = session.connection()
+        sensors = Counter(row['sensor_prime'] for row in rows)
+        Sensor.count_shift(
+            connection, {prime: -num for prime, num in sensors.items()}
+        )
+        Sensor.latest_rebuild(
+            connection,
+            primes=list(sensors),
+            since=max(row['created'] for row in rows),
+        )
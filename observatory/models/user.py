@@ -1,9 +1,12 @@
+from collections import Counter
 from datetime import datetime
 from logging import getLogger
 
 from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
-from observatory.database import TXT_LEN_SHORT, CreatedMixin, Model
+from observatory.database import TXT_LEN_SHORT, CountMixin, CreatedMixin, Model
 from observatory.lib.clock import (
     epoch_milliseconds,
     epoch_seconds,
@@ -18,7 +21,9 @@ LOG = getLogger(__name__)
 # pylint: disable=too-many-ancestors
 
 
-class User(UserMixin, CreatedMixin, Model):
+class User(UserMixin, CreatedMixin, CountMixin, Model):
+    count_column = 'point.user_prime'
+
     username = DB.Column(
         DB.String(length=TXT_LEN_SHORT), unique=True, nullable=False
     )
@@ -86,10 +91,22 @@ class User(UserMixin, CreatedMixin, Model):
     def query_points(self):
         return Point.query_sorted(query=Point.query.with_parent(self))
 
-    @property
-    def length(self):
-        return self.query_points.count()
-
     @property
     def latest(self):
         return self.query_points.first()
+
+
+@event.listens_for(Point, 'after_insert')
+def _point_after_insert(_, connection, target):
+    User.count_shift(connection, {target.user_prime: +1})
+
+
+@event.listens_for(Session, 'after_flush')
+def _session_after_flush(session, _):
+    rows = Point.flushed_deletes(session)
+    if rows:
+        users = Counter(row['user_prime'] for row in rows)
+        User.count_shift(
+            session.connection(),
+            {prime: -num for prime, num in users.items()},
+        )
@@ -1,7 +1,9 @@
 from enum import Enum
 
 from sqlalchemy import and_, asc
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import joinedload
 
 from observatory.database import TXT_LEN_SHORT, TXT_LEN_SUPER, Model
 from observatory.models.sensor import Sensor
@@ -29,6 +31,8 @@ class EnumBox(Enum):
 
 
 class Value(Model):
+    __table_args__ = (DB.Index('ix_value_key_idx', 'key', 'idx', unique=True),)
+
     key = DB.Column(
         DB.String(length=TXT_LEN_SHORT),
         nullable=False,
@@ -80,6 +84,15 @@ class Value(Model):
             .all()
         )
 
+    @classmethod
+    def by_prefix(cls, *, prefix):
+        return (
+            cls.query.filter(cls.key.startswith(f'{prefix}.', autoescape=True))
+            .options(joinedload(cls.sensor))
+            .order_by(asc(cls.key), asc(cls.idx))
+            .all()
+        )
+
     @hybrid_property
     def elem(self):
         if self.box == EnumBox.SENSOR:
@@ -105,12 +118,39 @@ class Value(Model):
     def get_all(cls, *, key):
         return [obj.elem for obj in cls.by_key(key=key)]
 
+    @staticmethod
+    def columns(elem):
+        box = EnumBox.from_type(elem)
+        result = {bx.value: None for bx in EnumBox}
+        result.update(
+            {box.value: elem.prime if box == EnumBox.SENSOR else elem}
+        )
+        return dict(box=box, **result)
+
     @classmethod
     def set(cls, *, key, idx=0, elem=None, _commit=True):
-        obj = cls.by_key_idx(key=key, idx=idx)
-        if obj is None:
-            obj = cls.create(key=key, idx=idx, _commit=False)
-        return obj.update(elem=elem, _commit=_commit)
+        DB.session.flush()
+
+        table = cls.__table__
+        values = cls.columns(elem)
+        where = and_(table.c.key == key, table.c.idx == idx)
+        done = DB.session.execute(
+            table.update().where(where).values(**values)
+        ).rowcount
+        if not done:
+            try:
+                with DB.session.begin_nested():
+                    DB.session.execute(
+                        table.insert().values(key=key, idx=idx, **values)
+                    )
+            except IntegrityError:
+                DB.session.execute(
+                    table.update().where(where).values(**values)
+                )
+        if _commit:
+            DB.session.commit()
+
+        return cls.query.filter(where).populate_existing().first()
 
     @property
     def latest(self):
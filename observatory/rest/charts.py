@@ -1,26 +1,72 @@
-from flask import Blueprint
-from flask_restful import Resource, abort, marshal
+from functools import lru_cache
+
+from flask import Blueprint, Response
+from flask_restful import Resource, abort
 from flask_restful.fields import Boolean, Float, Integer, List, Nested, String
+from flask_restful.inputs import boolean, natural
+from flask_restful.reqparse import RequestParser
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
-from observatory.models.mapper import EnumConvert
+from observatory.instance import CHARTS_CACHE
+from observatory.lib.clock import epoch_milliseconds, from_epoch_milliseconds
+from observatory.lib.sample import lttb, minmax
+from observatory.models.mapper import EnumConvert, Mapper
+from observatory.models.point import Point
 from observatory.models.prompt import Prompt
+from observatory.models.sensor import Sensor
+from observatory.rest.generic import compile_fields, conditional, etag_of
+from observatory.start.environment import API_PLOT_POINTS
 from observatory.start.extensions import REST
 
 BP_REST_CHARTS = Blueprint('charts', __name__)
 
 
-def dataset(value_type, step_type):
+def epoch_stamp(value):
+    try:
+        stamp = from_epoch_milliseconds(int(value))
+    except (OverflowError, TypeError, ValueError) as ex:
+        raise ValueError(f'invalid epoch "{value}"') from ex
+    if stamp is None:
+        raise ValueError(f'invalid epoch "{value}"')
+    return stamp
+
+
+def cursor_prime(value):
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError) as ex:
+        raise ValueError(f'invalid cursor "{value}"') from ex
+    if cursor < 0:
+        raise ValueError(f'invalid cursor "{value}"')
+    return cursor
+
+
+def dataset_data(value_type, columnar=False):
+    if columnar:
+        return Nested(
+            default={},
+            nested=dict(
+                delta=Boolean(default=False),
+                x=List(Integer(default=0)),
+                y=List(value_type(default=0)),
+            ),
+        )
+    return List(
+        Nested(
+            default={},
+            nested=dict(
+                x=Integer(default=0),
+                y=value_type(default=0),
+            ),
+        )
+    )
+
+
+def dataset(value_type, step_type, columnar=False):
     return dict(
         borderColor=String(default=None),
-        data=List(
-            Nested(
-                default={},
-                nested=dict(
-                    x=Integer(default=0),
-                    y=value_type(default=0),
-                ),
-            )
-        ),
+        data=dataset_data(value_type, columnar=columnar),
         display=Nested(
             default={},
             nested=dict(
@@ -28,6 +74,7 @@ def dataset(value_type, step_type):
                     default={},
                     nested=dict(
                         color=String(default=''),
+                        cursor=Integer(default=0),
                         epoch=Integer(default=0),
                         stamp=String(default=''),
                     ),
@@ -53,12 +100,36 @@ def dataset(value_type, step_type):
     )
 
 
+@lru_cache(maxsize=None)
+def dataset_serializer(value_type, step_type, columnar=False):
+    return compile_fields(dataset(value_type, step_type, columnar=columnar))
+
+
+def columns(points, *, delta=False):
+    xxs, yys = [], []
+    last = 0
+    for xx, yy in points:
+        xxs.append(xx - last if delta else xx)
+        yys.append(yy)
+        last = xx
+    return dict(delta=delta, x=xxs, y=yys)
+
+
 def get_value_step_types(mapper):
     value_type = Integer if mapper.convert == EnumConvert.INTEGER else Float
     step_type = String if mapper.convert == EnumConvert.BOOLEAN else Boolean
     return value_type, step_type
 
 
+def query_prompts(query=None):
+    query = query if query is not None else Prompt.query
+    return query.options(
+        selectinload(Prompt.mapping_active)
+        .joinedload(Mapper.sensor)
+        .selectinload(Sensor.mapping_active)
+    )
+
+
 def collect_generic(prompt):
     if prompt.active:
         for mapper in prompt.mapping_active:
@@ -66,70 +137,304 @@ def collect_generic(prompt):
                 yield mapper, mapper.sensor
 
 
-def collect_points(mapper, sensor):
+def query_window(sensors, *, start=None, end=None):
+    return Point.query_window(
+        start=start,
+        end=end,
+        query=Point.query.filter(
+            Point.sensor_prime.in_([sensor.prime for sensor in sensors])
+        ),
+    )
+
+
+def fetch_points(sensors, *, start=None, end=None, since=None):
+    result = {sensor.prime: [] for sensor in sensors}
+    if not result:
+        return result
+
+    query = query_window(sensors, start=start, end=end)
+    if since is not None:
+        query = query.filter(Point.prime > since)
+    query = Point.query_sorted(query=query).with_entities(
+        Point.sensor_prime, Point.created, Point.value, Point.prime
+    )
+    for prime, created, value, cursor in query:
+        result[prime].append((epoch_milliseconds(created), value, cursor))
+    return result
+
+
+def fetch_counts(sensors, *, start=None, end=None):
+    if not sensors:
+        return {}
+    query = query_window(sensors, start=start, end=end)
+    return dict(
+        query.with_entities(Point.sensor_prime, func.count(Point.prime))
+        .group_by(Point.sensor_prime)
+        .all()
+    )
+
+
+def collect_points(
+    mapper, sensor, *, start=None, end=None, since=None, fetched=None
+):
     if sensor.active:
-        for point in sensor.query_points.all():
-            if not point.outdated:
-                yield dict(
-                    x=point.created_epoch_ms,
-                    y=point.translate_map(mapper, numeric=True),
-                )
+        if fetched is None:
+            fetched = fetch_points(
+                [sensor], start=start, end=end, since=since
+            )[sensor.prime]
+
+        yield from zip(
+            [stamp for stamp, _, _ in fetched],
+            Point.translate_values(
+                [value for _, value, _ in fetched],
+                horizon=mapper.horizon,
+                convert=mapper.convert,
+                elevate=mapper.elevate,
+                numeric=True,
+            ),
+        )
 
 
-def assemble(prompt):
+def prompt_etag(prompt, *extra):
+    state = []
     for mapper, sensor in collect_generic(prompt):
-        points = list(collect_points(mapper, sensor))
-        if points and sensor.latest:
-            value_type, step_type = get_value_step_types(mapper)
-
-            fill, stepped = True, False
-            if mapper.convert == EnumConvert.BOOLEAN:
-                fill, stepped = False, 'before'
-            tension = 0.4
-            if mapper.convert == EnumConvert.INTEGER:
-                tension = 0.0
-
-            yield dict(
-                borderColor=mapper.color.color,
-                data=points,
-                display=dict(
-                    logic=dict(
-                        color=mapper.color.color,
-                        epoch=sensor.latest.created_epoch_ms,
-                        stamp=sensor.latest.created_fmt,
-                    ),
-                    plain=dict(
-                        convert=mapper.convert.name,
-                        description=sensor.description,
-                        horizon=mapper.horizon.name,
-                        points=len(points),
-                        slug=sensor.slug,
-                        title=sensor.title,
-                        value=sensor.latest.translate_map(mapper),
-                    ),
+        state.append(
+            (
+                mapper.color,
+                mapper.convert,
+                mapper.horizon,
+                mapper.elevate,
+                sensor.slug,
+                sensor.title,
+                sensor.description,
+                sensor.point_count,
+                sensor.latest_created,
+                sensor.latest_value,
+            )
+        )
+
+    return etag_of(prompt.slug, *state, *extra)
+
+
+def downsample(mapper, points, max_points):
+    if mapper.convert == EnumConvert.BOOLEAN:
+        return minmax(points, max_points, ykey=1)
+    return lttb(points, max_points, xkey=0, ykey=1)
+
+
+def assemble(
+    prompt,
+    *,
+    max_points=API_PLOT_POINTS,
+    start=None,
+    end=None,
+    since=None,
+    memo=None,
+):
+    memo = memo if memo is not None else {}
+    pairs = [
+        (mapper, sensor)
+        for mapper, sensor in collect_generic(prompt)
+        if sensor.latest_created is not None
+    ]
+    missing = {
+        sensor.prime: sensor for _, sensor in pairs if sensor.prime not in memo
+    }
+    if missing:
+        memo.update(
+            fetch_points(missing.values(), start=start, end=end, since=since)
+        )
+
+    cursor = max(
+        (prime for _, sensor in pairs for _, _, prime in memo[sensor.prime]),
+        default=since or 0,
+    )
+
+    counts = None
+    if since is not None:
+        counts = fetch_counts(
+            [sensor for _, sensor in pairs], start=start, end=end
+        )
+
+    for mapper, sensor in pairs:
+        points = list(
+            collect_points(mapper, sensor, fetched=memo[sensor.prime])
+        )
+        length = len(points) if counts is None else counts.get(sensor.prime)
+        if not length:
+            continue
+
+        value_type, step_type = get_value_step_types(mapper)
+
+        fill, stepped = True, False
+        if mapper.convert == EnumConvert.BOOLEAN:
+            fill, stepped = False, 'before'
+        tension = 0.4
+        if mapper.convert == EnumConvert.INTEGER:
+            tension = 0.0
+
+        yield dict(
+            borderColor=mapper.color.color,
+            data=downsample(mapper, points, max_points),
+            display=dict(
+                logic=dict(
+                    color=mapper.color.color,
+                    cursor=cursor,
+                    epoch=sensor.latest_created_epoch_ms,
+                    stamp=sensor.latest_created_fmt,
                 ),
-                fill=fill,
-                label=sensor.title,
-                lineTension=tension,
-                steppedLine=stepped,
-            ), value_type, step_type
+                plain=dict(
+                    convert=mapper.convert.name,
+                    description=sensor.description,
+                    horizon=mapper.horizon.name,
+                    points=length,
+                    slug=sensor.slug,
+                    title=sensor.title,
+                    value=sensor.latest_translate_map(mapper),
+                ),
+            ),
+            fill=fill,
+            label=sensor.title,
+            lineTension=tension,
+            steppedLine=stepped,
+        ), value_type, step_type
+
+
+def chart_parser():
+    parser = RequestParser()
+    parser.add_argument(
+        'max_points',
+        type=natural,
+        location='args',
+        default=API_PLOT_POINTS,
+    )
+    parser.add_argument(
+        'from', type=epoch_stamp, location='args', dest='start'
+    )
+    parser.add_argument('to', type=epoch_stamp, location='args', dest='end')
+    parser.add_argument('since', type=cursor_prime, location='args')
+    parser.add_argument(
+        'format',
+        choices=('points', 'columnar'),
+        location='args',
+        default='points',
+    )
+    parser.add_argument('delta', type=boolean, location='args', default=False)
+    return parser
 
 
 @REST.resource('/charts/<string:slug>', endpoint='api.charts.plot')
 class ChartsPlot(Resource):
     @staticmethod
     def prompt_active_or_abort(slug):
-        prompt = Prompt.by_slug(slug)
+        prompt = query_prompts().filter(Prompt.slug == slug).first()
         if not prompt:
             abort(404, message=f'Prompt {slug} not present')
         if not prompt.active:
             abort(410, message=f'Prompt {slug} not active')
         return prompt
 
+    @staticmethod
+    def parse():
+        return chart_parser().parse_args()
+
+    @staticmethod
+    def build(prompt, args, memo=None):
+        columnar = args.format == 'columnar'
+        result = []
+        for payload, value_type, step_type in assemble(
+            prompt,
+            max_points=args.max_points,
+            start=args.start,
+            end=args.end,
+            since=args.since,
+            memo=memo,
+        ):
+            if columnar:
+                payload['data'] = columns(payload['data'], delta=args.delta)
+            result.append(
+                dataset_serializer(value_type, step_type, columnar)(payload)
+            )
+        return result
+
+    @staticmethod
+    def render(prompt, args):
+        return REST.make_response(
+            ChartsPlot.build(prompt, args), 200
+        ).get_data()
+
     def get(self, slug):
         prompt = self.prompt_active_or_abort(slug)
+        args = self.parse()
+        key = tuple(sorted(args.items()))
+        etag = prompt_etag(prompt, key)
+
+        def cached():
+            body = CHARTS_CACHE.get(prompt.slug, key, etag=etag)
+            if body is None:
+                body = CHARTS_CACHE.put(
+                    prompt.slug,
+                    key,
+                    etag=etag,
+                    sensors=[
+                        sensor.prime for _, sensor in collect_generic(prompt)
+                    ],
+                    body=self.render(prompt, args),
+                )
+            return Response(body, status=200, mimetype='application/json')
+
+        return conditional(cached, etag=etag)
 
+
+@REST.resource('/charts', endpoint='api.charts.board')
+class ChartsBoard(Resource):
+    @staticmethod
+    def prompts_active_or_abort(slugs):
+        if not slugs:
+            return [
+                prompt
+                for prompt in Prompt.query_sorted(query=query_prompts()).all()
+                if prompt.active
+            ]
+
+        prompts = Prompt.query_sorted(
+            query=query_prompts().filter(Prompt.slug.in_(set(slugs)))
+        ).all()
+        missing = sorted(set(slugs).difference(p.slug for p in prompts))
+        if missing:
+            names = ', '.join(missing)
+            abort(404, message=f'Prompt {names} not present')
+        return [prompt for prompt in prompts if prompt.active]
+
+    @staticmethod
+    def parse():
+        parser = chart_parser()
+        parser.add_argument(
+            'slug', action='append', location='args', dest='slugs'
+        )
+        return parser.parse_args()
+
+    @staticmethod
+    def build(prompts, args):
+        memo = {}
         return [
-            marshal(payload, dataset(value_type, step_type))
-            for payload, value_type, step_type in assemble(prompt)
-        ], 200
+            dict(
+                slug=prompt.slug,
+                title=prompt.title,
+                datasets=ChartsPlot.build(prompt, args, memo=memo),
+            )
+            for prompt in prompts
+        ]
+
+    def get(self):
+        args = self.parse()
+        prompts = self.prompts_active_or_abort(args.slugs)
+        tags = [
+            prompt_etag(prompt, prompt.title, sorted(args.items()))
+            for prompt in prompts
+        ]
+
+        return conditional(
+            lambda: (self.build(prompts, args), 200),
+            etag=etag_of(*tags),
+        )
@@ -1,13 +1,20 @@
+from hashlib import sha1
+
+from flask import Response, request
 from flask_restful import Resource, abort, marshal
 from flask_restful.fields import (
     Boolean,
     DateTime,
     Float,
     Integer,
+    List,
     Nested,
     String,
     Url,
 )
+from werkzeug.http import is_resource_modified
+
+from observatory.start.extensions import REST
 
 
 class SlugUrl(Url):
@@ -39,6 +46,97 @@ class MapperSlugUrl(Url):
 
 DT_FORMAT = 'iso8601'
 
+
+def etag_of(*parts):
+    return sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def conditional(build, *, etag, last_modified=None):
+    if is_resource_modified(
+        request.environ, etag=etag, last_modified=last_modified
+    ):
+        result = build()
+        if isinstance(result, Response):
+            response = result
+        else:
+            response = REST.make_response(*result)
+    else:
+        response = Response(status=304)
+
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def compile_field(field):
+    if field.attribute is not None:
+        raise ValueError(f'can not compile {field!r} with attribute')
+
+    if isinstance(field, Nested):
+        nested = compile_fields(field.nested)
+
+        def _nested(value):
+            if value is None:
+                if field.allow_null:
+                    return None
+                if field.default is not None:
+                    return field.default
+                value = {}
+            return nested(value)
+
+        return _nested
+
+    if isinstance(field, List):
+        if isinstance(field.container, Nested):
+            rows = compile_rows(field.container.nested)
+        else:
+            item = compile_field(field.container)
+
+            def rows(value):
+                return [item(elem) for elem in value]
+
+        def _list(value):
+            if value is None:
+                return field.default
+            return rows(value)
+
+        return _list
+
+    if type(field) not in (Boolean, Float, Integer, String):
+        raise ValueError(f'can not compile {field!r}')
+    default, fmt = field.default, field.format
+
+    def _plain(value):
+        if value is None:
+            return default
+        return fmt(value)
+
+    return _plain
+
+
+def compile_fields(fields):
+    compiled = [(key, compile_field(field)) for key, field in fields.items()]
+
+    def _serialize(obj):
+        return {key: func(obj.get(key, None)) for key, func in compiled}
+
+    return _serialize
+
+
+def compile_rows(fields):
+    compiled = [(key, compile_field(field)) for key, field in fields.items()]
+
+    def _serialize(rows):
+        return [
+            {key: func(value) for (key, func), value in zip(compiled, row)}
+            for row in rows
+        ]
+
+    return _serialize
+
+
 COMMON_BASE = dict(
     slug=String(),
     title=String(),
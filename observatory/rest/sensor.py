@@ -1,21 +1,172 @@
+from datetime import datetime, timedelta
+from re import compile as re_compile
+
 from flask import Blueprint
 from flask_login import current_user, login_required
-from flask_restful import abort, marshal
-from flask_restful.fields import Float, String, Url
+from flask_restful import Resource, abort, marshal
+from flask_restful.fields import Float, Integer, String, Url
+from flask_restful.inputs import datetime_from_iso8601
 from flask_restful.reqparse import RequestParser
 
+from observatory.instance import CHARTS_CACHE, RETENTION, STREAM
+from observatory.lib.clock import (
+    epoch_seconds,
+    from_epoch_milliseconds,
+    naive_utc,
+    outdated_since,
+)
+from observatory.lib.text import is_slugable
+from observatory.models.point import Point
+from observatory.models.rollup import EnumTier, Rollup
 from observatory.models.sensor import Sensor
+from observatory.rest.charts import epoch_stamp
 from observatory.rest.generic import (
     CommonSingle,
     GenericListing,
     common_listing,
+    conditional,
+    etag_of,
     sensor_single,
 )
+from observatory.start.environment import STAMP_LEEWAY
 from observatory.start.extensions import REST
 
 BP_REST_SENSOR = Blueprint('sensor', __name__)
 
 
+def point_entry(elem):
+    stamp = None
+    if isinstance(elem, dict):
+        stamp = elem.get('stamp', None)
+        elem = elem.get('value', None)
+
+    try:
+        value = float(elem)
+    except (TypeError, ValueError) as ex:
+        raise ValueError(f'invalid value "{elem}"') from ex
+
+    if stamp is not None:
+        try:
+            stamp = naive_utc(datetime_from_iso8601(stamp))
+        except (TypeError, ValueError) as ex:
+            raise ValueError(f'invalid stamp "{stamp}"') from ex
+        if stamp > datetime.utcnow() + timedelta(seconds=STAMP_LEEWAY):
+            raise ValueError(f'stamp "{stamp.isoformat()}" in the future')
+
+    return value, stamp
+
+
+def batch_entry(elem):
+    if not isinstance(elem, dict) or not is_slugable(elem.get('sensor')):
+        raise ValueError(f'invalid sensor in "{elem}"')
+
+    value, stamp = point_entry(elem)
+    return elem['sensor'], value, stamp
+
+
+def _entries(elems, func):
+    if not isinstance(elems, list) or not elems:
+        raise ValueError('expected non empty list of points')
+    return [func(elem) for elem in elems]
+
+
+def point_entries(elems):
+    return _entries(elems, point_entry)
+
+
+def batch_entries(elems):
+    return _entries(elems, batch_entry)
+
+
+BUCKET_UNITS = dict(s=1, m=60, h=60 * 60, d=60 * 60 * 24)
+BUCKET_MATCH = re_compile(r'^(\d+)([smhd])$')
+
+
+def bucket_span(value):
+    match = BUCKET_MATCH.match(str(value).strip().lower())
+    if not match:
+        raise ValueError(f'invalid bucket "{value}"')
+    span = int(match.group(1)) * BUCKET_UNITS[match.group(2)]
+    if not 0 < span <= 366 * BUCKET_UNITS['d']:
+        raise ValueError(f'invalid bucket "{value}"')
+    return span
+
+
+AGGREGATE_FNS = dict(
+    min=lambda agg: agg['minimum'],
+    max=lambda agg: agg['maximum'],
+    avg=lambda agg: agg['total'] / agg['length'],
+    count=lambda agg: agg['length'],
+    last=lambda agg: agg['last_value'],
+)
+
+
+def aggregate_fns(value):
+    result = []
+    for name in str(value).split(','):
+        name = name.strip().lower()
+        if name not in AGGREGATE_FNS:
+            raise ValueError(f'invalid function "{name}"')
+        if name not in result:
+            result.append(name)
+    return tuple(result)
+
+
+def aggregate_window(span, *, start=None, end=None):
+    start = start if start is not None else outdated_since()
+    end = end if end is not None else datetime.utcnow()
+
+    def _floor(stamp):
+        return span * (epoch_seconds(stamp) // span)
+
+    return (
+        from_epoch_milliseconds(1000 * _floor(start)),
+        from_epoch_milliseconds(1000 * (_floor(end) + span)),
+    )
+
+
+def aggregate_collect(sensor, span, *, start, end):
+    for tier in sorted(EnumTier, key=lambda tier: tier.value, reverse=True):
+        if span % tier.value:
+            continue
+        if Rollup.covers(tier=tier, sensor=sensor, start=start):
+            return 'rollup', Rollup.aggregate(
+                span=span, tier=tier, sensor=sensor, start=start, end=end
+            )
+
+    return 'point', Point.aggregate(
+        span=span,
+        query=Point.query.with_parent(sensor).filter(
+            Point.created >= start, Point.created < end
+        ),
+    )
+
+
+def sensor_etag(sensor):
+    return etag_of(
+        sensor.slug,
+        sensor.title,
+        sensor.description,
+        sensor.sticky,
+        sensor.created,
+        sensor.point_count,
+        sensor.latest_created,
+        sensor.latest_value,
+        sensor.latest_user_prime,
+    )
+
+
+class SensorCommonSingle(CommonSingle):
+    Model = Sensor
+
+    def get(self, slug):
+        sensor = self.common_or_abort(slug)
+        return conditional(
+            lambda: (marshal(sensor, self.SINGLE_GET), 200),
+            etag=sensor_etag(sensor),
+        )
+
+
 @REST.resource('/sensor', endpoint='api.sensor.listing')
 class SensorListing(GenericListing):
     Model = Sensor
@@ -23,8 +174,7 @@ class SensorListing(GenericListing):
 
 
 @REST.resource('/sensor/<string:slug>', endpoint='api.sensor.single')
-class SensorSingle(CommonSingle):
-    Model = Sensor
+class SensorSingle(SensorCommonSingle):
     SINGLE_GET = sensor_single('latest', {})
 
     @staticmethod
@@ -46,10 +196,160 @@ class SensorSingle(CommonSingle):
         sensor = self.common_or_abort(slug)
         if not sensor.append(user=current_user, value=args.value):
             abort(500, message=f'Could not add {args.value} to {slug}')
+        CHARTS_CACHE.invalidate_sensors(sensor.prime)
+        STREAM.notify()
+        RETENTION.tick()
         return marshal(sensor, self.SINGLE_POST), 201
 
 
 @REST.resource('/sensor/<string:slug>/points', endpoint='api.sensor.points')
-class SensorPoints(CommonSingle):
-    Model = Sensor
+class SensorPoints(SensorCommonSingle):
     SINGLE_GET = sensor_single('points', [])
+
+    @staticmethod
+    def parse():
+        parser = RequestParser()
+        parser.add_argument(
+            'points',
+            type=point_entries,
+            location='json',
+            nullable=False,
+            required=True,
+        )
+        return parser.parse_args()
+
+    POINTS_POST = dict(
+        length=Integer(),
+        sensor=String(attribute='slug'),
+        url=Url(endpoint='api.sensor.points', absolute=True),
+        user=String(attribute='latest.user.username'),
+        value=Float(attribute='latest.value'),
+    )
+
+    @login_required
+    def post(self, slug):
+        args = self.parse()
+        sensor = self.common_or_abort(slug)
+        count = sensor.extend(user=current_user, points=args.points)
+        if not count:
+            abort(500, message=f'Could not add points to {slug}')
+        CHARTS_CACHE.invalidate_sensors(sensor.prime)
+        STREAM.notify()
+        RETENTION.tick(count)
+        return {**marshal(sensor, self.POINTS_POST), 'count': count}, 201
+
+
+@REST.resource(
+    '/sensor/<string:slug>/aggregate', endpoint='api.sensor.aggregate'
+)
+class SensorAggregate(CommonSingle):
+    Model = Sensor
+
+    @staticmethod
+    def parse():
+        parser = RequestParser()
+        parser.add_argument(
+            'bucket',
+            type=bucket_span,
+            location='args',
+            default=BUCKET_UNITS['h'],
+        )
+        parser.add_argument(
+            'from', type=epoch_stamp, location='args', dest='start'
+        )
+        parser.add_argument(
+            'to', type=epoch_stamp, location='args', dest='end'
+        )
+        parser.add_argument(
+            'fn',
+            type=aggregate_fns,
+            location='args',
+            default=tuple(AGGREGATE_FNS),
+        )
+        return parser.parse_args()
+
+    @staticmethod
+    def build(sensor, args):
+        start, end = aggregate_window(
+            args.bucket, start=args.start, end=args.end
+        )
+        source, rows = aggregate_collect(
+            sensor, args.bucket, start=start, end=end
+        )
+        return {
+            'bucket': args.bucket,
+            'data': [
+                {
+                    'x': 1000 * row['bucket'],
+                    **{name: AGGREGATE_FNS[name](row) for name in args.fn},
+                }
+                for row in rows
+            ],
+            'fn': list(args.fn),
+            'sensor': sensor.slug,
+            'source': source,
+        }, 200
+
+    def get(self, slug):
+        sensor = self.common_or_abort(slug)
+        args = self.parse()
+        return conditional(
+            lambda: self.build(sensor, args),
+            etag=etag_of(sensor_etag(sensor), sorted(args.items())),
+        )
+
+
+@REST.resource('/points', endpoint='api.sensor.batch')
+class SensorBatch(Resource):
+    @staticmethod
+    def parse():
+        parser = RequestParser()
+        parser.add_argument(
+            'points',
+            type=batch_entries,
+            location='json',
+            nullable=False,
+            required=True,
+        )
+        return parser.parse_args()
+
+    @staticmethod
+    def sensors_or_abort(slugs):
+        sensors = {sensor.slug: sensor for sensor in Sensor.by_slugs(slugs)}
+        missing = sorted(set(slugs).difference(sensors))
+        if missing:
+            names = ', '.join(missing)
+            abort(404, message=f'Sensor {names} not present')
+        return sensors
+
+    BATCH_POST = dict(
+        length=Integer(),
+        sensor=String(attribute='slug'),
+        url=Url(endpoint='api.sensor.points', absolute=True),
+    )
+
+    @login_required
+    def post(self):
+        args = self.parse()
+        sensors = self.sensors_or_abort([slug for slug, _, _ in args.points])
+        count = Sensor.bulk_append(
+            user=current_user,
+            entries=[
+                (sensors[slug], value, stamp)
+                for slug, value, stamp in args.points
+            ],
+        )
+        if not count:
+            abort(500, message='Could not add points')
+        CHARTS_CACHE.invalidate_sensors(
+            *[sensor.prime for sensor in sensors.values()]
+        )
+        STREAM.notify()
+        RETENTION.tick(count)
+        return {
+            'count': count,
+            'sensors': marshal(
+                sorted(sensors.values(), key=lambda sensor: sensor.slug),
+                self.BATCH_POST,
+            ),
+        }, 201
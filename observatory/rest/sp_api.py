@@ -1,15 +1,24 @@
 from logging import getLogger
 
-from flask import Blueprint, current_app
+from flask import Blueprint, Response, current_app
 from flask_restful import Resource, abort, marshal
 from flask_restful.fields import Boolean, Float, Integer, List, Nested, String
 
 from observatory.instance import SPACE_API
+from observatory.rest.generic import conditional
+from observatory.start.environment import SP_API_MAX_AGE
 from observatory.start.extensions import REST
 
 BP_REST_SP_API = Blueprint('space_api', __name__)
 
 
+def render(content):
+    space = SpaceSchema(content)
+    data = marshal(space.content, space.schema)
+    status = 200 if space.valid else 202
+    return REST.make_response(data, status).get_data(), status
+
+
 @REST.resource('/space.json', endpoint='api.sp_api.json')
 class SpaceApi(Resource):
     @staticmethod
@@ -17,14 +26,15 @@ class SpaceApi(Resource):
         if not current_app.config.get('SP_API_ENABLE', False):
             abort(404)
 
-        space = SpaceSchema(SPACE_API.content)
-        return (
-            marshal(
-                space.content,
-                space.schema,
-            ),
-            200 if space.valid else 202,
+        body, status, etag = SPACE_API.payload(render)
+        response = conditional(
+            lambda: Response(body, status=status, mimetype='application/json'),
+            etag=etag,
         )
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = SP_API_MAX_AGE
+        return response
 
 
 # pylint: disable=too-many-public-methods
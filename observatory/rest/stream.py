@@ -0,0 +1,111 @@
+from json import dumps
+from time import monotonic
+
+from flask import Blueprint, Response, request, stream_with_context
+from flask_restful import Resource
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from observatory.instance import STREAM
+from observatory.models.mapper import Mapper
+from observatory.models.point import Point
+from observatory.rest.charts import ChartsPlot
+from observatory.start.extensions import DB, REST
+
+BP_REST_STREAM = Blueprint('stream', __name__)
+
+# pylint: disable=no-member
+
+
+def event_cursor(value):
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor >= 0 else None
+
+
+def query_events(prompt_prime, cursor, *, size=1000):
+    return (
+        DB.session.query(Point, Mapper)
+        .join(Mapper, Mapper.sensor_prime == Point.sensor_prime)
+        .options(joinedload(Mapper.sensor))
+        .filter(
+            Mapper.prompt_prime == prompt_prime,
+            Mapper.active.is_(True),
+            Point.prime > cursor,
+        )
+        .order_by(Point.prime.asc())
+        .limit(size)
+    )
+
+
+def event_text(point, mapper, value):
+    data = dict(sensor=mapper.sensor.slug, x=point.created_epoch_ms, y=value)
+    return f'id: {point.prime}\nevent: point\ndata: {dumps(data)}\n\n'
+
+
+def event_texts(rows):
+    groups = {}
+    for point, mapper in rows:
+        groups.setdefault(mapper.sensor_prime, (mapper, []))[1].append(point)
+
+    values = {}
+    for mapper, points in groups.values():
+        values.update(
+            zip(
+                [point.prime for point in points],
+                Point.translate_values(
+                    [point.value for point in points],
+                    horizon=mapper.horizon,
+                    convert=mapper.convert,
+                    elevate=mapper.elevate,
+                    numeric=True,
+                ),
+            )
+        )
+
+    return [
+        (point.prime, event_text(point, mapper, values[point.prime]))
+        for point, mapper in rows
+    ]
+
+
+def generate(prompt_prime, cursor, *, size=1000):
+    yield f'retry: {int(1000 * STREAM.poll)}\n\n'
+
+    until = monotonic() + STREAM.lifetime
+    while monotonic() < until:
+        serial = STREAM.serial
+        events = event_texts(
+            query_events(prompt_prime, cursor, size=size).all()
+        )
+        DB.session.commit()
+
+        for prime, text in events:
+            cursor = prime
+            yield text
+        if len(events) >= size:
+            continue
+        if not events:
+            yield ': idle\n\n'
+
+        STREAM.wait(
+            serial, timeout=min(STREAM.poll, max(0, until - monotonic()))
+        )
+
+
+@REST.resource('/stream/prompt/<string:slug>', endpoint='api.stream.prompt')
+class StreamPrompt(Resource):
+    @staticmethod
+    def get(slug):
+        prompt = ChartsPlot.prompt_active_or_abort(slug)
+        cursor = event_cursor(request.headers.get('Last-Event-ID', None))
+        if cursor is None:
+            cursor = DB.session.query(func.max(Point.prime)).scalar() or 0
+
+        return Response(
+            stream_with_context(generate(prompt.prime, cursor)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
@@ -33,7 +33,9 @@ from observatory.forms.space_drop import (
 )
 from observatory.lib.text import random_line
 from observatory.start.environment import (
+    API_PLOT_POINTS,
     API_PLOT_REFRESH_MS,
+    BACKLOG_DAYS,
     FMT_MOMENT_DAY,
     FMT_MOMENT_DEFAULT,
     FMT_MOMENT_HOUR,
@@ -75,6 +77,7 @@ def tagline():
 
 def script_config_data():
     api_plot_base_url = url_for('api.charts.plot', slug='', _external=True)
+    api_plot_backlog_ms = BACKLOG_DAYS * 24 * 60 * 60 * 1000
     api_space_api_url = (
         url_for('api.sp_api.json', _external=True)
         if current_app.config.get('SP_API_ENABLE', False)
@@ -85,7 +88,9 @@ def script_config_data():
         ' '.join(
             line.strip()
             for line in f'''
+data-api-plot-backlog-ms="{api_plot_backlog_ms}"
 data-api-plot-base-url="{api_plot_base_url}"
+data-api-plot-points="{API_PLOT_POINTS}"
 data-api-plot-refresh-ms="{API_PLOT_REFRESH_MS}"
 data-api-space-api-url="{api_space_api_url}"
 data-moment-default-format="{FMT_MOMENT_DEFAULT}"
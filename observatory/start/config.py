@@ -9,8 +9,10 @@ from observatory.start.environment import (
     FAVICON,
     HTML_LANG,
     ICON,
+    RETENTION_BACKGROUND,
     SECRET_BASE,
     SECRET_FILE,
+    SP_API_BACKGROUND,
     SP_API_ENABLE,
     TITLE,
 )
@@ -37,7 +39,9 @@ class BaseConfig:
     FAVICON = FAVICON
     HTML_LANG = HTML_LANG
     ICON = ICON
+    RETENTION_BACKGROUND = RETENTION_BACKGROUND
     SECRET_KEY = secret_key()
+    SP_API_BACKGROUND = SP_API_BACKGROUND
     SP_API_ENABLE = SP_API_ENABLE
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     TESTING = False
@@ -57,6 +61,8 @@ class DevelopmentConfig(BaseConfig):
 
 class TestingConfig(BaseConfig):
     BCRYPT_LOG_ROUNDS = 5
+    RETENTION_BACKGROUND = False
+    SP_API_BACKGROUND = False
     SP_API_ENABLE = True
     SQLALCHEMY_DATABASE_URI = 'sqlite://'
     TESTING = True
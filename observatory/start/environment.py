@@ -29,12 +29,29 @@ BCRYPT_LOG_ROUNDS = parse_int(getenv('BCRYPT_LOG_ROUNDS', '13'), fallback=13)
 CSRF_STRICT = parse_bool(getenv('CSRF_STRICT', 'true'), fallback=True)
 
 BACKLOG_DAYS = parse_int(getenv('BACKLOG_DAYS', '14'), fallback=True)
+STAMP_LEEWAY = parse_int(getenv('STAMP_LEEWAY', '60'), fallback=60)
+
+RETENTION_CHUNK = parse_int(getenv('RETENTION_CHUNK', '1000'), fallback=1000)
+RETENTION_WRITES = parse_int(getenv('RETENTION_WRITES', '500'), fallback=500)
+RETENTION_REFRESH = parse_int(
+    getenv('RETENTION_REFRESH', f'{60 * 60}'), fallback=60 * 60
+)
+RETENTION_BACKGROUND = parse_bool(
+    getenv('RETENTION_BACKGROUND', 'true'), fallback=True
+)
 
 SP_API_ENABLE = parse_bool(getenv('SP_API_ENABLE', 'true'), fallback=True)
 SP_API_PREFIX = getenv('SP_API_PREFIX', 'space_api')
 SP_API_REFRESH = parse_int(
     getenv('SP_API_REFRESH', f'{60 * 300}'), fallback=60 * 300
 )
+SP_API_LIVE_REFRESH = parse_int(
+    getenv('SP_API_LIVE_REFRESH', '60'), fallback=60
+)
+SP_API_MAX_AGE = parse_int(getenv('SP_API_MAX_AGE', '60'), fallback=60)
+SP_API_BACKGROUND = parse_bool(
+    getenv('SP_API_BACKGROUND', 'false'), fallback=False
+)
 
 
 TITLE = getenv('TITLE', 'Observatory')
@@ -56,6 +73,11 @@ FMT_MOMENT_YEAR = getenv('FMT_MOMENT_YEAR', 'MMM YYYY')
 API_PLOT_REFRESH_MS = parse_int(
     getenv('API_PLOT_REFRESH_MS', f'{60 * 1000}'), fallback=60 * 1000
 )
+API_PLOT_POINTS = parse_int(getenv('API_PLOT_POINTS', '1000'), fallback=1000)
+API_PLOT_CACHE = parse_int(getenv('API_PLOT_CACHE', '16'), fallback=16)
+
+STREAM_POLL = parse_int(getenv('STREAM_POLL', '2'), fallback=2)
+STREAM_LIFETIME = parse_int(getenv('STREAM_LIFETIME', '300'), fallback=300)
 
 
 TAGLINES = [
@@ -22,6 +22,7 @@ from observatory.forms.mapper import (
     MapperEditForm,
     MapperSortForm,
 )
+from observatory.instance import CHARTS_CACHE
 from observatory.lib.text import extract_slug
 from observatory.models.mapper import Mapper
 from observatory.models.prompt import Prompt
@@ -94,6 +95,7 @@ def edit_mapper(prompt_slug=None, sensor_slug=None):
     if request.method == 'POST' and form.validate_on_submit():
         mapper = form.action()
         if mapper is not None:
+            CHARTS_CACHE.clear()
             slug = extract_slug(mapper)
             flash(f'Saved mapper {slug}!', 'success')
             return redirect(url_for('mgnt.view_mapper'))
@@ -112,6 +114,7 @@ def _edit_common(form, redirect_ep):
     if request.method == 'POST' and form.validate_on_submit():
         thing = form.action()
         if thing is not None:
+            CHARTS_CACHE.clear()
             flash(f'{name} {thing.slug} saved!', 'success')
             return redirect(url_for(redirect_ep))
 
@@ -163,6 +166,7 @@ def _drop_generic(form, redirect_ep):
     if request.method == 'POST' and form.validate_on_submit():
         slug = extract_slug(form.thing)
         if form.action() is not None:
+            CHARTS_CACHE.clear()
             flash(f'{name} {slug} deleted!', 'success')
 
     return redirect(url_for(redirect_ep))
@@ -221,6 +225,7 @@ def _sort_generic(form, redirect_ep):
         slug = extract_slug(form.thing)
         verb = 'raised' if form.lift else 'lowered'
         if form.action() is not None:
+            CHARTS_CACHE.clear()
             flash(f'{name} {slug} {verb}!', 'success')
         else:
             flash(f'Can not move {name} {slug}!', 'error')
@@ -1,16 +1,20 @@
+from datetime import datetime, timedelta
 from json import loads
 
 from bs4 import BeautifulSoup
 from flask import url_for
 from flask_login import logout_user
 from pytest import fixture
+from sqlalchemy import event
 
 from observatory.app import create_app
-from observatory.instance import SPACE_API
+from observatory.instance import CHARTS_CACHE, RETENTION, SPACE_API, STREAM
+from observatory.models.point import Point
 from observatory.models.prompt import Prompt
 from observatory.models.sensor import Sensor
 from observatory.models.user import User
 from observatory.start.config import TestingConfig
+from observatory.start.environment import BACKLOG_DAYS
 from observatory.start.extensions import DB as _db
 
 SENSOR_SLUG = 'test'
@@ -61,7 +65,23 @@ def session(db):
     _connection.close()
     _session.remove()
 
+    CHARTS_CACHE.clear()
+    RETENTION.clear()
     SPACE_API.clear()
+    STREAM.clear()
+
+
+@fixture(scope='function')
+def queries(session):
+    statements = []
+
+    def _count(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, 'before_cursor_execute', _count)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', _count)
 
 
 @fixture(scope='session')
@@ -185,3 +205,41 @@ def gen_user_loggedin(gen_user, client):
 
     yield make
     logout_user()
+
+
+@fixture(scope='function')
+def gen_points_batch(gen_sensor, gen_user):
+    def make(
+        sensor=None,
+        user=None,
+        start=None,
+        old=5,
+        new=5,
+    ):
+
+        sensor = sensor if sensor is not None else gen_sensor()
+        user = user if user is not None else gen_user()
+        start = start if start is not None else datetime.utcnow()
+
+        olds = [
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start - timedelta(days=BACKLOG_DAYS, hours=value),
+            )
+            for value in range(old)
+        ]
+        news = [
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start + timedelta(days=BACKLOG_DAYS, hours=value),
+            )
+            for value in range(new)
+        ]
+
+        return olds, news, [fl for at in (olds, news) for fl in at]
+
+    yield make
@@ -3,9 +3,11 @@ from datetime import datetime, timedelta
 from pytest import fixture, mark
 
 from observatory.models.point import Point
+from observatory.models.rollup import Rollup
 from observatory.models.sensor import Sensor
 from observatory.models.user import User
 from observatory.start.environment import BACKLOG_DAYS
+from observatory.start.extensions import DB
 
 
 @fixture(scope='function')
@@ -260,6 +262,13 @@ class TestCli:
         assert f'deleted {number}' in result.output.lower()
 
         assert Point.query.count() == 0
+        sensor = Sensor.query.first()
+        assert sensor.length == 0
+        assert sensor.rollups == []
+        assert User.query.first().length == 0
+        assert sensor.latest_value is None
+        assert sensor.latest_created is None
+        assert sensor.latest_user is None
 
     @staticmethod
     def test_sensorclear_not_found(invoke):
@@ -271,3 +280,66 @@ class TestCli:
             'test',
         )
         assert 'not present' in result.output.lower()
+
+    @staticmethod
+    def test_pointcount(invoke, gen_sensor, gen_user):
+        one, two = gen_sensor('one'), gen_sensor('two')
+        user = gen_user()
+        for sensor, num in ((one, 3), (two, 2)):
+            for value in range(num):
+                sensor.append(user=user, value=value)
+
+        connection = DB.session.connection()
+        for table in (Sensor.__table__, User.__table__):
+            connection.execute(table.update().values(point_count=0))
+        DB.session.commit()
+
+        result = invoke('pointcount')
+        assert 'for 2 sensors and 1 users' in result.output.lower()
+
+        assert [
+            sensor.length for sensor in Sensor.query.order_by(Sensor.slug)
+        ] == [3, 2]
+        assert User.query.first().length == 5
+
+    @staticmethod
+    def test_rollup(invoke, gen_sensor, gen_user):
+        one, two = gen_sensor('one'), gen_sensor('two')
+        user = gen_user()
+        for sensor in (one, two):
+            sensor.append(user=user, value=23)
+        assert Rollup.query.count() == 6
+
+        Rollup.query.delete()
+        DB.session.commit()
+
+        result = invoke('rollup', '--slug', one.slug)
+        assert 'created 3 rollup buckets' in result.output.lower()
+        assert Rollup.query.count() == 3
+
+        result = invoke('rollup')
+        assert 'created 6 rollup buckets' in result.output.lower()
+        assert Rollup.query.count() == 6
+
+    @staticmethod
+    def test_rollup_not_found(invoke):
+        result = invoke('rollup', '--slug', 'test')
+        assert 'not present' in result.output.lower()
+
+    @staticmethod
+    def test_retention(invoke, gen_sensor, gen_points_batch):
+        sensor = gen_sensor()
+        gen_points_batch(sensor=sensor, old=5, new=3)
+        assert Point.query.count() == 8
+
+        result = invoke('retention')
+        assert 'deleted 5 outdated' in result.output.lower()
+
+        assert Point.query.count() == 3
+
+    @staticmethod
+    def test_retention_empty(invoke):
+        assert Point.query.count() == 0
+
+        result = invoke('retention')
+        assert 'deleted 0 outdated' in result.output.lower()
@@ -1,9 +1,12 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from observatory.lib.clock import (
     epoch_milliseconds,
     epoch_seconds,
+    from_epoch_milliseconds,
     is_outdated,
+    naive_utc,
+    outdated_since,
     time_format,
 )
 from observatory.start.environment import FMT_STRFTIME
@@ -41,6 +44,16 @@ def test_is_outdated():
     assert is_outdated(now - timedelta(days=5), days=days) is True
 
 
+def test_outdated_since():
+    start = datetime.utcnow()
+    days = 3
+
+    since = outdated_since(days)
+    assert start - timedelta(days=days) <= since
+    assert since <= datetime.utcnow() - timedelta(days=days)
+    assert is_outdated(since, days=days) is True
+
+
 def test_time_format():
     now = datetime.utcnow()
 
@@ -51,3 +64,32 @@ def test_time_format():
     assert time_format(now, fmt='%Y') == f'{now.year}'
     assert time_format(now, fmt='%-m') == f'{now.month}'
     assert time_format(now) == now.strftime(FMT_STRFTIME)
+
+
+def test_naive_utc():
+    stamp = datetime(2021, 1, 1, 10, 0, 0)
+
+    assert naive_utc(None) is None
+    assert naive_utc('2021-01-01') is None
+    assert naive_utc(stamp) == stamp
+    assert naive_utc(stamp.replace(tzinfo=timezone.utc)) == stamp
+    assert (
+        naive_utc(
+            datetime(2021, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=2)))
+        )
+        == stamp
+    )
+
+
+def test_from_epoch_milliseconds():
+    stamp = datetime(2021, 1, 1, 10, 0, 0)
+
+    assert from_epoch_milliseconds(None) is None
+    assert from_epoch_milliseconds('1609495200000') is None
+    assert from_epoch_milliseconds(True) is None
+    assert from_epoch_milliseconds(0) == datetime.utcfromtimestamp(0)
+    assert from_epoch_milliseconds(1609495200000) == stamp
+    assert from_epoch_milliseconds(1609495200123.0) == stamp.replace(
+        microsecond=123000
+    )
+    assert from_epoch_milliseconds(epoch_milliseconds(stamp)) == stamp
@@ -0,0 +1,80 @@
+from math import pi, sin
+
+from observatory.lib.sample import lttb, minmax
+
+
+def _points(values):
+    return [dict(x=num, y=value) for num, value in enumerate(values)]
+
+
+def test_lttb_passthrough():
+    points = _points(range(10))
+    for threshold in (0, None, 10, 23):
+        assert lttb(points, threshold) == points
+
+    assert lttb([], 5) == []
+    assert lttb(points[:3], 1) == points[:3]
+
+
+def test_lttb_size():
+    points = _points(sin(num / 50 * pi) for num in range(1000))
+    for threshold in (3, 10, 100, 999):
+        result = lttb(points, threshold)
+        assert len(result) == threshold
+        assert result[0] == points[0]
+        assert result[-1] == points[-1]
+        assert [elem['x'] for elem in result] == sorted(
+            elem['x'] for elem in result
+        )
+
+    assert len(lttb(points, 1)) == 3
+
+
+def test_lttb_shape():
+    values = [0.0] * 100
+    values[42] = 23.0
+    values[77] = -5.0
+    result = lttb(_points(values), 10)
+
+    assert dict(x=42, y=23.0) in result
+    assert dict(x=77, y=-5.0) in result
+
+
+def test_lttb_keys():
+    points = [dict(a=num, b=num % 7) for num in range(50)]
+    result = lttb(points, 10, xkey='a', ykey='b')
+    assert len(result) == 10
+    assert result[0] == points[0]
+    assert result[-1] == points[-1]
+
+
+def test_minmax_passthrough():
+    points = _points(range(10))
+    for threshold in (0, None, 10, 23):
+        assert minmax(points, threshold) == points
+
+    assert minmax([], 5) == []
+    assert minmax(points[:4], 1) == points[:4]
+
+
+def test_minmax_size():
+    points = _points(num % 2 for num in range(1000))
+    for threshold in (4, 10, 100, 999):
+        result = minmax(points, threshold)
+        assert len(result) <= threshold
+        assert result[0] == points[0]
+        assert result[-1] == points[-1]
+        assert [elem['x'] for elem in result] == sorted(
+            elem['x'] for elem in result
+        )
+
+
+def test_minmax_keeps_extremes():
+    values = [1.0] * 100
+    values[13] = 0.0
+    values[77] = 0.0
+    result = minmax(_points(values), 6)
+
+    assert len(result) == 6
+    assert dict(x=13, y=0.0) in result
+    assert dict(x=77, y=0.0) in result
@@ -0,0 +1,127 @@
+from threading import Thread
+
+from pytest import fixture
+
+from observatory.logic.charts_cache import ChartsCache
+from observatory.start.environment import API_PLOT_CACHE
+
+# pylint: disable=redefined-outer-name
+
+
+@fixture(scope='function')
+def cache():
+    yield ChartsCache(size=2)
+
+
+class TestChartsCache:
+    @staticmethod
+    def test_initial():
+        obj = ChartsCache()
+        assert obj.size == API_PLOT_CACHE
+        assert getattr(obj, '_content', 'error') == {}
+        assert getattr(obj, '_sensors', 'error') == {}
+
+    @staticmethod
+    def test_get_empty(cache):
+        assert cache.get('demo', (), etag='etag') is None
+
+    @staticmethod
+    def test_put_get(cache):
+        assert cache.put('demo', (), etag='etag', sensors=[1], body=b'[]') == (
+            b'[]'
+        )
+        assert cache.get('demo', (), etag='etag') == b'[]'
+        assert cache.get('demo', (), etag='other') is None
+        assert cache.get('demo', ('key',), etag='etag') is None
+        assert cache.get('other', (), etag='etag') is None
+
+    @staticmethod
+    def test_put_replace(cache):
+        cache.put('demo', (), etag='one', sensors=[1], body=b'one')
+        cache.put('demo', (), etag='two', sensors=[1], body=b'two')
+        assert cache.get('demo', (), etag='one') is None
+        assert cache.get('demo', (), etag='two') == b'two'
+
+    @staticmethod
+    def test_put_size(cache):
+        for num in range(3):
+            cache.put('demo', (num,), etag='etag', sensors=[], body=b'')
+
+        assert cache.get('demo', (0,), etag='etag') is None
+        assert cache.get('demo', (1,), etag='etag') == b''
+        assert cache.get('demo', (2,), etag='etag') == b''
+
+    @staticmethod
+    def test_put_disabled():
+        obj = ChartsCache(size=0)
+        assert obj.put('demo', (), etag='etag', sensors=[], body=b'[]') == (
+            b'[]'
+        )
+        assert obj.get('demo', (), etag='etag') is None
+
+    @staticmethod
+    def test_invalidate(cache):
+        cache.put('one', (), etag='etag', sensors=[1], body=b'')
+        cache.put('one', ('key',), etag='etag', sensors=[1], body=b'')
+        cache.put('two', (), etag='etag', sensors=[2], body=b'')
+
+        assert cache.invalidate('one', 'missing') == 2
+        assert cache.get('one', (), etag='etag') is None
+        assert cache.get('two', (), etag='etag') == b''
+        assert cache.invalidate('one') == 0
+
+    @staticmethod
+    def test_invalidate_sensors(cache):
+        cache.put('one', (), etag='etag', sensors=[1, 2], body=b'')
+        cache.put('two', (), etag='etag', sensors=[2, 3], body=b'')
+        cache.put('three', (), etag='etag', sensors=[4], body=b'')
+
+        assert cache.invalidate_sensors(5) == 0
+        assert cache.invalidate_sensors(1) == 1
+        assert cache.get('one', (), etag='etag') is None
+        assert cache.get('two', (), etag='etag') == b''
+
+        assert cache.invalidate_sensors(3, 4) == 2
+        assert getattr(cache, '_content', 'error') == {}
+        assert getattr(cache, '_sensors', 'error') == {}
+
+    @staticmethod
+    def test_clear(cache):
+        cache.put('demo', (), etag='etag', sensors=[1], body=b'')
+        assert cache.clear() is True
+        assert cache.get('demo', (), etag='etag') is None
+        assert getattr(cache, '_content', 'error') == {}
+        assert getattr(cache, '_sensors', 'error') == {}
+
+    @staticmethod
+    def test_threads(cache):
+        errors = []
+
+        def _put(num):
+            try:
+                for idx in range(500):
+                    cache.put(
+                        f'{num}-{idx}',
+                        (),
+                        etag='etag',
+                        sensors=[idx],
+                        body=b'',
+                    )
+            except RuntimeError as ex:
+                errors.append(ex)
+
+        def _invalidate():
+            try:
+                for idx in range(500):
+                    cache.invalidate_sensors(idx)
+            except RuntimeError as ex:
+                errors.append(ex)
+
+        threads = [Thread(target=_put, args=(num,)) for num in range(4)]
+        threads.append(Thread(target=_invalidate))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
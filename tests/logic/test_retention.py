@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from threading import Event
+
+from pytest import fixture, mark
+
+from observatory.logic.retention import Retention
+from observatory.models.point import Point
+from observatory.start.environment import RETENTION_REFRESH, RETENTION_WRITES
+
+# pylint: disable=redefined-outer-name
+
+
+@fixture(scope='function')
+def ret():
+    yield Retention(writes=3, refresh=60)
+
+
+class TestRetention:
+    @staticmethod
+    def test_initial():
+        obj = Retention()
+        assert obj.writes == RETENTION_WRITES
+        assert obj.refresh == RETENTION_REFRESH
+        assert getattr(obj, '_count', 'error') == 0
+        assert getattr(obj, '_last', 'error') is None
+        assert obj.due is True
+
+    @staticmethod
+    def test_due(ret, monkeypatch):
+        monkeypatch.setattr(ret, '_last', datetime.utcnow())
+        assert ret.due is False
+
+        monkeypatch.setattr(ret, '_count', 3)
+        assert ret.due is True
+
+        monkeypatch.setattr(ret, '_count', 0)
+        monkeypatch.setattr(
+            ret, '_last', datetime.utcnow() - timedelta(seconds=120)
+        )
+        assert ret.due is True
+
+    @staticmethod
+    def test_due_writes_disabled(ret, monkeypatch):
+        monkeypatch.setattr(ret, 'writes', 0)
+        monkeypatch.setattr(ret, '_last', datetime.utcnow())
+        monkeypatch.setattr(ret, '_count', 9001)
+        assert ret.due is False
+
+    @staticmethod
+    def test_clear(ret, monkeypatch):
+        monkeypatch.setattr(ret, '_count', 23)
+        monkeypatch.setattr(ret, '_last', datetime.utcnow())
+        getattr(ret, '_wake').set()
+
+        assert ret.clear() is True
+        assert getattr(ret, '_count', 'error') == 0
+        assert getattr(ret, '_last', 'error') is None
+        assert getattr(ret, '_wake').is_set() is False
+
+    @staticmethod
+    @mark.usefixtures('session')
+    def test_sweep(ret, gen_sensor, gen_points_batch):
+        sensor = gen_sensor()
+        _, news, _ = gen_points_batch(sensor=sensor, old=5, new=2)
+
+        assert Point.query.count() == 7
+        assert ret.sweep() == 5
+        assert Point.query.count() == 2
+        assert getattr(ret, '_count', 'error') == 0
+        assert getattr(ret, '_last', 'error') is not None
+        assert sorted(sensor.points, key=lambda p: p.prime) == news
+
+    @staticmethod
+    def test_tick(ret, monkeypatch):
+        monkeypatch.setattr(ret, '_last', datetime.utcnow())
+
+        assert ret.tick(2) is False
+        assert getattr(ret, '_count', 'error') == 2
+        assert getattr(ret, '_wake').is_set() is False
+
+        assert ret.tick() is True
+        assert getattr(ret, '_count', 'error') == 3
+        assert getattr(ret, '_wake').is_set() is True
+
+    @staticmethod
+    def test_background(monkeypatch, app, ret):
+        swept = Event()
+        calls = []
+
+        def _sweep(_commit=True):
+            calls.append(_commit)
+            if len(calls) == 1:
+                raise RuntimeError('broken')
+            swept.set()
+            return 0
+
+        monkeypatch.setattr(ret, 'sweep', _sweep)
+
+        thread = ret.start(app, interval=0.01)
+        assert thread.is_alive()
+        assert ret.start(app, interval=0.01) is thread
+
+        assert swept.wait(5)
+        assert calls[:2] == [True, True]
+
+        assert ret.stop()
+        assert not thread.is_alive()
+
+    @staticmethod
+    def test_background_wake(monkeypatch, app, ret):
+        swept = Event()
+        monkeypatch.setattr(ret, '_last', datetime.utcnow())
+        monkeypatch.setattr(ret, 'sweep', lambda: swept.set())
+
+        thread = ret.start(app, interval=60)
+        assert swept.wait(0.1) is False
+
+        assert ret.tick(3) is True
+        assert swept.wait(5)
+
+        assert ret.stop()
+        assert not thread.is_alive()
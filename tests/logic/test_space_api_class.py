@@ -3,14 +3,16 @@ from datetime import datetime, timedelta
 from pytest import fixture
 
 from observatory.logic.space_api import SpaceApi
-from observatory.start.environment import SP_API_REFRESH
+from observatory.start.environment import SP_API_LIVE_REFRESH, SP_API_REFRESH
 
 VERY_OLD = datetime.utcnow() - timedelta(seconds=23 * SP_API_REFRESH)
+LIVE_OLD = datetime.utcnow() - timedelta(seconds=23 * SP_API_LIVE_REFRESH)
 CONTENT = {
     'very': 'important',
     'test': 'content',
 }
 STATE = {'broken': True}
+LIVE = {'state': STATE, 'sensors': {}}
 EVENTS = ['hardcore', 'party', 'action']
 
 # pylint: disable=redefined-outer-name
@@ -29,13 +31,23 @@ def api(monkeypatch):
     def _inner_last(value):
         monkeypatch.setattr(obj, '_last', value)
 
+    def _inner_live_last(value):
+        monkeypatch.setattr(obj, '_live_last', value)
+
     def build_fn(value):
-        monkeypatch.setattr(obj, 'build', lambda: value)
+        monkeypatch.setattr(obj, 'build_static', lambda: value)
+
+    def live_fn(value):
+        monkeypatch.setattr(obj, 'build_live', lambda: value)
+
+    live_fn({})
 
     res.obj = obj
     res.inner_content = _inner_content
     res.inner_last = _inner_last
+    res.inner_live_last = _inner_live_last
     res.build_fn = build_fn
+    res.live_fn = live_fn
 
     yield res
 
@@ -119,3 +131,66 @@ class TestSpaceApiClass:
         last = getattr(api.obj, '_last', 'error')
         assert last >= past
         assert last < datetime.utcnow()
+
+    @staticmethod
+    def test_payload_method(api):
+        calls = []
+
+        def render(content):
+            calls.append(content)
+            return repr(sorted(content.items())).encode(), 200
+
+        api.build_fn(CONTENT)
+        body, status, etag = api.obj.payload(render)
+        assert body == repr(sorted(CONTENT.items())).encode()
+        assert status == 200
+        assert etag
+        assert calls == [CONTENT]
+
+        assert api.obj.payload(render) == (body, status, etag)
+        assert calls == [CONTENT]
+
+        new_content = dict(state=STATE, **CONTENT)
+        api.build_fn(new_content)
+        assert api.obj.reset() == new_content
+        assert getattr(api.obj, '_payload', 'error') is None
+
+        res_body, _, res_etag = api.obj.payload(render)
+        assert res_body != body
+        assert res_etag != etag
+        assert calls == [CONTENT, new_content]
+
+    @staticmethod
+    def test_live_outdated(api):
+        assert api.obj.live_outdated is True
+
+        api.build_fn({})
+        api.live_fn(LIVE)
+        assert api.obj.content == LIVE
+        assert api.obj.live_outdated is False
+
+        api.inner_live_last(LIVE_OLD)
+        assert api.obj.live_outdated is True
+
+    @staticmethod
+    def test_content_merged(api):
+        api.build_fn(CONTENT)
+        api.live_fn(LIVE)
+
+        content = api.obj.content
+        assert content == dict(**CONTENT, **LIVE)
+        assert api.obj.content is content
+
+        past = getattr(api.obj, '_last', 'error')
+        new_live = {'state': {}, 'sensors': {'temperature': []}}
+        api.build_fn({'ignored': 'static'})
+        api.live_fn(new_live)
+        api.inner_live_last(LIVE_OLD)
+
+        res = api.obj.content
+        assert res is not content
+        assert res == dict(**CONTENT, **new_live)
+        assert getattr(api.obj, '_last', 'error') is past
+
+        api.inner_last(VERY_OLD)
+        assert api.obj.content == dict(ignored='static', **new_live)
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from pytest import mark
+
+from observatory.logic.space_api import SpaceApi
+from observatory.models.value import Value
+from observatory.start.environment import SP_API_LIVE_REFRESH, SP_API_PREFIX
+
+
+@mark.usefixtures('session')
+class TestSpaceApiLive:
+    @staticmethod
+    def test_sections():
+        api = SpaceApi()
+        static, live = api.build_static(), api.build_live()
+
+        assert sorted(live) == ['sensors', 'state']
+        assert not set(static).intersection(live)
+        assert api.build() == {**static, **live}
+
+    @staticmethod
+    def test_live_refresh(queries, gen_sensor, gen_user):
+        api = SpaceApi()
+        sensor, user = gen_sensor(), gen_user()
+        sensor.append(user=user, value=21.5)
+        Value.set(key=f'{SP_API_PREFIX}.space', elem='space')
+        for key, elem in [
+            ('sensors.temperature.value', sensor),
+            ('sensors.temperature.unit', '°C'),
+            ('sensors.temperature.location', 'room'),
+        ]:
+            Value.set(key=f'{SP_API_PREFIX}.{key}', elem=elem)
+
+        content = api.content
+        assert content['space'] == 'space'
+        assert content['sensors']['temperature'][0]['value'] == 21.5
+        last = getattr(api, '_last', 'error')
+
+        sensor.append(user=user, value=23.0)
+        Value.set(key=f'{SP_API_PREFIX}.space', elem='changed')
+        assert api.content is content
+
+        setattr(
+            api,
+            '_live_last',
+            datetime.utcnow() - timedelta(seconds=2 * SP_API_LIVE_REFRESH),
+        )
+        queries.clear()
+        content = api.content
+        assert len(queries) == 1
+        assert content['space'] == 'space'
+        assert content['sensors']['temperature'][0]['value'] == 23.0
+        assert getattr(api, '_last', 'error') is last
+
+        api.reset()
+        assert api.content['space'] == 'changed'
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from threading import Event, Thread
+
+from pytest import fixture, mark
+
+from observatory.logic.space_api import SpaceApi
+from observatory.start.environment import SP_API_LIVE_REFRESH, SP_API_REFRESH
+
+STATIC = {'space': 'space'}
+LIVE = {'state': {}, 'sensors': {}}
+
+# pylint: disable=redefined-outer-name
+
+
+@fixture(scope='function')
+def api(monkeypatch):
+    obj = SpaceApi()
+    calls = []
+
+    def _static():
+        calls.append('static')
+        return dict(STATIC)
+
+    def _live():
+        calls.append('live')
+        return dict(LIVE)
+
+    monkeypatch.setattr(obj, 'build_static', _static)
+    monkeypatch.setattr(obj, 'build_live', _live)
+    obj.calls = calls
+
+    yield obj
+    obj.stop()
+
+
+def _age(obj, *, static=0, live=0):
+    now = datetime.utcnow()
+    setattr(obj, '_last', now - timedelta(seconds=static))
+    setattr(obj, '_live_last', now - timedelta(seconds=live))
+
+
+class TestSpaceApiRefresh:
+    @staticmethod
+    def test_single_flight(monkeypatch, api):
+        entered, release = Event(), Event()
+
+        def _slow():
+            api.calls.append('live')
+            entered.set()
+            release.wait(5)
+            return dict(LIVE)
+
+        monkeypatch.setattr(api, 'build_live', _slow)
+        results = []
+        threads = [
+            Thread(target=lambda: results.append(api.content))
+            for _ in range(4)
+        ]
+        threads[0].start()
+        assert entered.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert api.calls == ['static', 'live']
+        assert results == [{**STATIC, **LIVE}] * 4
+
+    @staticmethod
+    def test_stale_while_revalidate(api):
+        stale = api.content
+        assert api.calls == ['static', 'live']
+
+        _age(api, live=2 * SP_API_LIVE_REFRESH)
+        with getattr(api, '_lock'):
+            assert api.content is stale
+        assert api.calls == ['static', 'live']
+
+        fresh = api.content
+        assert fresh is not stale
+        assert fresh == stale
+        assert api.calls == ['static', 'live', 'live']
+
+    @staticmethod
+    def test_refresh_lead(api):
+        api.refresh()
+        assert api.calls == ['static', 'live']
+
+        _age(api, live=SP_API_LIVE_REFRESH - 5)
+        api.refresh(lead=1)
+        assert api.calls == ['static', 'live']
+        api.refresh(lead=10)
+        assert api.calls == ['static', 'live', 'live']
+
+        _age(api, static=SP_API_REFRESH - 5)
+        api.refresh(lead=10)
+        assert api.calls == ['static', 'live', 'live', 'static']
+        assert api.outdated is False
+        assert api.live_outdated is False
+
+    @staticmethod
+    @mark.usefixtures('ctx_app')
+    def test_background(monkeypatch, app, api):
+        refreshed = Event()
+        leads = []
+
+        def _refresh(*, lead=0):
+            leads.append(lead)
+            if len(leads) == 1:
+                raise RuntimeError('broken')
+            refreshed.set()
+
+        monkeypatch.setattr(api, 'refresh', _refresh)
+
+        thread = api.start(app, interval=0.01)
+        assert thread.is_alive()
+        assert api.start(app, interval=0.01) is thread
+
+        assert refreshed.wait(5)
+        assert leads[:2] == [0.01, 0.01]
+
+        assert api.stop()
+        assert not thread.is_alive()
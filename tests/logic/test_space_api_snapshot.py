@@ -0,0 +1,77 @@
+from pytest import mark
+
+from observatory.logic.space_api import SpaceApi
+from observatory.models.value import Value
+from observatory.start.environment import SP_API_PREFIX
+
+
+def _populate(sensors, user, num):
+    for idx in range(num):
+        sensor = sensors(f'sensor-{idx}')
+        sensor.append(user=user, value=idx)
+        for key, elem in [
+            ('sensors.temperature.value', sensor),
+            ('sensors.temperature.unit', '°C'),
+            ('sensors.temperature.location', f'room #{idx}'),
+            ('contact.keymasters.name', f'keymaster #{idx}'),
+            ('contact.keymasters.email', f'km{idx}@example.org'),
+            ('links.name', f'link #{idx}'),
+            ('links.url', f'https://example.org/{idx}'),
+        ]:
+            Value.set(key=f'{SP_API_PREFIX}.{key}', idx=idx, elem=elem)
+
+
+@mark.usefixtures('session')
+class TestSpaceApiSnapshot:
+    @staticmethod
+    def test_load(gen_sensor):
+        sensor = gen_sensor()
+        one = Value.set(key=f'{SP_API_PREFIX}.space', elem='space')
+        two = Value.set(key=f'{SP_API_PREFIX}.cam', idx=3, elem='cam')
+        tri = Value.set(key=f'{SP_API_PREFIX}.some', idx=5, elem=sensor)
+        Value.set(key='other.space', elem='other')
+
+        assert SpaceApi.load() == {
+            ('cam', 3): two,
+            ('some', 5): tri,
+            ('space', 0): one,
+        }
+
+    @staticmethod
+    def test_snapshot(queries):
+        api = SpaceApi()
+        Value.set(key=f'{SP_API_PREFIX}.cam', idx=0, elem='cam #0')
+
+        with api.snapshot() as values:
+            assert list(values) == [('cam', 0)]
+
+            queries.clear()
+            assert api.cam_indices == [0]
+            with api.snapshot() as inner:
+                assert inner is values
+            assert queries == []
+
+            Value.set(key=f'{SP_API_PREFIX}.cam', idx=1, elem='cam #1')
+            assert api.cam_indices == [0]
+
+        assert api.cam_indices == [0, 1]
+
+    @staticmethod
+    @mark.parametrize('num', [1, 4, 8])
+    def test_build_query_count(num, queries, gen_sensor, gen_user):
+        _populate(gen_sensor, gen_user(), num)
+        api = SpaceApi()
+
+        queries.clear()
+        res = api.build()
+        assert len(queries) == 1
+
+        assert [elem['value'] for elem in res['sensors']['temperature']] == [
+            float(idx) for idx in range(num)
+        ]
+        assert [elem['name'] for elem in res['contact']['keymasters']] == [
+            f'keymaster #{idx}' for idx in range(num)
+        ]
+        assert [elem['url'] for elem in res['links']] == [
+            f'https://example.org/{idx}' for idx in range(num)
+        ]
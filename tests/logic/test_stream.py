@@ -0,0 +1,62 @@
+from threading import Thread
+from time import monotonic
+
+from pytest import fixture
+
+from observatory.logic.stream import Stream
+from observatory.start.environment import STREAM_LIFETIME, STREAM_POLL
+
+# pylint: disable=redefined-outer-name
+
+
+@fixture(scope='function')
+def stream():
+    yield Stream(poll=0.05, lifetime=1)
+
+
+class TestStream:
+    @staticmethod
+    def test_initial():
+        obj = Stream()
+        assert obj.poll == STREAM_POLL
+        assert obj.lifetime == STREAM_LIFETIME
+        assert obj.serial == 0
+        assert getattr(obj, '_serial', 'error') == 0
+
+    @staticmethod
+    def test_notify(stream):
+        assert stream.notify() == 1
+        assert stream.notify() == 2
+        assert stream.serial == 2
+
+    @staticmethod
+    def test_wait_timeout(stream):
+        start = monotonic()
+        assert stream.wait(stream.serial) == 0
+        assert monotonic() - start >= 0.04
+
+    @staticmethod
+    def test_wait_changed(stream):
+        stream.notify()
+        start = monotonic()
+        assert stream.wait(0, timeout=5) == 1
+        assert monotonic() - start < 1
+
+    @staticmethod
+    def test_wait_notified(stream):
+        result = []
+        waiter = Thread(
+            target=lambda: result.append(stream.wait(0, timeout=5))
+        )
+        waiter.start()
+        stream.notify()
+        waiter.join(timeout=5)
+
+        assert not waiter.is_alive()
+        assert result == [1]
+
+    @staticmethod
+    def test_clear(stream):
+        stream.notify()
+        assert stream.clear() is True
+        assert stream.serial == 0
@@ -1,12 +1,16 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from pytest import mark
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from observatory.models.mapper import EnumConvert, EnumHorizon
 from observatory.models.point import Point
+from observatory.models.rollup import EnumTier, Rollup
 from observatory.models.sensor import Sensor
 from observatory.models.user import User
-from observatory.start.environment import FMT_STRFTIME
+from observatory.start.environment import BACKLOG_DAYS, FMT_STRFTIME
+from observatory.start.extensions import DB
 
 
 @mark.usefixtures('session')
@@ -75,6 +79,32 @@ class TestPoint:
         assert user.points == []
         assert Point.query.all() == []
 
+    @staticmethod
+    def test_flushed_deletes(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        keep = Point.create(sensor=sensor, user=user, value=23)
+        drop = Point.create(sensor=sensor, user=user, value=42)
+        seen = []
+
+        def _capture(session, _):
+            seen.append(list(Point.flushed_deletes(session)))
+
+        event.listen(Session, 'after_flush', _capture)
+        assert drop.delete()
+        event.remove(Session, 'after_flush', _capture)
+
+        assert seen == [
+            [
+                dict(
+                    sensor_prime=sensor.prime,
+                    user_prime=user.prime,
+                    created=drop.created,
+                )
+            ]
+        ]
+        assert Point.flushed_deletes(DB.session) == []
+        assert Point.query.all() == [keep]
+
     @staticmethod
     def test_outdated(gen_points_batch):
         olds, news, _ = gen_points_batch(old=1, new=1)
@@ -90,6 +120,36 @@ class TestPoint:
         assert Point.query_outdated(outdated=True).all() == olds
         assert Point.query_outdated(outdated=False).all() == news
 
+    @staticmethod
+    def test_query_window(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        now = datetime.utcnow()
+        nil, one, two, old = [
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num,
+                created=now - timedelta(days=num),
+            )
+            for num in (0, 1, 2, BACKLOG_DAYS + 1)
+        ]
+        day_one, day_two = now - timedelta(days=1), now - timedelta(days=2)
+
+        assert Point.query_window().all() == [nil, one, two]
+        assert Point.query_window(start=day_one).all() == [nil, one]
+        assert Point.query_window(end=day_one).all() == [one, two]
+        assert Point.query_window(start=day_two, end=day_one).all() == [
+            one,
+            two,
+        ]
+        assert Point.query_window(start=now, end=day_one).all() == []
+        assert Point.query_window(start=datetime(1970, 1, 1)).all() == [
+            nil,
+            one,
+            two,
+            old,
+        ]
+
     @staticmethod
     @mark.parametrize(
         ('config', 'nnp'),
@@ -356,3 +416,121 @@ class TestPoint:
 
         for point, expect in zip((neg, nil, pos), nnp):
             assert point.translate(**config) == expect
+
+    @staticmethod
+    def test_bulk_create(gen_sensor, gen_user):
+        sensor = gen_sensor()
+        user = gen_user()
+        start = datetime.utcnow()
+
+        assert Point.bulk_create([]) == 0
+        assert Point.query.all() == []
+
+        assert (
+            Point.bulk_create(
+                [
+                    dict(
+                        sensor_prime=sensor.prime,
+                        user_prime=user.prime,
+                        value=float(value),
+                        created=start,
+                    )
+                    for value in range(5)
+                ]
+            )
+            == 5
+        )
+        assert [point.value for point in Point.query.all()] == [
+            0.0,
+            1.0,
+            2.0,
+            3.0,
+            4.0,
+        ]
+        assert all(point.sensor == sensor for point in Point.query.all())
+        assert all(point.user == user for point in Point.query.all())
+        assert all(point.created == start for point in Point.query.all())
+
+    @staticmethod
+    def test_time_series_indices():
+        indices = {
+            idx.name: [col.name for col in idx.columns]
+            for idx in Point.__table__.indexes
+        }
+        assert indices['ix_point_sensor_prime_created'] == [
+            'sensor_prime',
+            'created',
+        ]
+        assert indices['ix_point_user_prime_created'] == [
+            'user_prime',
+            'created',
+        ]
+
+    @staticmethod
+    def test_aggregate(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        assert Point.aggregate(span=60) == []
+
+        start = datetime(2021, 1, 1, 10)
+        for num, value in enumerate((3.0, -1.0, 7.0, 2.0, 5.0, 4.0)):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start + timedelta(minutes=25 * num),
+                _commit=False,
+            )
+        DB.session.commit()
+
+        result = Point.aggregate(span=60 * 60)
+        assert result == [
+            dict(
+                bucket=1609495200,
+                length=3,
+                total=9.0,
+                minimum=-1.0,
+                maximum=7.0,
+                last_value=7.0,
+                last_created=start + timedelta(minutes=50),
+            ),
+            dict(
+                bucket=1609498800,
+                length=2,
+                total=7.0,
+                minimum=2.0,
+                maximum=5.0,
+                last_value=5.0,
+                last_created=start + timedelta(minutes=100),
+            ),
+            dict(
+                bucket=1609502400,
+                length=1,
+                total=4.0,
+                minimum=4.0,
+                maximum=4.0,
+                last_value=4.0,
+                last_created=start + timedelta(minutes=125),
+            ),
+        ]
+        for span, tier in (
+            (60 * 60, EnumTier.MINUTE),
+            (60 * 60, EnumTier.HOUR),
+            (2 * 60 * 60, EnumTier.HOUR),
+        ):
+            assert Point.aggregate(span=span, size=1) == Rollup.aggregate(
+                span=span,
+                tier=tier,
+                sensor=sensor,
+                start=start,
+                end=start + timedelta(hours=4),
+            )
+
+        assert (
+            Point.aggregate(
+                span=60 * 60,
+                query=Point.query.filter(
+                    Point.created >= start + timedelta(hours=1)
+                ),
+            )
+            == result[1:]
+        )
@@ -0,0 +1,95 @@
+from itertools import product
+
+from pytest import fixture, importorskip, mark, raises
+
+from observatory.models import point as point_module
+from observatory.models.mapper import EnumConvert, EnumHorizon
+from observatory.models.point import Point
+
+VALUES = [
+    0.0,
+    -0.0,
+    0.5,
+    -0.5,
+    1.5,
+    2.5,
+    -2.5,
+    0.49999999999999994,
+    13.37,
+    -23.5,
+    1e15 + 0.5,
+    -7e-300,
+    float('nan'),
+    float('inf'),
+]
+
+# pylint: disable=redefined-outer-name
+
+
+@fixture(scope='function', params=['array', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        importorskip('numpy')
+    else:
+        monkeypatch.setattr(point_module, 'numpy', None)
+    yield request.param
+
+
+def _same(left, right):
+    assert len(left) == len(right)
+    for one, two in zip(left, right):
+        assert type(one) is type(two)
+        assert repr(one) == repr(two)
+
+
+@mark.usefixtures('backend')
+class TestPointTranslate:
+    @staticmethod
+    @mark.parametrize(
+        ('horizon', 'convert', 'elevate', 'numeric'),
+        product(EnumHorizon, EnumConvert, (1.0, 0.5, -3.0), (False, True)),
+    )
+    def test_translate_values(horizon, convert, elevate, numeric):
+        params = dict(
+            horizon=horizon, convert=convert, elevate=elevate, numeric=numeric
+        )
+        values = VALUES
+        if convert != EnumConvert.NATURAL:
+            values = [val for val in VALUES if val == val and abs(val) < 1e300]
+
+        _same(
+            Point.translate_values(values, **params),
+            [Point.translate_value(val, **params) for val in values],
+        )
+
+    @staticmethod
+    def test_translate_values_empty():
+        for convert in EnumConvert:
+            assert (
+                Point.translate_values(
+                    [], horizon=EnumHorizon.NORMAL, convert=convert
+                )
+                == []
+            )
+
+    @staticmethod
+    @mark.parametrize('convert', [EnumConvert.INTEGER, EnumConvert.BOOLEAN])
+    def test_translate_values_errors(convert):
+        params = dict(horizon=EnumHorizon.NORMAL, convert=convert)
+        for value, error in (
+            (float('inf'), OverflowError),
+            (float('nan'), ValueError),
+        ):
+            with raises(error):
+                Point.translate_value(value, **params)
+            with raises(error):
+                Point.translate_values([1.0, value], **params)
+
+    @staticmethod
+    def test_translate_values_huge():
+        params = dict(horizon=EnumHorizon.INVERT, convert=EnumConvert.INTEGER)
+        values = [1e300, 2.0 ** 70, 3.0]
+        _same(
+            Point.translate_values(values, **params),
+            [Point.translate_value(val, **params) for val in values],
+        )
@@ -0,0 +1,343 @@
+from datetime import datetime, timedelta
+
+from pytest import mark
+
+from observatory.models.point import Point
+from observatory.models.rollup import EnumTier, Rollup
+from observatory.models.sensor import Sensor
+from observatory.start.environment import BACKLOG_DAYS, FMT_STRFTIME
+from observatory.start.extensions import DB
+
+# pylint: disable=too-many-arguments
+
+
+def _check(rollup, *, length, total, minimum, maximum, last):
+    assert rollup.length == length
+    assert rollup.total == total
+    assert rollup.average == total / length
+    assert rollup.minimum == minimum
+    assert rollup.maximum == maximum
+    assert rollup.last_value == last
+
+
+@mark.usefixtures('session')
+class TestRollup:
+    @staticmethod
+    def test_empty(gen_sensor):
+        sensor = gen_sensor()
+        assert sensor.rollups == []
+        assert Rollup.query.all() == []
+
+    @staticmethod
+    def test_average():
+        assert Rollup(length=0, total=0.0).average is None
+        assert Rollup(length=4, total=10.0).average == 2.5
+
+    @staticmethod
+    def test_bucket_fields():
+        rollup = Rollup(bucket=datetime(2021, 1, 23, 13))
+        assert rollup.bucket_fmt == rollup.bucket.strftime(FMT_STRFTIME)
+        assert rollup.bucket_epoch_ms == 1611406800000
+
+    @staticmethod
+    def test_fold():
+        start = datetime(2021, 1, 23, 13, 37)
+        rows = [
+            dict(sensor_prime=1, value=3.0, created=start),
+            dict(sensor_prime=1, value=1.0, created=start + timedelta(0, 5)),
+            dict(sensor_prime=1, value=2.0, created=start - timedelta(0, 5)),
+            dict(sensor_prime=2, value=7.0, created=start),
+        ]
+
+        result = Rollup.fold(rows, tiers=(EnumTier.MINUTE, EnumTier.HOUR))
+        assert sorted(
+            (key[0], key[1].name, key[2]) for key in result
+        ) == sorted(
+            [
+                (1, 'MINUTE', start),
+                (1, 'MINUTE', start - timedelta(minutes=1)),
+                (1, 'HOUR', datetime(2021, 1, 23, 13)),
+                (2, 'MINUTE', start),
+                (2, 'HOUR', datetime(2021, 1, 23, 13)),
+            ]
+        )
+
+        hour = result[(1, EnumTier.HOUR, datetime(2021, 1, 23, 13))]
+        assert hour['length'] == 3
+        assert hour['total'] == 6.0
+        assert hour['minimum'] == 1.0
+        assert hour['maximum'] == 3.0
+        assert hour['last_value'] == 1.0
+        assert hour['last_created'] == start + timedelta(0, 5)
+
+    @staticmethod
+    def test_create(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime(2021, 1, 23, 13, 37)
+
+        for value, secs in ((4, 0), (2, 10), (8, -10), (6, 20)):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start + timedelta(seconds=secs),
+            )
+
+        assert len(sensor.rollups) == 4
+        minutes = Rollup.query_tier(tier=EnumTier.MINUTE, sensor=sensor).all()
+        assert [elem.bucket for elem in minutes] == [
+            start - timedelta(minutes=1),
+            start,
+        ]
+        _check(minutes[0], length=1, total=8, minimum=8, maximum=8, last=8)
+        _check(minutes[1], length=3, total=12, minimum=2, maximum=6, last=6)
+
+        for tier in (EnumTier.HOUR, EnumTier.DAY):
+            (rollup,) = Rollup.query_tier(tier=tier, sensor=sensor).all()
+            assert rollup.bucket == tier.bucket(start)
+            _check(rollup, length=4, total=20, minimum=2, maximum=8, last=6)
+
+    @staticmethod
+    def test_bulk_append(gen_sensor, gen_user):
+        one, two = gen_sensor('one'), gen_sensor('two')
+        user = gen_user()
+        start = datetime(2021, 1, 23, 13, 37)
+
+        Point.create(sensor=one, user=user, value=5, created=start)
+        Sensor.bulk_append(
+            user=user,
+            entries=[
+                (one, 1.0, start + timedelta(seconds=1)),
+                (one, 9.0, start - timedelta(seconds=1)),
+                (two, 3.0, start),
+            ],
+        )
+
+        (hour,) = Rollup.query_tier(tier=EnumTier.HOUR, sensor=one).all()
+        _check(hour, length=3, total=15, minimum=1, maximum=9, last=1)
+        (hour,) = Rollup.query_tier(tier=EnumTier.HOUR, sensor=two).all()
+        _check(hour, length=1, total=3, minimum=3, maximum=3, last=3)
+
+    @staticmethod
+    def test_delete(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime(2021, 1, 23, 13, 37)
+
+        points = [
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start + timedelta(minutes=value),
+            )
+            for value in range(3)
+        ]
+
+        assert points[-1].delete()
+        (day,) = Rollup.query_tier(tier=EnumTier.DAY, sensor=sensor).all()
+        _check(day, length=2, total=1, minimum=0, maximum=1, last=1)
+        assert (
+            Rollup.query_tier(tier=EnumTier.MINUTE, sensor=sensor).count() == 2
+        )
+
+        assert all(point.delete() for point in points[:-1])
+        assert Rollup.query.all() == []
+
+    @staticmethod
+    def test_spans():
+        start = datetime(2021, 1, 23, 13, 37)
+        rows = [
+            dict(sensor_prime=1, created=start + timedelta(seconds=5)),
+            dict(sensor_prime=1, created=start + timedelta(minutes=1)),
+            dict(sensor_prime=1, created=start + timedelta(minutes=3)),
+            dict(sensor_prime=2, created=start),
+        ]
+
+        assert list(Rollup.spans(rows, tier=EnumTier.MINUTE)) == [
+            (1, start, start + timedelta(minutes=2)),
+            (1, start + timedelta(minutes=3), start + timedelta(minutes=4)),
+            (2, start, start + timedelta(minutes=1)),
+        ]
+        assert list(Rollup.spans(rows, tier=EnumTier.HOUR)) == [
+            (1, datetime(2021, 1, 23, 13), datetime(2021, 1, 23, 14)),
+            (2, datetime(2021, 1, 23, 13), datetime(2021, 1, 23, 14)),
+        ]
+        assert list(Rollup.spans([], tier=EnumTier.DAY)) == []
+
+    @staticmethod
+    def test_delete_batch(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime(2021, 1, 23, 13, 37)
+
+        points = [
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start + timedelta(minutes=7 * value),
+            )
+            for value in range(12)
+        ]
+        for point in points[1::3]:
+            point.delete(_commit=False)
+        DB.session.commit()
+
+        day = Rollup.query_tier(tier=EnumTier.DAY, sensor=sensor).one()
+        _check(day, length=8, total=44, minimum=0, maximum=11, last=11)
+        hours = Rollup.query_tier(tier=EnumTier.HOUR, sensor=sensor).all()
+        assert [hour.length for hour in hours] == [3, 5]
+        assert (
+            Rollup.query_tier(tier=EnumTier.MINUTE, sensor=sensor).count() == 8
+        )
+
+    @staticmethod
+    def test_delete_sensor(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        for value in range(3):
+            sensor.append(user=user, value=value)
+        assert Rollup.query.count() == 3
+
+        assert sensor.delete()
+        assert Rollup.query.all() == []
+
+    @staticmethod
+    def test_sweep(gen_sensor, gen_points_batch):
+        sensor = gen_sensor()
+        olds, _, _ = gen_points_batch(sensor=sensor, old=3, new=2)
+        tiers = [elem.tier for elem in sensor.rollups]
+        before = {tier: tiers.count(tier) for tier in EnumTier}
+
+        assert sensor.sweep() == len(olds)
+        tiers = [elem.tier for elem in sensor.rollups]
+        assert tiers.count(EnumTier.MINUTE) == 2
+        assert tiers.count(EnumTier.HOUR) == before[EnumTier.HOUR]
+        assert tiers.count(EnumTier.DAY) == before[EnumTier.DAY]
+
+    @staticmethod
+    def test_backfill(gen_sensor, gen_user):
+        one, two = gen_sensor('one'), gen_sensor('two')
+        user = gen_user()
+        start = datetime.utcnow() - timedelta(days=BACKLOG_DAYS)
+        for sensor, num in ((one, 5), (two, 3)):
+            for value in range(num):
+                sensor.append(user=user, value=value)
+                Point.create(
+                    sensor=sensor,
+                    user=user,
+                    value=value,
+                    created=start + timedelta(hours=value),
+                )
+
+        def _dump():
+            return sorted(
+                (
+                    elem.sensor_prime,
+                    elem.tier.name,
+                    elem.bucket,
+                    elem.length,
+                    elem.total,
+                    elem.minimum,
+                    elem.maximum,
+                    elem.last_value,
+                    elem.last_created,
+                )
+                for elem in Rollup.query.all()
+            )
+
+        expect = _dump()
+        Rollup.query.delete()
+        DB.session.commit()
+        assert Rollup.query.all() == []
+
+        number = Rollup.backfill(DB.session.connection(), size=2)
+        DB.session.commit()
+        assert number == len(expect)
+        assert _dump() == expect
+
+        number = Rollup.backfill(
+            DB.session.connection(), sensor_primes=[two.prime]
+        )
+        DB.session.commit()
+        assert number == len([elem for elem in expect if elem[0] == two.prime])
+        assert _dump() == expect
+
+    @staticmethod
+    def test_covers(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime(2021, 1, 1, 10)
+        assert not Rollup.covers(
+            tier=EnumTier.HOUR, sensor=sensor, start=start
+        )
+
+        for num in range(3):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num,
+                created=start + timedelta(hours=num, minutes=5),
+            )
+        for tier in EnumTier:
+            assert Rollup.covers(tier=tier, sensor=sensor, start=start)
+            assert Rollup.covers(
+                tier=tier, sensor=sensor, start=start - timedelta(days=2)
+            )
+
+        Rollup.query.filter(
+            Rollup.bucket < start + timedelta(hours=2)
+        ).delete()
+        DB.session.commit()
+        for tier in (EnumTier.MINUTE, EnumTier.HOUR):
+            assert not Rollup.covers(tier=tier, sensor=sensor, start=start)
+            assert Rollup.covers(
+                tier=tier, sensor=sensor, start=start + timedelta(hours=3)
+            )
+
+    @staticmethod
+    def test_aggregate(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime(2021, 1, 1, 10)
+        for num, value in enumerate((3.0, -1.0, 7.0, 2.0, 5.0)):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=value,
+                created=start + timedelta(minutes=25 * num),
+                _commit=False,
+            )
+        DB.session.commit()
+
+        params = dict(
+            sensor=sensor, start=start, end=start + timedelta(hours=3)
+        )
+        assert Rollup.aggregate(
+            span=2 * 60 * 60, tier=EnumTier.HOUR, **params
+        ) == [
+            dict(
+                bucket=1609495200,
+                length=5,
+                total=16.0,
+                minimum=-1.0,
+                maximum=7.0,
+                last_value=5.0,
+                last_created=start + timedelta(minutes=100),
+            )
+        ]
+        assert [
+            (agg['bucket'], agg['length'], agg['last_value'])
+            for agg in Rollup.aggregate(
+                span=60 * 60, tier=EnumTier.MINUTE, **params
+            )
+        ] == [
+            (1609495200, 3, 7.0),
+            (1609498800, 2, 5.0),
+        ]
+        assert (
+            Rollup.aggregate(
+                span=60 * 60,
+                tier=EnumTier.HOUR,
+                sensor=sensor,
+                start=start + timedelta(hours=1),
+                end=start + timedelta(hours=2),
+            )[0]['length']
+            == 2
+        )
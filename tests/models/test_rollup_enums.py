@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+from observatory.models.rollup import EnumTier
+
+
+class TestRollupEnumTier:
+    @staticmethod
+    def test_names():
+        assert [elem.name for elem in EnumTier] == ['MINUTE', 'HOUR', 'DAY']
+
+    @staticmethod
+    def test_span():
+        assert EnumTier.MINUTE.span == timedelta(minutes=1)
+        assert EnumTier.HOUR.span == timedelta(hours=1)
+        assert EnumTier.DAY.span == timedelta(days=1)
+
+    @staticmethod
+    def test_bucket():
+        stamp = datetime(2021, 1, 23, 13, 37, 42, 123456)
+        assert EnumTier.MINUTE.bucket(stamp) == datetime(2021, 1, 23, 13, 37)
+        assert EnumTier.HOUR.bucket(stamp) == datetime(2021, 1, 23, 13)
+        assert EnumTier.DAY.bucket(stamp) == datetime(2021, 1, 23)
+
+        for tier in EnumTier:
+            assert tier.bucket(tier.bucket(stamp)) == tier.bucket(stamp)
+            assert tier.bucket(stamp) <= stamp < tier.bucket(stamp) + tier.span
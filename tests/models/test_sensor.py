@@ -1,6 +1,10 @@
+from datetime import datetime, timedelta
+
 from pytest import mark
 
+from observatory.models.mapper import EnumConvert, EnumHorizon, Mapper
 from observatory.models.point import Point
+from observatory.models.rollup import Rollup
 from observatory.models.sensor import Sensor
 from observatory.models.value import Value
 
@@ -75,6 +79,32 @@ class TestSensor:
         assert Sensor.query.all() == []
         assert Point.query.all() == []
 
+    @staticmethod
+    def test_delete_query_count(queries, gen_sensor, gen_user):
+        keep, drop, user = gen_sensor('keep'), gen_sensor('drop'), gen_user()
+        start = datetime.utcnow() - timedelta(days=1)
+        keep.append(user=user, value=23)
+        drop.extend(
+            user=user,
+            points=[
+                (num, start + timedelta(seconds=30 * num))
+                for num in range(2000)
+            ],
+        )
+        assert user.length == 2001
+
+        queries.clear()
+        assert drop.delete()
+        assert len(queries) < 40
+
+        assert Sensor.query.all() == [keep]
+        assert user.length == 1
+        assert keep.length == 1
+        assert keep.latest_value == 23
+        assert (
+            Rollup.query.filter(Rollup.sensor_prime == drop.prime).all() == []
+        )
+
     @staticmethod
     def test_delete_cascade_orphan_value(gen_sensor):
         sensor = gen_sensor()
@@ -152,6 +182,21 @@ class TestSensor:
         assert all(point.delete() for point in points)
         assert sensor.length == 0
 
+    @staticmethod
+    def test_length_counter(gen_sensor, gen_user):
+        sensor = gen_sensor()
+        user = gen_user()
+
+        sensor.append(user=user, value=1)
+        sensor.extend(user=user, points=[(2, None), (3, None)])
+        Sensor.bulk_append(user=user, entries=[(sensor, 4, None)])
+        assert sensor.point_count == 4
+        assert sensor.length == sensor.query_points.count()
+
+        sensor.latest.delete()
+        assert sensor.point_count == 3
+        assert sensor.length == sensor.query_points.count()
+
     @staticmethod
     def test_latest_empty(gen_sensor):
         sensor = gen_sensor()
@@ -169,13 +214,156 @@ class TestSensor:
         assert sensor.query_points.all() == _pointsort(complete)
         assert sensor.latest == _pointsort(complete)[0]
 
+    @staticmethod
+    def test_latest_fields_empty(gen_sensor):
+        sensor = gen_sensor()
+
+        assert sensor.latest_value is None
+        assert sensor.latest_created is None
+        assert sensor.latest_user is None
+        assert sensor.latest_created_fmt == ''
+        assert sensor.latest_created_epoch_ms is None
+
+    @staticmethod
+    def test_latest_fields_create(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        now = datetime.utcnow()
+
+        new = Point.create(sensor=sensor, user=user, value=23, created=now)
+        assert sensor.latest_value == new.value
+        assert sensor.latest_created == new.created
+        assert sensor.latest_user == user
+        assert sensor.latest_created_fmt == new.created_fmt
+        assert sensor.latest_created_epoch_ms == new.created_epoch_ms
+
+        Point.create(
+            sensor=sensor,
+            user=gen_user('other'),
+            value=42,
+            created=now - timedelta(hours=1),
+        )
+        assert sensor.latest_value == new.value
+        assert sensor.latest_created == new.created
+        assert sensor.latest_user == user
+
+    @staticmethod
+    def test_latest_fields_append(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+
+        for value in range(3):
+            point = sensor.append(user=user, value=value)
+            assert sensor.latest == point
+            assert sensor.latest_value == point.value
+            assert sensor.latest_created == point.created
+
+    @staticmethod
+    def test_latest_fields_bulk_append(gen_sensor, gen_user):
+        one, two = gen_sensor('one'), gen_sensor('two')
+        user = gen_user()
+        now = datetime.utcnow()
+
+        Sensor.bulk_append(
+            user=user,
+            entries=[
+                (one, 1.0, now - timedelta(hours=1)),
+                (one, 2.0, now),
+                (one, 3.0, now - timedelta(hours=2)),
+                (two, 4.0, now - timedelta(hours=3)),
+            ],
+        )
+        assert one.latest_value == 2.0
+        assert one.latest_created == now
+        assert two.latest_value == 4.0
+        assert two.latest_created == now - timedelta(hours=3)
+
+        Sensor.bulk_append(
+            user=user, entries=[(one, 5.0, now - timedelta(hours=4))]
+        )
+        assert one.latest_value == 2.0
+        assert one.latest_created == now
+
+    @staticmethod
+    def test_latest_fields_delete(gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        now = datetime.utcnow()
+
+        old = Point.create(
+            sensor=sensor, user=user, value=1, created=now - timedelta(hours=1)
+        )
+        new = Point.create(sensor=sensor, user=user, value=2, created=now)
+        assert sensor.latest_value == new.value
+
+        assert old.delete()
+        assert sensor.latest_value == new.value
+        assert sensor.latest_created == new.created
+
+        Point.create(
+            sensor=sensor, user=user, value=3, created=now - timedelta(hours=1)
+        )
+        assert new.delete()
+        assert sensor.latest_value == 3
+        assert sensor.latest_created == now - timedelta(hours=1)
+
+        assert sensor.latest.delete()
+        assert sensor.latest_value is None
+        assert sensor.latest_created is None
+        assert sensor.latest_user is None
+
+    @staticmethod
+    def test_latest_fields_sweep(gen_sensor, gen_user, gen_points_batch):
+        sensor, user = gen_sensor(), gen_user()
+        gen_points_batch(sensor=sensor, user=user, old=3, new=0)
+        assert sensor.latest_value is not None
+
+        assert sensor.sweep() == 3
+        assert sensor.latest_value is None
+        assert sensor.latest_created is None
+        assert sensor.latest_user is None
+
+        _, news, _ = gen_points_batch(sensor=sensor, user=user, old=3, new=2)
+        latest = _pointsort(news)[0]
+        assert sensor.sweep() == 3
+        assert sensor.latest_value == latest.value
+        assert sensor.latest_created == latest.created
+
+    @staticmethod
+    def test_sweep_counter(gen_sensor, gen_user, gen_points_batch):
+        sensor = gen_sensor()
+        one, two = gen_user('one'), gen_user('two')
+        gen_points_batch(sensor=sensor, user=one, old=3, new=1)
+        gen_points_batch(sensor=sensor, user=two, old=2, new=2)
+        assert sensor.length == 8
+        assert (one.length, two.length) == (4, 4)
+
+        assert sensor.sweep(chunk=2) == 5
+        assert sensor.length == 3
+        assert (one.length, two.length) == (1, 2)
+
+    @staticmethod
+    def test_latest_translate_map(gen_sensor, gen_prompt, gen_user):
+        sensor = gen_sensor()
+        mapper = Mapper.create(
+            prompt=gen_prompt(),
+            sensor=sensor,
+            convert=EnumConvert.INTEGER,
+            horizon=EnumHorizon.INVERT,
+            elevate=2.0,
+        )
+        assert sensor.latest_translate_map(mapper) is None
+
+        point = sensor.append(user=gen_user(), value=21.2)
+        assert sensor.latest_translate_map(mapper) == -42
+        assert sensor.latest_translate_map(mapper) == point.translate_map(
+            mapper
+        )
+
     @staticmethod
     def test_cleanup(gen_sensor, gen_points_batch):
         sensor = gen_sensor()
         _, _, complete = gen_points_batch(sensor=sensor, old=5, new=0)
 
         assert sensor.points == _pointsort(complete)
-        assert sensor.cleanup()
+        assert sensor.cleanup() == 5
 
         assert sensor.points == []
 
@@ -189,7 +377,7 @@ class TestSensor:
 
         assert one.points == _pointsort(old_one)
         assert two.points == _pointsort(old_two)
-        assert one.cleanup()
+        assert one.cleanup() == 10
 
         assert one.points == []
         assert two.points == []
@@ -214,13 +402,50 @@ class TestSensor:
         assert one.points == one_batch
         assert two.points == two_batch
 
-        assert one.cleanup()
+        assert one.cleanup() == 8
 
         assert one.points == [stick]
         assert two.points == [flick]
 
         assert Point.query.all() == [stick, flick]
 
+    @staticmethod
+    @mark.parametrize('chunk', [1, 2, 3, 1000])
+    def test_sweep_chunked(chunk, gen_sensor, gen_user, gen_points_batch):
+        one = gen_sensor('one')
+        two = gen_sensor('two')
+        user = gen_user()
+        _, one_news, _ = gen_points_batch(sensor=one, user=user, old=7, new=2)
+        _, _, two_all = gen_points_batch(sensor=two, user=user, old=3, new=1)
+
+        assert one.sweep(chunk=chunk) == 7
+        assert one.points == _pointsort(one_news)
+        assert two.points == _pointsort(two_all)
+
+        assert one.sweep(chunk=chunk) == 0
+        assert one.points == _pointsort(one_news)
+
+    @staticmethod
+    @mark.parametrize('chunk', [1, 2, 1000])
+    def test_sweep_chunked_sticky(chunk, gen_sensor, gen_points_batch):
+        sensor = gen_sensor(sticky=True)
+        olds, _, _ = gen_points_batch(sensor=sensor, old=6, new=0)
+        stick, *_ = _pointsort(olds)
+
+        assert sensor.sweep(chunk=chunk) == 5
+        assert sensor.points == [stick]
+
+        assert sensor.sweep(chunk=chunk) == 0
+        assert sensor.points == [stick]
+
+    @staticmethod
+    def test_sweep_no_commit(gen_sensor, gen_points_batch):
+        sensor = gen_sensor()
+        _, news, _ = gen_points_batch(sensor=sensor, old=4, new=1)
+
+        assert sensor.sweep(chunk=3, _commit=False) == 4
+        assert sensor.points == news
+
     @staticmethod
     def test_append(gen_sensor, gen_user):
         sensor = gen_sensor()
@@ -231,7 +456,52 @@ class TestSensor:
         assert Point.query.first() == point
 
     @staticmethod
-    def test_append_cleanup(gen_sensor, gen_user, gen_points_batch):
+    def test_extend(gen_sensor, gen_user):
+        sensor = gen_sensor()
+        user = gen_user()
+        stamp = datetime.utcnow() - timedelta(hours=1)
+        assert Point.query.count() == 0
+
+        assert (
+            sensor.extend(
+                user=user, points=[(23.0, None), (42.0, stamp), (5.0, None)]
+            )
+            == 3
+        )
+        points = Point.query.order_by(Point.prime.asc()).all()
+        assert [point.value for point in points] == [23.0, 42.0, 5.0]
+        assert points[1].created == stamp
+        assert all(point.sensor == sensor for point in points)
+        assert all(point.user == user for point in points)
+
+    @staticmethod
+    def test_bulk_append(gen_sensor, gen_user):
+        one, two = gen_sensor('one'), gen_sensor('two')
+        user = gen_user()
+        stamp = datetime.utcnow() - timedelta(hours=1)
+        assert Point.query.count() == 0
+
+        assert (
+            Sensor.bulk_append(
+                user=user,
+                entries=[
+                    (one, 23.0, None),
+                    (two, 42.0, stamp),
+                    (one, 5.0, None),
+                ],
+            )
+            == 3
+        )
+        assert sorted(point.value for point in one.query_points.all()) == [
+            5.0,
+            23.0,
+        ]
+        assert [point.value for point in two.query_points.all()] == [42.0]
+        assert two.latest.created == stamp
+        assert all(point.user == user for point in Point.query.all())
+
+    @staticmethod
+    def test_append_no_cleanup(gen_sensor, gen_user, gen_points_batch):
         sensor = gen_sensor()
         user = gen_user()
         _, _, complete = gen_points_batch(
@@ -243,4 +513,4 @@ class TestSensor:
 
         assert point.sensor == sensor
         assert point.user == user
-        assert sensor.points == [point]
+        assert sensor.points == _pointsort([point, *complete])
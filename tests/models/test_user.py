@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from pytest import mark, raises
 from sqlalchemy.exc import IntegrityError
 
 from observatory.models.point import Point
+from observatory.models.sensor import Sensor
 from observatory.models.user import User
 from observatory.start.environment import FMT_STRFTIME
 
@@ -198,6 +199,31 @@ class TestUser:
         assert User.query.all() == []
         assert Point.query.all() == []
 
+    @staticmethod
+    def test_delete_query_count(queries, gen_sensor, gen_user):
+        sensor, keep, drop = gen_sensor(), gen_user('keep'), gen_user('drop')
+        start = datetime.utcnow() - timedelta(days=1)
+        sensor.extend(user=keep, points=[(23, start - timedelta(hours=1))])
+        sensor.extend(
+            user=drop,
+            points=[
+                (num, start + timedelta(seconds=30 * num))
+                for num in range(2000)
+            ],
+        )
+        assert sensor.length == 2001
+
+        queries.clear()
+        assert drop.delete()
+        assert len(queries) < 40
+
+        assert User.query.all() == [keep]
+        assert keep.length == 1
+        assert sensor.length == 1
+        assert sensor.latest_value == 23
+        assert sensor.latest_user == keep
+        assert [rollup.length for rollup in sensor.rollups] == [1, 1, 1]
+
     @staticmethod
     def test_delete_cascade_keep_others(gen_sensor, gen_user):
         sensor = gen_sensor()
@@ -236,6 +262,21 @@ class TestUser:
         assert all(point.delete() for point in points)
         assert user.length == 0
 
+    @staticmethod
+    def test_length_counter(gen_sensor, gen_user):
+        sensor = gen_sensor()
+        user = gen_user()
+
+        sensor.append(user=user, value=1)
+        sensor.extend(user=user, points=[(2, None), (3, None)])
+        Sensor.bulk_append(user=user, entries=[(sensor, 4, None)])
+        assert user.point_count == 4
+        assert user.length == user.query_points.count()
+
+        user.latest.delete()
+        assert user.point_count == 3
+        assert user.length == user.query_points.count()
+
     @staticmethod
     def test_latest_empty(gen_user):
         user = gen_user()
@@ -1,6 +1,10 @@
-from pytest import fixture, mark
+from types import SimpleNamespace
+
+from pytest import fixture, mark, raises
+from sqlalchemy.exc import IntegrityError
 
 from observatory.models.value import EnumBox, Value
+from observatory.start.extensions import DB
 
 # pylint: disable=redefined-outer-name
 
@@ -78,6 +82,20 @@ class TestValue:
         assert Value.by_key(key='some') == []
         assert Value.by_key(key=key) == list(reversed(res))
 
+    @staticmethod
+    def test_by_prefix(gen_sensor):
+        sensor = gen_sensor()
+        two = Value.set(key='pre_fix.two', idx=1, elem=sensor)
+        one = Value.set(key='pre_fix.one', idx=5, elem='one')
+        nil = Value.set(key='pre_fix.one', idx=2, elem='nil')
+        Value.set(key='pre_fix', elem='base')
+        Value.set(key='prexfix.one', elem='wildcard')
+        Value.set(key='other.one', elem='other')
+
+        assert Value.by_prefix(prefix='some') == []
+        assert Value.by_prefix(prefix='pre_fix') == [nil, one, two]
+        assert Value.by_prefix(prefix='pre_fix')[-1].elem == sensor
+
     @staticmethod
     def test_elem_property(bucket):
         value = Value.create(
@@ -150,6 +168,90 @@ class TestValue:
         assert past.elem == past_elem
         assert done.elem == done_elem
 
+    @staticmethod
+    def test_unique_key_idx():
+        Value.create(key='value', idx=23)
+        Value.create(key='value', idx=42)
+        Value.create(key='other', idx=23)
+
+        with raises(IntegrityError):
+            Value.create(key='value', idx=23)
+        DB.session.rollback()
+
+    @staticmethod
+    def test_columns(bucket):
+        for box, elem in bucket.obj.items():
+            assert Value.columns(elem) == {
+                'box': box,
+                **{bx.value: None for bx in EnumBox},
+                box.value: bucket.key[box],
+            }
+
+        assert Value.columns(None) == {
+            'box': EnumBox.STRING,
+            **{bx.value: None for bx in EnumBox},
+        }
+
+    @staticmethod
+    def test_set_method_boxes(bucket):
+        value = Value.create(key='value', idx=23)
+
+        for box, elem in bucket.obj.items():
+            assert Value.set(key='value', idx=23, elem=elem) is value
+            assert value.box == box
+            assert value.elem == elem
+
+        assert Value.query.all() == [value]
+
+    @staticmethod
+    def test_set_method_pending_sensor(gen_sensor):
+        sensor = gen_sensor(_commit=False)
+        assert sensor.prime is None
+
+        value = Value.set(key='value', elem=sensor)
+        assert sensor.prime is not None
+        assert value.box == EnumBox.SENSOR
+        assert value.elem == sensor
+
+    @staticmethod
+    def test_set_method_concurrent_insert(monkeypatch):
+        execute = DB.session.execute
+        raced = []
+
+        def _execute(statement, *args, **kwargs):
+            if not raced:
+                raced.append(statement)
+                execute(
+                    Value.__table__.insert().values(
+                        key='race', idx=0, **Value.columns('first')
+                    )
+                )
+                return SimpleNamespace(rowcount=0)
+            return execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(DB.session, 'execute', _execute)
+        value = Value.set(key='race', elem='second')
+        monkeypatch.undo()
+
+        assert value.elem == 'second'
+        assert Value.query.filter(Value.key == 'race').all() == [value]
+
+    @staticmethod
+    def test_set_method_no_commit():
+        past = Value.set(key='past', elem='past')
+        done = Value.set(key='past', elem='done', _commit=False)
+        assert done is past
+        assert done.elem == 'done'
+        assert DB.session.is_modified(done) is False
+
+    @staticmethod
+    def test_set_method_queries(queries):
+        Value.set(key='value', idx=23, elem='one')
+
+        queries.clear()
+        Value.set(key='value', idx=23, elem='two', _commit=False)
+        assert [query.split()[0] for query in queries] == ['UPDATE', 'SELECT']
+
     @staticmethod
     def test_latest(gen_sensor, gen_user):
         value = Value.create(key='value', idx=42)
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+
+from flask import url_for
+from pytest import mark
+
+from observatory.models.mapper import EnumConvert, EnumHorizon, Mapper
+from observatory.models.point import Point
+from observatory.rest import charts
+from observatory.start.extensions import DB
+
+ENDPOINT = 'api.charts.board'
+
+
+@mark.usefixtures('session')
+class TestChartsBoard:
+    @staticmethod
+    @mark.usefixtures('ctx_app')
+    def test_url():
+        assert url_for(ENDPOINT) == '/api/charts'
+        assert (
+            url_for(ENDPOINT, slug=['one', 'two'])
+            == '/api/charts?slug=one&slug=two'
+        )
+
+    @staticmethod
+    def test_get_empty(visitor):
+        res = visitor(ENDPOINT)
+        assert res.json == []
+
+    @staticmethod
+    def test_get_missing(visitor, gen_prompt):
+        gen_prompt('one')
+        res = visitor(
+            ENDPOINT,
+            query_string={'slug': ['one', 'two', 'three']},
+            code=404,
+        )
+        assert res.json['message'] == 'Prompt three, two not present'
+
+    @staticmethod
+    def test_get_board(visitor, gen_prompt, gen_sensor, gen_user):
+        user = gen_user()
+        p_one, p_two, p_off = (
+            gen_prompt('one'),
+            gen_prompt('two'),
+            gen_prompt(),
+        )
+        sensor = gen_sensor()
+        Mapper.create(prompt=p_one, sensor=sensor)
+        Mapper.create(prompt=p_two, sensor=sensor)
+        Mapper.create(prompt=p_off, sensor=sensor, active=False)
+        sensor.append(user=user, value=23)
+
+        res = visitor(ENDPOINT)
+        assert [elem['slug'] for elem in res.json] == ['two', 'one']
+        for elem, prompt in zip(res.json, (p_two, p_one)):
+            assert elem['title'] == prompt.title
+            assert (
+                elem['datasets']
+                == visitor(
+                    'api.charts.plot', params={'slug': prompt.slug}
+                ).json
+            )
+
+        res = visitor(ENDPOINT, query_string={'slug': ['one', p_off.slug]})
+        assert [elem['slug'] for elem in res.json] == ['one']
+
+    @staticmethod
+    def test_get_shared_sensor(
+        visitor, gen_prompt, gen_sensor, gen_user, monkeypatch
+    ):
+        user = gen_user()
+        p_one, p_two = gen_prompt('one'), gen_prompt('two')
+        sensor = gen_sensor()
+        Mapper.create(prompt=p_one, sensor=sensor)
+        Mapper.create(
+            prompt=p_two,
+            sensor=sensor,
+            convert=EnumConvert.INTEGER,
+            horizon=EnumHorizon.INVERT,
+        )
+        start = datetime.utcnow()
+        for num in range(3):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num + 0.25,
+                created=start - timedelta(minutes=num),
+            )
+
+        calls = []
+        fetch_points = charts.fetch_points
+
+        def _fetch_points(*args, **kwargs):
+            calls.append(args)
+            return fetch_points(*args, **kwargs)
+
+        monkeypatch.setattr(charts, 'fetch_points', _fetch_points)
+
+        res = visitor(ENDPOINT)
+        assert len(calls) == 1
+        one, two = [elem['datasets'][0]['data'] for elem in res.json[::-1]]
+        assert [elem['y'] for elem in one] == [0.25, 1.25, 2.25]
+        assert [elem['y'] for elem in two] == [0, -1, -2]
+
+    @staticmethod
+    def test_get_conditional(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        sensor.append(user=user, value=23)
+
+        res = visitor(ENDPOINT)
+        etag = res.request.headers['ETag']
+        assert res.request.last_modified is None
+        visitor(ENDPOINT, headers={'If-None-Match': etag}, code=304)
+
+        sensor.append(user=user, value=42)
+        res = visitor(ENDPOINT, headers={'If-None-Match': etag})
+        assert res.request.headers['ETag'] != etag
+        etag = res.request.headers['ETag']
+
+        prompt.update(title='changed')
+        res = visitor(ENDPOINT, headers={'If-None-Match': etag})
+        assert res.request.headers['ETag'] != etag
+        assert res.json[0]['title'] == 'changed'
+
+    @staticmethod
+    @mark.parametrize('num', [1, 3, 6])
+    def test_get_query_count(
+        num, queries, visitor, gen_prompt, gen_sensor, gen_user
+    ):
+        p_one, p_two, user = gen_prompt('one'), gen_prompt('two'), gen_user()
+        for idx in range(num):
+            sensor = gen_sensor(f'sensor_{idx}')
+            Mapper.create(prompt=p_one, sensor=sensor)
+            Mapper.create(prompt=p_two, sensor=sensor)
+            sensor.append(user=user, value=idx)
+
+        DB.session.expire_all()
+        queries.clear()
+        res = visitor(ENDPOINT)
+        assert [len(elem['datasets']) for elem in res.json] == [num, num]
+        assert len(queries) == 4
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from flask import url_for
 from pytest import mark
 
+from observatory.instance import CHARTS_CACHE
 from observatory.models.mapper import (
     EnumColor,
     EnumConvert,
@@ -10,7 +11,9 @@ from observatory.models.mapper import (
     Mapper,
 )
 from observatory.models.point import Point
-from observatory.start.environment import BACKLOG_DAYS
+from observatory.rest.charts import ChartsPlot
+from observatory.start.environment import API_PLOT_POINTS, BACKLOG_DAYS
+from observatory.start.extensions import DB
 
 ENDPOINT = 'api.charts.plot'
 
@@ -102,6 +105,7 @@ class TestChartsPlot:
                 'display': {
                     'logic': {
                         'color': m_two.color.color,
+                        'cursor': p_two_one.prime,
                         'epoch': p_two_one.created_epoch_ms,
                         'stamp': p_two_one.created_fmt,
                     },
@@ -135,6 +139,7 @@ class TestChartsPlot:
                 'display': {
                     'logic': {
                         'color': m_one.color.color,
+                        'cursor': p_two_one.prime,
                         'epoch': p_one_one.created_epoch_ms,
                         'stamp': p_one_one.created_fmt,
                     },
@@ -154,3 +159,417 @@ class TestChartsPlot:
                 'steppedLine': False,
             },
         ]
+
+    @staticmethod
+    def test_get_max_points(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        start = datetime.utcnow()
+        for num in range(API_PLOT_POINTS + 5):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num % 7,
+                created=start - timedelta(seconds=num),
+                _commit=False,
+            )
+        DB.session.commit()
+
+        res = visitor(ENDPOINT, params={'slug': prompt.slug})
+        (data,) = res.json
+        assert len(data['data']) == API_PLOT_POINTS
+        assert data['display']['plain']['points'] == API_PLOT_POINTS + 5
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'max_points': 23},
+        )
+        (data,) = res.json
+        assert len(data['data']) == 23
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'max_points': 0},
+        )
+        (data,) = res.json
+        assert len(data['data']) == API_PLOT_POINTS + 5
+
+    @staticmethod
+    def test_get_max_points_invalid(visitor, gen_prompt, gen_sensor):
+        prompt = gen_prompt()
+        Mapper.create(prompt=prompt, sensor=gen_sensor())
+
+        for value in ('-1', 'many'):
+            res = visitor(
+                ENDPOINT,
+                params={'slug': prompt.slug},
+                query_string={'max_points': value},
+                code=400,
+            )
+            assert 'max_points' in res.json['message']
+
+    @staticmethod
+    def test_get_window(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        start = datetime.utcnow().replace(microsecond=0)
+        points = [
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num,
+                created=start - timedelta(hours=num),
+            )
+            for num in range(5)
+        ]
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={
+                'from': points[3].created_epoch_ms,
+                'to': points[1].created_epoch_ms,
+            },
+        )
+        (data,) = res.json
+        assert [elem['y'] for elem in data['data']] == [1, 2, 3]
+        assert data['display']['plain']['points'] == 3
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'from': points[0].created_epoch_ms + 1000},
+        )
+        assert res.json == []
+
+    @staticmethod
+    def test_get_window_invalid(visitor, gen_prompt, gen_sensor):
+        prompt = gen_prompt()
+        Mapper.create(prompt=prompt, sensor=gen_sensor())
+
+        for key in ('from', 'to'):
+            res = visitor(
+                ENDPOINT,
+                params={'slug': prompt.slug},
+                query_string={key: 'yesterday'},
+                code=400,
+            )
+            assert key in res.json['message']
+
+    @staticmethod
+    def test_get_since(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, user = gen_prompt(), gen_user()
+        s_one, s_two = gen_sensor('one'), gen_sensor('two')
+        Mapper.create(prompt=prompt, sensor=s_one)
+        Mapper.create(prompt=prompt, sensor=s_two)
+        start = datetime.utcnow().replace(microsecond=0)
+        for num in range(3):
+            s_one.append(user=user, value=num)
+            Point.create(
+                sensor=s_one,
+                user=user,
+                value=num,
+                created=start - timedelta(hours=1 + num),
+            )
+        Point.create(
+            sensor=s_two,
+            user=user,
+            value=23,
+            created=start - timedelta(hours=2),
+        )
+
+        res = visitor(ENDPOINT, params={'slug': prompt.slug})
+        full = {elem['display']['plain']['slug']: elem for elem in res.json}
+        (cursor,) = {elem['display']['logic']['cursor'] for elem in res.json}
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': cursor},
+        )
+        assert [elem['display']['plain']['slug'] for elem in res.json] == list(
+            full
+        )
+        for elem in res.json:
+            assert elem['data'] == []
+            assert (
+                elem['display']
+                == full[elem['display']['plain']['slug']]['display']
+            )
+
+        lagging = Point.create(
+            sensor=s_two,
+            user=user,
+            value=42,
+            created=start - timedelta(hours=3),
+        )
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': cursor},
+        )
+        two, one = res.json
+        assert two['display']['plain']['slug'] == s_two.slug
+        assert one['data'] == []
+        assert two['data'] == [{'x': lagging.created_epoch_ms, 'y': 42.0}]
+        assert two['display']['plain']['points'] == 2
+        assert one['display']['plain']['points'] == 6
+        assert one['display']['plain']['points'] == (
+            full[s_one.slug]['display']['plain']['points']
+        )
+        assert two['display']['logic']['cursor'] == lagging.prime
+        assert one['display']['logic']['cursor'] == lagging.prime
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': lagging.prime},
+        )
+        assert [elem['data'] for elem in res.json] == [[], []]
+
+    @staticmethod
+    def test_get_since_deleted_newest(
+        visitor, gen_prompt, gen_sensor, gen_user
+    ):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        sensor.append(user=user, value=1)
+        drop = [sensor.append(user=user, value=value) for value in (2, 3)]
+
+        res = visitor(ENDPOINT, params={'slug': prompt.slug})
+        (cursor,) = {elem['display']['logic']['cursor'] for elem in res.json}
+        assert cursor == drop[-1].prime
+
+        for point in drop:
+            point.delete()
+        new = sensor.append(user=user, value=4)
+        assert new.prime > cursor
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': cursor},
+        )
+        (elem,) = res.json
+        assert elem['data'] == [{'x': new.created_epoch_ms, 'y': 4.0}]
+        assert elem['display']['logic']['cursor'] == new.prime
+        assert elem['display']['plain']['points'] == 2
+
+    @staticmethod
+    def test_get_since_outdated(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        Point.create(
+            sensor=sensor,
+            user=user,
+            value=5,
+            created=datetime.utcnow() - timedelta(days=BACKLOG_DAYS, hours=1),
+        )
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': 0},
+        )
+        assert res.json == []
+
+    @staticmethod
+    def test_get_since_invalid(visitor, gen_prompt, gen_sensor):
+        prompt = gen_prompt()
+        Mapper.create(prompt=prompt, sensor=gen_sensor())
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': 'later'},
+            code=400,
+        )
+        assert 'since' in res.json['message']
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'since': -1},
+            code=400,
+        )
+        assert 'since' in res.json['message']
+
+    @staticmethod
+    def test_get_modified_since_edit(
+        visitor, gen_prompt, gen_sensor, gen_user
+    ):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        mapper = Mapper.create(prompt=prompt, sensor=sensor)
+        sensor.append(user=user, value=23)
+        params = {'slug': prompt.slug}
+        since = {'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'}
+
+        res = visitor(ENDPOINT, params=params)
+        assert res.request.last_modified is None
+
+        mapper.update(color=EnumColor.RED)
+        res = visitor(ENDPOINT, params=params, headers=since)
+        assert res.json[0]['borderColor'] == EnumColor.RED.color
+
+        sensor.update(title='changed')
+        res = visitor(ENDPOINT, params=params, headers=since)
+        assert res.json[0]['label'] == 'changed'
+
+    @staticmethod
+    def test_get_conditional(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        mapper = Mapper.create(prompt=prompt, sensor=sensor)
+        params = {'slug': prompt.slug}
+
+        res = visitor(ENDPOINT, params=params)
+        assert res.json == []
+        etag = res.request.headers['ETag']
+        assert 'Last-Modified' not in res.request.headers
+
+        res = visitor(
+            ENDPOINT, params=params, headers={'If-None-Match': etag}, code=304
+        )
+        assert res.page == ''
+
+        sensor.append(user=user, value=23)
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert len(res.json) == 1
+        assert res.request.last_modified is None
+        assert res.request.headers['ETag'] != etag
+        etag = res.request.headers['ETag']
+
+        visitor(
+            ENDPOINT, params=params, headers={'If-None-Match': etag}, code=304
+        )
+
+        res = visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-None-Match': etag},
+            query_string={'max_points': 5},
+        )
+        assert res.request.headers['ETag'] != etag
+
+        mapper.update(color=EnumColor.RED)
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.json[0]['borderColor'] == EnumColor.RED.color
+        etag = res.request.headers['ETag']
+
+        sensor.update(description='changed')
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.json[0]['display']['plain']['description'] == 'changed'
+        etag = res.request.headers['ETag']
+
+        mapper.update(active=False)
+        visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-None-Match': etag},
+            code=410,
+        )
+
+    @staticmethod
+    def test_get_cached(
+        visitor, gen_prompt, gen_sensor, gen_user, monkeypatch
+    ):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        sensor.append(user=user, value=23)
+        params = {'slug': prompt.slug}
+
+        calls = []
+        render = ChartsPlot.render
+
+        def _render(*args):
+            calls.append(True)
+            return render(*args)
+
+        monkeypatch.setattr(ChartsPlot, 'render', staticmethod(_render))
+
+        first = visitor(ENDPOINT, params=params)
+        assert len(first.json) == 1
+        assert calls == [True]
+
+        again = visitor(ENDPOINT, params=params)
+        assert again.json == first.json
+        assert again.request.headers['ETag'] == first.request.headers['ETag']
+        assert again.request.mimetype == 'application/json'
+        assert calls == [True]
+
+        visitor(ENDPOINT, params=params, query_string={'max_points': 5})
+        assert calls == [True, True]
+
+        sensor.append(user=user, value=42)
+        res = visitor(ENDPOINT, params=params)
+        assert len(res.json[0]['data']) == 2
+        assert calls == [True, True, True]
+
+        assert CHARTS_CACHE.invalidate_sensors(sensor.prime) == 2
+        visitor(ENDPOINT, params=params)
+        assert calls == [True, True, True, True]
+
+    @staticmethod
+    def test_get_columnar(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        start = datetime.utcnow()
+        for num in range(5):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num,
+                created=start - timedelta(minutes=num),
+            )
+        params = {'slug': prompt.slug}
+
+        (plain,) = visitor(ENDPOINT, params=params).json
+        (column,) = visitor(
+            ENDPOINT, params=params, query_string={'format': 'columnar'}
+        ).json
+        (delta,) = visitor(
+            ENDPOINT,
+            params=params,
+            query_string={'format': 'columnar', 'delta': 'true'},
+        ).json
+
+        xs = [elem['x'] for elem in plain['data']]
+        ys = [elem['y'] for elem in plain['data']]
+        assert column['data'] == dict(delta=False, x=xs, y=ys)
+        assert delta['data']['delta'] is True
+        assert delta['data']['y'] == ys
+        assert delta['data']['x'][0] == xs[0]
+        assert delta['data']['x'][1:] == [
+            cur - prev for prev, cur in zip(xs, xs[1:])
+        ]
+        for payload in (column, delta):
+            assert {**payload, 'data': None} == {**plain, 'data': None}
+
+    @staticmethod
+    def test_get_format_wrong(visitor, gen_prompt, gen_sensor):
+        prompt = gen_prompt()
+        Mapper.create(prompt=prompt, sensor=gen_sensor())
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            query_string={'format': 'wrong'},
+            code=400,
+        )
+        assert 'format' in res.json['message']
+
+    @staticmethod
+    @mark.parametrize('num', [1, 3, 6])
+    def test_get_query_count(
+        num, queries, visitor, gen_prompt, gen_sensor, gen_user
+    ):
+        prompt, user = gen_prompt('plot'), gen_user()
+        for idx in range(num):
+            sensor = gen_sensor(f'sensor_{idx}')
+            Mapper.create(prompt=prompt, sensor=sensor)
+            sensor.append(user=user, value=idx)
+
+        DB.session.expire_all()
+        queries.clear()
+        res = visitor(ENDPOINT, params={'slug': 'plot'})
+        assert len(res.json) == num
+        assert len(queries) == 4
@@ -1,16 +1,28 @@
 from collections import namedtuple
 from datetime import datetime, timedelta
+from functools import partial
+from json import dumps
 
+from flask_restful import marshal
 from flask_restful.fields import Boolean, Float, Integer, String
-from pytest import mark
+from pytest import mark, raises
 
 from observatory.lib.clock import epoch_milliseconds
+from observatory.lib.sample import lttb, minmax
 from observatory.models.mapper import EnumConvert, EnumHorizon, Mapper
 from observatory.models.point import Point
 from observatory.rest.charts import (
     assemble,
     collect_generic,
     collect_points,
+    columns,
+    cursor_prime,
+    dataset,
+    dataset_serializer,
+    downsample,
+    epoch_stamp,
+    fetch_counts,
+    fetch_points,
     get_value_step_types,
 )
 from observatory.start.environment import BACKLOG_DAYS
@@ -154,9 +166,33 @@ class TestChartsPlotFunc:
         ]:
             mapper.update(horizon=horizon, convert=convert)
             assert list(collect_points(mapper, sensor)) == [
-                {'x': epoch_milliseconds(xx), 'y': yy} for xx, yy in params
+                (epoch_milliseconds(xx), yy) for xx, yy in params
             ]
 
+    @staticmethod
+    def test_collect_points_window(gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        mapper = Mapper.create(prompt=prompt, sensor=sensor)
+        start = datetime.utcnow().replace(microsecond=0)
+        stamps = [start - timedelta(hours=num) for num in range(5)]
+        for num, stamp in enumerate(stamps):
+            Point.create(sensor=sensor, user=user, value=num, created=stamp)
+
+        def _xs(**kwargs):
+            return [xx for xx, _ in collect_points(mapper, sensor, **kwargs)]
+
+        assert _xs() == [epoch_milliseconds(stamp) for stamp in stamps]
+        assert _xs(start=stamps[2]) == [
+            epoch_milliseconds(stamp) for stamp in stamps[:3]
+        ]
+        assert _xs(end=stamps[2]) == [
+            epoch_milliseconds(stamp) for stamp in stamps[2:]
+        ]
+        assert _xs(start=stamps[3], end=stamps[1]) == [
+            epoch_milliseconds(stamp) for stamp in stamps[1:4]
+        ]
+        assert _xs(start=stamps[0] + timedelta(seconds=1)) == []
+
     @staticmethod
     def test_assemble_inactive_empty(gen_prompt, gen_sensor):
         prompt, sensor = gen_prompt(), gen_sensor()
@@ -234,15 +270,11 @@ class TestChartsPlotFunc:
                 (
                     {
                         'borderColor': mapper.color.color,
-                        'data': [
-                            {
-                                'x': point.created_epoch_ms,
-                                'y': ex.value,
-                            }
-                        ],
+                        'data': [(point.created_epoch_ms, ex.value)],
                         'display': {
                             'logic': {
                                 'color': mapper.color.color,
+                                'cursor': point.prime,
                                 'epoch': point.created_epoch_ms,
                                 'stamp': point.created_fmt,
                             },
@@ -265,3 +297,226 @@ class TestChartsPlotFunc:
                     ex.step_type,
                 )
             ]
+
+    @staticmethod
+    def test_downsample(gen_prompt, gen_sensor):
+        mapper = Mapper.create(prompt=gen_prompt(), sensor=gen_sensor())
+        points = [(num, num % 5) for num in range(100)]
+
+        for convert, func in (
+            (EnumConvert.NATURAL, partial(lttb, xkey=0, ykey=1)),
+            (EnumConvert.INTEGER, partial(lttb, xkey=0, ykey=1)),
+            (EnumConvert.BOOLEAN, partial(minmax, ykey=1)),
+        ):
+            mapper.update(convert=convert)
+            assert downsample(mapper, points, 10) == func(points, 10)
+            assert downsample(mapper, points, 0) == points
+
+    @staticmethod
+    def test_assemble_max_points(gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        start = datetime.utcnow()
+        for num in range(50):
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=num,
+                created=start - timedelta(minutes=num),
+            )
+
+        ((payload, _, _),) = assemble(prompt, max_points=10)
+        assert len(payload['data']) == 10
+        assert payload['display']['plain']['points'] == 50
+
+        ((payload, _, _),) = assemble(prompt, max_points=0)
+        assert len(payload['data']) == 50
+
+    @staticmethod
+    def test_epoch_stamp():
+        assert epoch_stamp('0') == datetime.utcfromtimestamp(0)
+        assert epoch_stamp(1609495200000) == datetime(2021, 1, 1, 10)
+
+        for value in (None, '', 'now', '1.5', '1' * 42):
+            with raises(ValueError):
+                epoch_stamp(value)
+
+    @staticmethod
+    def test_cursor_prime():
+        assert cursor_prime('0') == 0
+        assert cursor_prime(23) == 23
+        assert cursor_prime('42') == 42
+
+        for value in (None, '', 'soon', '1.5', '-1'):
+            with raises(ValueError):
+                cursor_prime(value)
+
+    @staticmethod
+    def test_collect_points_since(gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        mapper = Mapper.create(prompt=prompt, sensor=sensor)
+        start = datetime.utcnow().replace(microsecond=0)
+        old = Point.create(sensor=sensor, user=user, value=1, created=start)
+        same = Point.create(
+            sensor=sensor,
+            user=user,
+            value=2,
+            created=start + timedelta(microseconds=5),
+            _commit=False,
+        )
+        replay = Point.create(
+            sensor=sensor,
+            user=user,
+            value=3,
+            created=start - timedelta(minutes=1),
+        )
+
+        assert list(collect_points(mapper, sensor, since=old.prime)) == [
+            (same.created_epoch_ms, 2.0),
+            (replay.created_epoch_ms, 3.0),
+        ]
+        assert list(collect_points(mapper, sensor, since=replay.prime)) == []
+
+    @staticmethod
+    def test_dataset_serializer_cached():
+        assert dataset_serializer(Float, Boolean) is dataset_serializer(
+            Float, Boolean
+        )
+        assert dataset_serializer(Float, Boolean) is not dataset_serializer(
+            Integer, Boolean
+        )
+
+    @staticmethod
+    def test_dataset_serializer_marshal(gen_prompt, gen_sensor, gen_user):
+        prompt, user = gen_prompt(), gen_user()
+        start = datetime.utcnow()
+        for convert in EnumConvert:
+            sensor = gen_sensor(convert.name.lower())
+            Mapper.create(prompt=prompt, sensor=sensor, convert=convert)
+            for num in range(5):
+                Point.create(
+                    sensor=sensor,
+                    user=user,
+                    value=num * 1.5 - 3,
+                    created=start - timedelta(minutes=num),
+                )
+
+        payloads = list(assemble(prompt))
+        assert len(payloads) == len(EnumConvert)
+        for payload, value_type, step_type in payloads:
+            legacy = dict(
+                payload,
+                data=[dict(x=xx, y=yy) for xx, yy in payload['data']],
+            )
+            assert dumps(
+                dataset_serializer(value_type, step_type)(payload),
+                sort_keys=True,
+            ) == dumps(
+                marshal(legacy, dataset(value_type, step_type)),
+                sort_keys=True,
+            )
+
+    @staticmethod
+    def test_dataset_serializer_defaults():
+        for value_type, step_type in (
+            (Float, Boolean),
+            (Integer, Boolean),
+            (Float, String),
+        ):
+            for payload in (
+                {},
+                {'data': None, 'display': None, 'steppedLine': None},
+                {'data': [(None, None)], 'display': {'logic': None}},
+            ):
+                legacy = dict(payload)
+                if payload.get('data'):
+                    legacy['data'] = [{}]
+                assert dataset_serializer(value_type, step_type)(
+                    payload
+                ) == marshal(legacy, dataset(value_type, step_type))
+
+    @staticmethod
+    def test_columns():
+        points = [(1000, 1.5), (3000, 2.5), (3500, -1)]
+        assert columns([]) == dict(delta=False, x=[], y=[])
+        assert columns(points) == dict(
+            delta=False, x=[1000, 3000, 3500], y=[1.5, 2.5, -1]
+        )
+        assert columns(points, delta=True) == dict(
+            delta=True, x=[1000, 2000, 500], y=[1.5, 2.5, -1]
+        )
+
+    @staticmethod
+    def test_dataset_serializer_columnar():
+        payload = dict(
+            borderColor='#fff',
+            data=columns([(1000, 1.5), (3000, None)], delta=True),
+            label='demo',
+        )
+        for value_type, step_type in (
+            (Float, Boolean),
+            (Integer, Boolean),
+            (Float, String),
+        ):
+            assert dataset_serializer(value_type, step_type, True)(
+                payload
+            ) == marshal(payload, dataset(value_type, step_type, True))
+
+    @staticmethod
+    def test_fetch_points(gen_sensor, gen_user):
+        s_one, s_two, user = gen_sensor('one'), gen_sensor('two'), gen_user()
+        assert fetch_points([]) == {}
+        assert fetch_points([s_one]) == {s_one.prime: []}
+
+        start = datetime.utcnow()
+        one = Point.create(sensor=s_one, user=user, value=1, created=start)
+        two = Point.create(
+            sensor=s_one,
+            user=user,
+            value=2,
+            created=start + timedelta(minutes=1),
+        )
+        other = Point.create(sensor=s_two, user=user, value=3, created=start)
+        assert fetch_points([s_one, s_two]) == {
+            s_one.prime: [
+                (two.created_epoch_ms, 2.0, two.prime),
+                (one.created_epoch_ms, 1.0, one.prime),
+            ],
+            s_two.prime: [(other.created_epoch_ms, 3.0, other.prime)],
+        }
+        assert fetch_points([s_one], end=start) == {
+            s_one.prime: [(one.created_epoch_ms, 1.0, one.prime)]
+        }
+        assert fetch_points([s_one], since=one.prime) == {
+            s_one.prime: [(two.created_epoch_ms, 2.0, two.prime)]
+        }
+
+    @staticmethod
+    def test_fetch_counts(gen_sensor, gen_user):
+        s_one, s_two, user = gen_sensor('one'), gen_sensor('two'), gen_user()
+        assert fetch_counts([]) == {}
+        assert fetch_counts([s_one, s_two]) == {}
+
+        start = datetime.utcnow()
+        Point.create(sensor=s_one, user=user, value=1, created=start)
+        Point.create(sensor=s_one, user=user, value=2, created=start)
+        assert fetch_counts([s_one, s_two]) == {s_one.prime: 2}
+        assert fetch_counts([s_one], start=start + timedelta(1)) == {}
+
+    @staticmethod
+    def test_assemble_memo(gen_prompt, gen_sensor, gen_user):
+        prompt, sensor, user = gen_prompt(), gen_sensor(), gen_user()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        point = sensor.append(user=user, value=5)
+
+        memo = {}
+        ((payload, _, _),) = assemble(prompt, memo=memo)
+        assert memo == {
+            sensor.prime: [(point.created_epoch_ms, 5.0, point.prime)]
+        }
+        assert payload['data'] == [(point.created_epoch_ms, 5.0)]
+
+        memo[sensor.prime] = [(23, 42.0, 1337)]
+        ((payload, _, _),) = assemble(prompt, memo=memo)
+        assert payload['data'] == [(23, 42.0)]
+        assert payload['display']['logic']['cursor'] == 1337
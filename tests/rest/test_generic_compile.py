@@ -0,0 +1,89 @@
+from flask_restful import marshal
+from flask_restful.fields import (
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    List,
+    Nested,
+    String,
+)
+from pytest import raises
+
+from observatory.rest.generic import (
+    compile_field,
+    compile_fields,
+    compile_rows,
+)
+
+FIELDS = dict(
+    flag=Boolean(default=True),
+    name=String(default=''),
+    number=Float(default=0.5),
+    rows=List(
+        Nested(nested=dict(one=Integer(default=0), two=Float(default=0)))
+    ),
+    inner=Nested(default={}, nested=dict(text=String())),
+    blank=Nested(allow_null=True, nested=dict(text=String())),
+    empty=Nested(nested=dict(text=String(default='-'))),
+)
+
+
+def test_compile_plain():
+    for field, value in (
+        (Boolean(), 0),
+        (Float(), '2.5'),
+        (Integer(), 4.2),
+        (String(), 23),
+    ):
+        assert compile_field(field)(value) == field.format(value)
+        assert compile_field(field)(None) == field.default
+
+
+def test_compile_fields():
+    serialize = compile_fields(FIELDS)
+    for obj in (
+        {},
+        {
+            'flag': 0,
+            'name': 42,
+            'number': 3,
+            'rows': [(1.5, 2), (None, None)],
+            'inner': {'text': 'demo'},
+            'blank': {},
+            'empty': {'text': None},
+        },
+    ):
+        legacy = dict(obj)
+        if obj.get('rows'):
+            legacy['rows'] = [{'one': 1.5, 'two': 2}, {}]
+        assert serialize(obj) == marshal(legacy, FIELDS)
+
+
+def test_compile_rows():
+    serialize = compile_rows(dict(x=Integer(), y=String()))
+    assert serialize([]) == []
+    assert serialize([(1, 2), (3.5, None)]) == [
+        {'x': 1, 'y': '2'},
+        {'x': 3, 'y': None},
+    ]
+
+
+def test_compile_list():
+    field = List(Integer(default=-1))
+    serialize = compile_field(field)
+    for value in (None, [], [1, 2.5, None, '3']):
+        assert (
+            serialize(value)
+            == marshal({'demo': value}, {'demo': field})['demo']
+        )
+
+
+def test_compile_unsupported():
+    for field in (
+        DateTime(),
+        String(attribute='other'),
+        List(DateTime()),
+    ):
+        with raises(ValueError):
+            compile_field(field)
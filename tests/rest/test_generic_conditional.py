@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from observatory.rest.generic import conditional, etag_of
+
+
+def test_etag_of():
+    assert etag_of() == etag_of()
+    assert etag_of('a', 1) == etag_of('a', 1)
+    assert etag_of('a', 1) != etag_of('a', 2)
+    assert etag_of('a', 1) != etag_of(1, 'a')
+    assert etag_of(None) != etag_of()
+    assert len(etag_of(datetime.utcnow())) == 40
+
+
+class TestConditional:
+    @staticmethod
+    def test_modified(app):
+        calls = []
+
+        def build():
+            calls.append(True)
+            return {'demo': 23}, 200
+
+        with app.test_request_context():
+            res = conditional(build, etag='demo')
+
+        assert res.status_code == 200
+        assert res.get_json() == {'demo': 23}
+        assert res.get_etag() == ('demo', False)
+        assert res.headers['Cache-Control'] == 'no-cache'
+        assert res.last_modified is None
+        assert calls == [True]
+
+    @staticmethod
+    def test_not_modified_etag(app):
+        calls = []
+
+        def build():
+            calls.append(True)
+            return {}, 200
+
+        with app.test_request_context(headers={'If-None-Match': '"demo"'}):
+            res = conditional(build, etag='demo')
+        assert res.status_code == 304
+        assert res.get_etag() == ('demo', False)
+        assert res.get_data() == b''
+        assert calls == []
+
+        with app.test_request_context(headers={'If-None-Match': '"other"'}):
+            res = conditional(build, etag='demo')
+        assert res.status_code == 200
+        assert calls == [True]
+
+    @staticmethod
+    def test_not_modified_since(app):
+        stamp = datetime(2021, 1, 23, 13, 37, 42, 123456)
+
+        def build():
+            return [], 200
+
+        with app.test_request_context(
+            headers={'If-Modified-Since': 'Sat, 23 Jan 2021 13:37:42 GMT'}
+        ):
+            res = conditional(build, etag='demo', last_modified=stamp)
+        assert res.status_code == 304
+        assert res.headers['Cache-Control'] == 'no-cache'
+        assert res.last_modified == stamp.replace(microsecond=0)
+
+        with app.test_request_context(
+            headers={'If-Modified-Since': 'Sat, 23 Jan 2021 13:37:41 GMT'}
+        ):
+            res = conditional(build, etag='demo', last_modified=stamp)
+        assert res.status_code == 200
+        assert res.last_modified == stamp.replace(microsecond=0)
@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta
+
+from flask import url_for
+from pytest import mark, raises
+
+from observatory.lib.clock import epoch_milliseconds
+from observatory.models.point import Point
+from observatory.models.rollup import Rollup
+from observatory.rest.sensor import (
+    AGGREGATE_FNS,
+    aggregate_fns,
+    aggregate_window,
+    bucket_span,
+)
+from observatory.start.extensions import DB
+
+ENDPOINT = 'api.sensor.aggregate'
+
+
+def _points(sensor, user, start):
+    return [
+        Point.create(
+            sensor=sensor,
+            user=user,
+            value=value,
+            created=start + timedelta(minutes=25 * num),
+        )
+        for num, value in enumerate((3.0, -1.0, 7.0, 2.0, 5.0))
+    ]
+
+
+@mark.usefixtures('session')
+class TestSensorAggregate:
+    @staticmethod
+    @mark.usefixtures('ctx_app')
+    def test_url():
+        assert url_for(ENDPOINT, slug='demo') == '/api/sensor/demo/aggregate'
+
+    @staticmethod
+    def test_bucket_span():
+        assert bucket_span('30s') == 30
+        assert bucket_span('5m') == 5 * 60
+        assert bucket_span(' 2H ') == 2 * 60 * 60
+        assert bucket_span('1d') == 24 * 60 * 60
+        for value in ('', '0s', '1w', 'h', '-1h', '367d'):
+            with raises(ValueError):
+                bucket_span(value)
+
+    @staticmethod
+    def test_aggregate_fns():
+        assert aggregate_fns('min') == ('min',)
+        assert aggregate_fns('max, Avg,max') == ('max', 'avg')
+        assert aggregate_fns(','.join(AGGREGATE_FNS)) == tuple(AGGREGATE_FNS)
+        for value in ('', 'sum', 'min,,max'):
+            with raises(ValueError):
+                aggregate_fns(value)
+
+    @staticmethod
+    def test_aggregate_window():
+        start = datetime(2021, 1, 1, 10, 25, 13)
+        end = datetime(2021, 1, 1, 12, 5, 0)
+        assert aggregate_window(60 * 60, start=start, end=end) == (
+            datetime(2021, 1, 1, 10, 0, 0),
+            datetime(2021, 1, 1, 13, 0, 0),
+        )
+        assert aggregate_window(15 * 60, start=start, end=end) == (
+            datetime(2021, 1, 1, 10, 15, 0),
+            datetime(2021, 1, 1, 12, 15, 0),
+        )
+
+    @staticmethod
+    def test_get_empty(visitor):
+        res = visitor(ENDPOINT, params={'slug': 'wrong'}, code=404)
+        assert 'not present' in res.json['message'].lower()
+
+    @staticmethod
+    def test_get_no_data(visitor, gen_sensor):
+        sensor = gen_sensor()
+        res = visitor(ENDPOINT, params={'slug': sensor.slug})
+        assert res.json == {
+            'bucket': 60 * 60,
+            'data': [],
+            'fn': list(AGGREGATE_FNS),
+            'sensor': sensor.slug,
+            'source': 'point',
+        }
+
+    @staticmethod
+    def test_get_wrong(visitor, gen_sensor):
+        sensor = gen_sensor()
+        for query_string in (
+            {'bucket': '1w'},
+            {'fn': 'sum'},
+            {'from': 'yesterday'},
+        ):
+            res = visitor(
+                ENDPOINT,
+                params={'slug': sensor.slug},
+                query_string=query_string,
+                code=400,
+            )
+            assert res.json['message']
+
+    @staticmethod
+    def test_get_rollup(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime.utcnow().replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(days=1)
+        points = _points(sensor, user, start)
+        stamp = epoch_milliseconds(start)
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            query_string={
+                'from': stamp,
+                'to': points[-1].created_epoch_ms,
+            },
+        )
+        assert res.json['source'] == 'rollup'
+        assert res.json['bucket'] == 60 * 60
+        assert res.json['data'] == [
+            {
+                'x': stamp,
+                'avg': 3.0,
+                'count': 3,
+                'last': 7.0,
+                'max': 7.0,
+                'min': -1.0,
+            },
+            {
+                'x': stamp + 60 * 60 * 1000,
+                'avg': 3.5,
+                'count': 2,
+                'last': 5.0,
+                'max': 5.0,
+                'min': 2.0,
+            },
+        ]
+
+    @staticmethod
+    def test_get_rollup_partial(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime.utcnow().replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(days=1)
+        points = _points(sensor, user, start)
+        Rollup.query.filter(Rollup.sensor_prime == sensor.prime).delete()
+        DB.session.commit()
+        points.append(
+            Point.create(
+                sensor=sensor,
+                user=user,
+                value=1.0,
+                created=start + timedelta(hours=3),
+            )
+        )
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            query_string={
+                'fn': 'count',
+                'from': epoch_milliseconds(start),
+                'to': points[-1].created_epoch_ms,
+            },
+        )
+        assert res.json['source'] == 'point'
+        assert [elem['count'] for elem in res.json['data']] == [3, 2, 1]
+
+    @staticmethod
+    def test_get_point(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        start = datetime.utcnow().replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(days=1)
+        points = _points(sensor, user, start)
+        stamp = epoch_milliseconds(start)
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            query_string={
+                'bucket': '45s',
+                'fn': 'count,last',
+                'from': stamp,
+                'to': points[-1].created_epoch_ms,
+            },
+        )
+        assert res.json['source'] == 'point'
+        assert res.json['fn'] == ['count', 'last']
+        assert res.json['data'] == [
+            {
+                'x': 45 * 1000 * (point.created_epoch_ms // (45 * 1000)),
+                'count': 1,
+                'last': point.value,
+            }
+            for point in points
+        ]
+
+    @staticmethod
+    def test_get_conditional(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        params = {'slug': sensor.slug}
+
+        res = visitor(ENDPOINT, params=params)
+        etag = res.request.headers['ETag']
+
+        visitor(
+            ENDPOINT, params=params, headers={'If-None-Match': etag}, code=304
+        )
+        res = visitor(
+            ENDPOINT,
+            params=params,
+            query_string={'fn': 'min'},
+            headers={'If-None-Match': etag},
+        )
+        assert res.json['fn'] == ['min']
+
+        Point.create(sensor=sensor, user=user, value=1.0)
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.request.headers['ETag'] != etag
+        assert [elem['count'] for elem in res.json['data']] == [1]
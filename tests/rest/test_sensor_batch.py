@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from json import dumps
+
+from flask import url_for
+from flask_restful import marshal
+from flask_restful.fields import Integer, String, Url
+from pytest import mark
+
+from observatory.models.point import Point
+from observatory.rest.sensor import SensorBatch
+
+ENDPOINT = 'api.sensor.batch'
+JSON = {'Content-Type': 'application/json'}
+
+
+@mark.usefixtures('session')
+class TestSensorBatch:
+    @staticmethod
+    @mark.usefixtures('ctx_app')
+    def test_url():
+        assert url_for(ENDPOINT) == '/api/points'
+
+    @staticmethod
+    def test_post_marshal():
+        mdef = SensorBatch.BATCH_POST
+        assert isinstance(mdef['length'], Integer)
+        assert isinstance(mdef['sensor'], String)
+        url = mdef['url']
+        assert isinstance(url, Url)
+        assert url.absolute is True
+        assert url.endpoint == 'api.sensor.points'
+
+    @staticmethod
+    def test_post_not_logged_in(visitor, gen_sensor):
+        sensor = gen_sensor()
+        visitor(
+            ENDPOINT,
+            method='post',
+            data=dumps({'points': [{'sensor': sensor.slug, 'value': 1}]}),
+            headers=JSON,
+            code=401,
+        )
+        assert Point.query.all() == []
+
+    @staticmethod
+    def test_post_wrong(visitor, gen_sensor, gen_user_loggedin):
+        gen_user_loggedin()
+        sensor = gen_sensor()
+        for data, expect in (
+            ({'some': 'thing'}, 'missing required parameter'),
+            ({'points': None}, 'must not be null'),
+            ({'points': []}, 'non empty list'),
+            ({'points': [1]}, 'invalid sensor'),
+            ({'points': [{'value': 1}]}, 'invalid sensor'),
+            ({'points': [{'sensor': 'a/b', 'value': 1}]}, 'invalid sensor'),
+            ({'points': [{'sensor': sensor.slug}]}, 'invalid value'),
+            (
+                {'points': [{'sensor': sensor.slug, 'value': 'error'}]},
+                'invalid value',
+            ),
+            (
+                {
+                    'points': [
+                        {'sensor': sensor.slug, 'value': 1, 'stamp': 'error'}
+                    ]
+                },
+                'invalid stamp',
+            ),
+        ):
+            res = visitor(
+                ENDPOINT,
+                method='post',
+                data=dumps(data),
+                headers=JSON,
+                code=400,
+            )
+            assert expect in res.json['message']['points'].lower()
+
+        assert Point.query.all() == []
+
+    @staticmethod
+    def test_post_not_present(visitor, gen_sensor, gen_user_loggedin):
+        gen_user_loggedin()
+        sensor = gen_sensor()
+
+        res = visitor(
+            ENDPOINT,
+            method='post',
+            data=dumps(
+                {
+                    'points': [
+                        {'sensor': sensor.slug, 'value': 1},
+                        {'sensor': 'wrong', 'value': 2},
+                        {'sensor': 'other', 'value': 3},
+                    ]
+                }
+            ),
+            headers=JSON,
+            code=404,
+        )
+        assert 'other, wrong not present' in res.json['message'].lower()
+        assert Point.query.all() == []
+
+    @staticmethod
+    def test_post_batch(visitor, gen_sensor, gen_user_loggedin):
+        user = gen_user_loggedin()
+        one, two = gen_sensor('one'), gen_sensor('two')
+        stamp = datetime.utcnow().replace(microsecond=0) - timedelta(hours=1)
+
+        res = visitor(
+            ENDPOINT,
+            method='post',
+            data=dumps(
+                {
+                    'points': [
+                        {'sensor': two.slug, 'value': 1},
+                        {'sensor': one.slug, 'value': 2},
+                        {
+                            'sensor': two.slug,
+                            'value': 3,
+                            'stamp': stamp.isoformat(),
+                        },
+                    ]
+                }
+            ),
+            headers=JSON,
+            code=201,
+        )
+
+        assert res.json == {
+            'count': 3,
+            'sensors': marshal([one, two], SensorBatch.BATCH_POST),
+        }
+        assert [elem['length'] for elem in res.json['sensors']] == [1, 2]
+
+        assert [point.value for point in one.query_points.all()] == [2]
+        new, old = sorted(two.query_points.all(), key=lambda p: p.value)
+        assert new.value == 1
+        assert old.value == 3
+        assert old.created == stamp
+        assert all(point.user == user for point in Point.query.all())
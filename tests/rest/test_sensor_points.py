@@ -1,14 +1,17 @@
 from datetime import datetime, timedelta
+from json import dumps
 
 from flask import url_for
 from flask_restful import marshal
-from flask_restful.fields import DateTime, Float, Integer, Nested, String
+from flask_restful.fields import DateTime, Float, Integer, Nested, String, Url
 from pytest import mark
 
 from observatory.models.point import Point
 from observatory.rest.sensor import SensorPoints
+from observatory.start.environment import STAMP_LEEWAY
 
 ENDPOINT = 'api.sensor.points'
+JSON = {'Content-Type': 'application/json'}
 
 
 @mark.usefixtures('session')
@@ -96,3 +99,189 @@ class TestSensorPoints:
                 value=old.value,
             ),
         ]
+
+    @staticmethod
+    def test_post_marshal():
+        mdef = SensorPoints.POINTS_POST
+        assert isinstance(mdef['length'], Integer)
+        assert isinstance(mdef['sensor'], String)
+        assert isinstance(mdef['user'], String)
+        assert isinstance(mdef['value'], Float)
+        url = mdef['url']
+        assert isinstance(url, Url)
+        assert url.absolute is True
+        assert url.endpoint == 'api.sensor.points'
+
+    @staticmethod
+    def test_post_not_logged_in(visitor, gen_sensor):
+        sensor = gen_sensor()
+        visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            method='post',
+            data=dumps({'points': [1, 2, 3]}),
+            headers=JSON,
+            code=401,
+        )
+        assert Point.query.all() == []
+
+    @staticmethod
+    def test_post_wrong(visitor, gen_sensor, gen_user_loggedin):
+        gen_user_loggedin()
+        sensor = gen_sensor()
+        future = datetime.utcnow() + timedelta(seconds=2 * STAMP_LEEWAY)
+        for data, expect in (
+            ({'some': 'thing'}, 'missing required parameter'),
+            ({'points': None}, 'must not be null'),
+            ({'points': []}, 'non empty list'),
+            ({'points': 'error'}, 'non empty list'),
+            ({'points': [1, 'error']}, 'invalid value'),
+            ({'points': [{'stamp': '2021-01-01'}]}, 'invalid value'),
+            ({'points': [{'value': 1, 'stamp': 'error'}]}, 'invalid stamp'),
+            (
+                {'points': [{'value': 1, 'stamp': future.isoformat()}]},
+                'in the future',
+            ),
+        ):
+            res = visitor(
+                ENDPOINT,
+                params={'slug': sensor.slug},
+                method='post',
+                data=dumps(data),
+                headers=JSON,
+                code=400,
+            )
+            assert expect in res.json['message']['points'].lower()
+
+        assert Point.query.all() == []
+
+    @staticmethod
+    def test_post_not_present(visitor, gen_user_loggedin):
+        gen_user_loggedin()
+        res = visitor(
+            ENDPOINT,
+            params={'slug': 'wrong'},
+            method='post',
+            data=dumps({'points': [1, 2, 3]}),
+            headers=JSON,
+            code=404,
+        )
+        assert 'not present' in res.json['message'].lower()
+
+    @staticmethod
+    def test_post_values(visitor, gen_sensor, gen_user_loggedin):
+        user = gen_user_loggedin()
+        sensor = gen_sensor()
+        values = [23.42, -1337, 0, 42]
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            method='post',
+            data=dumps({'points': values}),
+            headers=JSON,
+            code=201,
+        )
+
+        assert sorted(point.value for point in Point.query.all()) == sorted(
+            values
+        )
+        assert all(point.user == user for point in Point.query.all())
+        assert all(point.sensor == sensor for point in Point.query.all())
+
+        assert res.json == dict(
+            marshal(sensor, SensorPoints.POINTS_POST), count=len(values)
+        )
+        assert res.json['length'] == len(values)
+        assert res.json['url'] == url_for(
+            ENDPOINT, slug=sensor.slug, _external=True
+        )
+
+    @staticmethod
+    def test_post_stamps(visitor, gen_sensor, gen_user_loggedin):
+        gen_user_loggedin()
+        sensor = gen_sensor()
+        now = datetime.utcnow().replace(microsecond=0)
+        old = now - timedelta(hours=2)
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            method='post',
+            data=dumps(
+                {
+                    'points': [
+                        {'value': 1, 'stamp': old.isoformat()},
+                        {'value': 2, 'stamp': f'{now.isoformat()}+00:00'},
+                        {'value': 3},
+                    ]
+                }
+            ),
+            headers=JSON,
+            code=201,
+        )
+        assert res.json['count'] == 3
+
+        one, two, three = sorted(Point.query.all(), key=lambda p: p.value)
+        assert one.created == old
+        assert two.created == now
+        assert three.created >= now
+        assert sensor.latest == three
+
+    @staticmethod
+    def test_post_query_count(queries, visitor, gen_sensor, gen_user_loggedin):
+        gen_user_loggedin()
+        sensor = gen_sensor()
+        values = list(range(200))
+
+        queries.clear()
+        res = visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            method='post',
+            data=dumps({'points': values}),
+            headers=JSON,
+            code=201,
+        )
+        assert res.json['count'] == len(values)
+        assert res.json['length'] == len(values)
+        assert res.json['value'] == values[-1]
+        assert Point.query.count() == len(values)
+        assert len(queries) < 40
+
+    @staticmethod
+    def test_get_conditional(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        params = {'slug': sensor.slug}
+
+        res = visitor(ENDPOINT, params=params)
+        etag = res.request.headers['ETag']
+        assert etag
+        assert 'Last-Modified' not in res.request.headers
+
+        res = visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-None-Match': etag},
+            code=304,
+        )
+        assert res.page == ''
+        assert res.request.headers['ETag'] == etag
+
+        sensor.append(user=user, value=23)
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.json['length'] == 1
+        assert res.request.headers['ETag'] != etag
+        assert res.request.last_modified is None
+        etag = res.request.headers['ETag']
+
+        visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-None-Match': etag},
+            code=304,
+        )
+
+        sensor.update(title='changed')
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.json['title'] == 'changed'
@@ -5,7 +5,9 @@ from flask_restful import marshal
 from flask_restful.fields import DateTime, Float, Integer, Nested, String, Url
 from pytest import mark
 
+from observatory.instance import CHARTS_CACHE, RETENTION, STREAM
 from observatory.models.point import Point
+from observatory.models.sensor import Sensor
 from observatory.rest.sensor import SensorSingle
 
 ENDPOINT = 'api.sensor.single'
@@ -167,3 +169,100 @@ class TestSensorSingle:
             user=user.username,
             value=value,
         )
+
+    @staticmethod
+    def test_post_invalidates(visitor, gen_sensor, gen_user_loggedin):
+        gen_user_loggedin()
+        sensor = gen_sensor()
+        CHARTS_CACHE.put('one', (), etag='e', sensors=[sensor.prime], body=b'')
+        CHARTS_CACHE.put('two', (), etag='e', sensors=[], body=b'')
+
+        visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            method='post',
+            data={'value': 23},
+            code=201,
+        )
+        assert CHARTS_CACHE.get('one', (), etag='e') is None
+        assert CHARTS_CACHE.get('two', (), etag='e') == b''
+        assert STREAM.serial == 1
+
+    @staticmethod
+    def test_post_retention(
+        monkeypatch, visitor, gen_sensor, gen_user_loggedin, gen_points_batch
+    ):
+        def _cleanup(*_, **__):
+            raise RuntimeError('broken')
+
+        monkeypatch.setattr(Sensor, 'cleanup', _cleanup)
+        user = gen_user_loggedin()
+        sensor = gen_sensor()
+        gen_points_batch(sensor=sensor, user=user, old=3, new=2)
+        assert Point.query.count() == 5
+
+        visitor(
+            ENDPOINT,
+            params={'slug': sensor.slug},
+            method='post',
+            data={'value': 42},
+            code=201,
+        )
+
+        assert Point.query.count() == 6
+        assert getattr(RETENTION, '_count', 'error') == 1
+        assert getattr(RETENTION, '_wake').is_set() is True
+
+    @staticmethod
+    def test_get_modified_since_edit(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        sensor.append(user=user, value=23)
+        params = {'slug': sensor.slug}
+
+        res = visitor(ENDPOINT, params=params)
+        assert res.request.last_modified is None
+
+        sensor.update(title='changed')
+        res = visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'},
+        )
+        assert res.json['title'] == 'changed'
+
+    @staticmethod
+    def test_get_conditional(visitor, gen_sensor, gen_user):
+        sensor, user = gen_sensor(), gen_user()
+        params = {'slug': sensor.slug}
+
+        res = visitor(ENDPOINT, params=params)
+        etag = res.request.headers['ETag']
+        assert etag
+        assert 'Last-Modified' not in res.request.headers
+
+        res = visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-None-Match': etag},
+            code=304,
+        )
+        assert res.page == ''
+        assert res.request.headers['ETag'] == etag
+
+        sensor.append(user=user, value=23)
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.json['length'] == 1
+        assert res.request.headers['ETag'] != etag
+        assert res.request.last_modified is None
+        etag = res.request.headers['ETag']
+
+        visitor(
+            ENDPOINT,
+            params=params,
+            headers={'If-None-Match': etag},
+            code=304,
+        )
+
+        sensor.update(title='changed')
+        res = visitor(ENDPOINT, params=params, headers={'If-None-Match': etag})
+        assert res.json['title'] == 'changed'
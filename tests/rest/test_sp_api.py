@@ -1,6 +1,12 @@
 from flask import current_app, url_for
 from pytest import mark
 
+from observatory.instance import SPACE_API
+from observatory.models.value import Value
+from observatory.rest import sp_api
+from observatory.rest.sp_api import render
+from observatory.start.environment import SP_API_MAX_AGE, SP_API_PREFIX
+
 ENDPOINT = 'api.sp_api.json'
 
 
@@ -30,3 +36,38 @@ class TestSpaceApi:
             'location': {'lat': 0, 'lon': 0},
             'contact': {},
         }
+
+    @staticmethod
+    def test_conditional(visitor):
+        res = visitor(ENDPOINT, code=202)
+        etag = res.request.headers['ETag']
+        assert res.request.cache_control.public is True
+        assert res.request.cache_control.no_cache is None
+        assert res.request.cache_control.max_age == SP_API_MAX_AGE
+
+        res = visitor(ENDPOINT, headers={'If-None-Match': etag}, code=304)
+        assert res.page == ''
+        assert res.request.cache_control.max_age == SP_API_MAX_AGE
+
+        Value.set(key=f'{SP_API_PREFIX}.space', elem='space')
+        visitor(ENDPOINT, headers={'If-None-Match': etag}, code=304)
+
+        SPACE_API.reset()
+        res = visitor(ENDPOINT, headers={'If-None-Match': etag}, code=202)
+        assert res.json['space'] == 'space'
+        assert res.request.headers['ETag'] != etag
+
+    @staticmethod
+    def test_encoded_once(monkeypatch, visitor):
+        calls = []
+
+        def _render(content):
+            calls.append(content)
+            return render(content)
+
+        monkeypatch.setattr(sp_api, 'render', _render)
+
+        first = visitor(ENDPOINT, code=202).page
+        for _ in range(3):
+            assert visitor(ENDPOINT, code=202).page == first
+        assert calls == [SPACE_API.content]
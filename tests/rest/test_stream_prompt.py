@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+from json import loads
+
+from flask import url_for
+from pytest import fixture, mark
+
+from observatory.instance import STREAM
+from observatory.models.mapper import EnumConvert, EnumHorizon, Mapper
+from observatory.models.point import Point
+from observatory.rest.stream import (
+    event_cursor,
+    event_text,
+    event_texts,
+    query_events,
+)
+from observatory.start.extensions import DB
+
+ENDPOINT = 'api.stream.prompt'
+
+# pylint: disable=redefined-outer-name
+
+
+@fixture(scope='function')
+def short(monkeypatch):
+    monkeypatch.setattr(STREAM, 'poll', 0.01)
+    monkeypatch.setattr(STREAM, 'lifetime', 0.05)
+
+
+def _events(page):
+    result = []
+    for block in page.split('\n\n'):
+        fields = dict(
+            line.split(': ', 1)
+            for line in block.splitlines()
+            if line and not line.startswith(':')
+        )
+        if fields.get('event') == 'point':
+            result.append((int(fields['id']), loads(fields['data'])))
+    return result
+
+
+def test_event_cursor():
+    assert event_cursor('23') == 23
+    assert event_cursor(42) == 42
+    assert event_cursor('0') == 0
+    for value in (None, '', 'last', '-1', '1.5'):
+        assert event_cursor(value) is None
+
+
+@mark.usefixtures('session', 'short')
+class TestStreamPrompt:
+    @staticmethod
+    @mark.usefixtures('ctx_app')
+    def test_url():
+        assert url_for(ENDPOINT, slug='demo') == '/api/stream/prompt/demo'
+
+    @staticmethod
+    def test_get_empty(visitor):
+        res = visitor(ENDPOINT, params={'slug': 'wrong'}, code=404)
+        assert 'not present' in res.json['message'].lower()
+
+    @staticmethod
+    def test_get_inactive(visitor, gen_prompt, gen_sensor):
+        prompt = gen_prompt()
+        Mapper.create(prompt=prompt, sensor=gen_sensor(), active=False)
+        res = visitor(ENDPOINT, params={'slug': prompt.slug}, code=410)
+        assert 'not active' in res.json['message'].lower()
+
+    @staticmethod
+    def test_get_headers(visitor, gen_prompt, gen_sensor, gen_user):
+        prompt, sensor = gen_prompt(), gen_sensor()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        sensor.append(user=gen_user(), value=23)
+
+        res = visitor(ENDPOINT, params={'slug': prompt.slug})
+        assert res.request.mimetype == 'text/event-stream'
+        assert res.request.headers['Cache-Control'] == 'no-cache'
+        assert res.page.startswith('retry: 10\n\n')
+        assert ': idle\n\n' in res.page
+        assert _events(res.page) == []
+
+    @staticmethod
+    def test_get_events(visitor, gen_prompt, gen_sensor, gen_user):
+        user, prompt = gen_user(), gen_prompt()
+        s_one, s_two, s_off = (
+            gen_sensor('one'),
+            gen_sensor('two'),
+            gen_sensor('off'),
+        )
+        Mapper.create(prompt=prompt, sensor=s_one)
+        Mapper.create(
+            prompt=prompt,
+            sensor=s_two,
+            convert=EnumConvert.INTEGER,
+            horizon=EnumHorizon.INVERT,
+        )
+        Mapper.create(prompt=prompt, sensor=s_off, active=False)
+
+        start = datetime.utcnow()
+        old = s_one.append(user=user, value=1)
+        one = Point.create(
+            sensor=s_one,
+            user=user,
+            value=2.5,
+            created=start - timedelta(minutes=5),
+        )
+        s_off.append(user=user, value=3)
+        two = s_two.append(user=user, value=4.2)
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            headers={'Last-Event-ID': str(old.prime)},
+        )
+        assert _events(res.page) == [
+            (one.prime, dict(sensor='one', x=one.created_epoch_ms, y=2.5)),
+            (two.prime, dict(sensor='two', x=two.created_epoch_ms, y=-4)),
+        ]
+
+    @staticmethod
+    def test_get_events_deleted_newest(
+        visitor, gen_prompt, gen_sensor, gen_user
+    ):
+        user, prompt, sensor = gen_user(), gen_prompt(), gen_sensor()
+        Mapper.create(prompt=prompt, sensor=sensor)
+        sensor.append(user=user, value=1)
+        drop = [sensor.append(user=user, value=value) for value in (2, 3)]
+        cursor = drop[-1].prime
+
+        for point in drop:
+            point.delete()
+        new = sensor.append(user=user, value=4)
+
+        res = visitor(
+            ENDPOINT,
+            params={'slug': prompt.slug},
+            headers={'Last-Event-ID': str(cursor)},
+        )
+        assert _events(res.page) == [
+            (new.prime, dict(sensor=sensor.slug, x=new.created_epoch_ms, y=4))
+        ]
+
+    @staticmethod
+    def test_event_text(gen_prompt, gen_sensor, gen_user):
+        sensor = gen_sensor()
+        mapper = Mapper.create(prompt=gen_prompt(), sensor=sensor)
+        point = sensor.append(user=gen_user(), value=21)
+
+        assert event_text(point, mapper, 42.0) == (
+            f'id: {point.prime}\nevent: point\n'
+            f'data: {{"sensor": "{sensor.slug}", '
+            f'"x": {point.created_epoch_ms}, "y": 42.0}}\n\n'
+        )
+
+    @staticmethod
+    def test_event_texts(queries, gen_prompt, gen_sensor, gen_user):
+        prompt, user = gen_prompt(), gen_user()
+        s_one, s_two = gen_sensor('one'), gen_sensor('two')
+        Mapper.create(prompt=prompt, sensor=s_one, elevate=2.0)
+        Mapper.create(
+            prompt=prompt,
+            sensor=s_two,
+            convert=EnumConvert.BOOLEAN,
+            horizon=EnumHorizon.INVERT,
+        )
+        points = [
+            s_one.append(user=user, value=21),
+            s_two.append(user=user, value=-1),
+            s_one.append(user=user, value=1.5),
+        ]
+        prompt_prime = prompt.prime
+        DB.session.expire_all()
+
+        queries.clear()
+        events = event_texts(query_events(prompt_prime, 0).all())
+        assert len(queries) == 1
+
+        assert [prime for prime, _ in events] == [
+            point.prime for point in points
+        ]
+        assert [loads(text.split('data: ')[1])['y'] for _, text in events] == [
+            42.0,
+            -1.0,
+            3.0,
+        ]
@@ -8,6 +8,8 @@ from observatory.start.environment import (
     APP_NAME,
     FAVICON,
     HTML_LANG,
+    RETENTION_BACKGROUND,
+    SP_API_BACKGROUND,
     SP_API_ENABLE,
     TITLE,
 )
@@ -25,7 +27,9 @@ def test_base_config():
     assert conf.ICON and isinstance(conf.ICON, dict)
     assert conf.RESTFUL_JSON['indent'] is None
     assert conf.RESTFUL_JSON['sort_keys'] is True
+    assert conf.RETENTION_BACKGROUND == RETENTION_BACKGROUND
     assert conf.SECRET_KEY and isinstance(conf.SECRET_KEY, (str, bytes))
+    assert conf.SP_API_BACKGROUND == SP_API_BACKGROUND
     assert conf.SP_API_ENABLE == SP_API_ENABLE
     assert conf.TESTING is False
     assert conf.TITLE == TITLE
@@ -48,6 +52,8 @@ def test_test_config():
 
     assert conf.BCRYPT_LOG_ROUNDS == 5
     assert conf.DEBUG is False
+    assert conf.RETENTION_BACKGROUND is False
+    assert conf.SP_API_BACKGROUND is False
     assert conf.SP_API_ENABLE is True
     assert conf.SQLALCHEMY_DATABASE_URI == 'sqlite://'
     assert conf.TESTING is True
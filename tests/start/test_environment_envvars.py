@@ -67,6 +67,15 @@ def test_backlog_days(monkeypatch):
     assert environment.BACKLOG_DAYS == 1337
 
 
+def test_stamp_leeway(monkeypatch):
+    assert environment.STAMP_LEEWAY == 60
+
+    monkeypatch.setenv('STAMP_LEEWAY', '23')
+    reload(environment)
+
+    assert environment.STAMP_LEEWAY == 23
+
+
 def test_sp_api_enable(monkeypatch):
     assert environment.SP_API_ENABLE is True
 
@@ -94,6 +103,42 @@ def test_sp_api_refresh_sec(monkeypatch):
     assert environment.SP_API_REFRESH == 1337
 
 
+def test_sp_api_live_refresh(monkeypatch):
+    assert environment.SP_API_LIVE_REFRESH == 60
+
+    monkeypatch.setenv('SP_API_LIVE_REFRESH', '42')
+    reload(environment)
+
+    assert environment.SP_API_LIVE_REFRESH == 42
+
+
+def test_sp_api_max_age(monkeypatch):
+    assert environment.SP_API_MAX_AGE == 60
+
+    monkeypatch.setenv('SP_API_MAX_AGE', '23')
+    reload(environment)
+
+    assert environment.SP_API_MAX_AGE == 23
+
+
+def test_retention_background(monkeypatch):
+    assert environment.RETENTION_BACKGROUND is True
+
+    monkeypatch.setenv('RETENTION_BACKGROUND', 'off')
+    reload(environment)
+
+    assert environment.RETENTION_BACKGROUND is False
+
+
+def test_sp_api_background(monkeypatch):
+    assert environment.SP_API_BACKGROUND is False
+
+    monkeypatch.setenv('SP_API_BACKGROUND', 'on')
+    reload(environment)
+
+    assert environment.SP_API_BACKGROUND is True
+
+
 def test_title(monkeypatch):
     assert environment.TITLE == 'Observatory'
 
@@ -169,6 +214,27 @@ def test_api_plot_refresh_ms(monkeypatch):
     assert environment.API_PLOT_REFRESH_MS == 23
 
 
+def test_api_plot_cache(monkeypatch):
+    assert environment.API_PLOT_CACHE == 16
+
+    monkeypatch.setenv('API_PLOT_CACHE', '23')
+    reload(environment)
+
+    assert environment.API_PLOT_CACHE == 23
+
+
+def test_stream(monkeypatch):
+    assert environment.STREAM_POLL == 2
+    assert environment.STREAM_LIFETIME == 300
+
+    monkeypatch.setenv('STREAM_POLL', '23')
+    monkeypatch.setenv('STREAM_LIFETIME', '42')
+    reload(environment)
+
+    assert environment.STREAM_POLL == 23
+    assert environment.STREAM_LIFETIME == 42
+
+
 def test_taglines(monkeypatch):
     for num, line in enumerate(environment.TAGLINES):
         assert environment.TAGLINES[num] == line
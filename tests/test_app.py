@@ -1,4 +1,5 @@
-from observatory.instance import SPACE_API
+from observatory.app import register_background
+from observatory.instance import RETENTION, SPACE_API
 from observatory.lib.cli import BP_CLI
 from observatory.rest.charts import BP_REST_CHARTS
 from observatory.rest.mapper import BP_REST_MAPPER
@@ -6,6 +7,7 @@ from observatory.rest.owners import BP_REST_OWNERS
 from observatory.rest.prompt import BP_REST_PROMPT
 from observatory.rest.sensor import BP_REST_SENSOR
 from observatory.rest.sp_api import BP_REST_SP_API
+from observatory.rest.stream import BP_REST_STREAM
 from observatory.shared import (
     errorhandler,
     form_drop_mapper,
@@ -78,6 +80,7 @@ class TestApp:
             BP_REST_PROMPT,
             BP_REST_SENSOR,
             BP_REST_SP_API,
+            BP_REST_STREAM,
         ]
         for blueprint in app.blueprints.values():
             assert blueprint in blueprints
@@ -124,3 +127,31 @@ class TestApp:
     def test_jinja_config(app):
         assert app.jinja_env.lstrip_blocks is True
         assert app.jinja_env.trim_blocks is True
+
+    @staticmethod
+    def test_background(monkeypatch, app):
+        started = []
+        monkeypatch.setattr(SPACE_API, 'start', started.append)
+
+        register_background(app)
+        assert started == []
+
+        monkeypatch.setitem(app.config, 'SP_API_BACKGROUND', True)
+        register_background(app)
+        assert started == [app]
+
+        monkeypatch.setitem(app.config, 'SP_API_ENABLE', False)
+        register_background(app)
+        assert started == [app]
+
+    @staticmethod
+    def test_background_retention(monkeypatch, app):
+        started = []
+        monkeypatch.setattr(RETENTION, 'start', started.append)
+
+        register_background(app)
+        assert started == []
+
+        monkeypatch.setitem(app.config, 'RETENTION_BACKGROUND', True)
+        register_background(app)
+        assert started == [app]
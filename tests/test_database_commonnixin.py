@@ -36,3 +36,18 @@ class TestCommonMixin:
         assert CommonMixinPhony.query.all() == [cmn]
 
         assert CommonMixinPhony.by_slug(SLUG) == cmn
+
+    @staticmethod
+    def test_by_slugs():
+        one = CommonMixinPhony.create(
+            slug='one', title=TITLE, description=DESCRIPTION
+        )
+        two = CommonMixinPhony.create(
+            slug='two', title=TITLE, description=DESCRIPTION
+        )
+
+        assert CommonMixinPhony.by_slugs([]) == []
+        assert CommonMixinPhony.by_slugs(['none']) == []
+        assert CommonMixinPhony.by_slugs(['one']) == [one]
+        assert CommonMixinPhony.by_slugs(['one', 'one', 'none']) == [one]
+        assert CommonMixinPhony.by_slugs(('two', 'one')) == [one, two]
@@ -0,0 +1,83 @@
+from pytest import mark, raises
+
+from observatory.database import CountMixin, Model
+from observatory.start.extensions import DB
+
+# pylint: disable=no-member
+# pylint: disable=too-many-ancestors
+
+
+class CountMixinPhony(CountMixin, Model):
+    count_column = 'countmixinchildphony.parent_prime'
+
+
+class CountMixinChildPhony(Model):
+    parent_prime = DB.Column(
+        DB.Integer(),
+        DB.ForeignKey('countmixinphony.prime'),
+        nullable=False,
+    )
+
+
+class CountMixinBarePhony(CountMixin, Model):
+    pass
+
+
+@mark.usefixtures('session')
+class TestCountMixin:
+    @staticmethod
+    def test_point_count():
+        cnt = CountMixinPhony.create()
+        assert cnt.point_count == 0
+        assert cnt.length == 0
+
+    @staticmethod
+    def test_class_count_column():
+        assert (
+            CountMixinPhony._get_class_count_column()
+            is CountMixinChildPhony.__table__.c.parent_prime
+        )
+        with raises(AttributeError):
+            CountMixinBarePhony._get_class_count_column()
+
+    @staticmethod
+    def test_count_shift():
+        one, two = CountMixinPhony.create(), CountMixinPhony.create()
+
+        CountMixinPhony.count_shift(
+            DB.session.connection(), {one.prime: 5, two.prime: 0}
+        )
+        DB.session.commit()
+        assert one.length == 5
+        assert two.length == 0
+
+        CountMixinPhony.count_shift(
+            DB.session.connection(), {one.prime: -2, two.prime: +1}
+        )
+        DB.session.commit()
+        assert one.length == 3
+        assert two.length == 1
+
+    @staticmethod
+    def test_count_rebuild():
+        one, two = CountMixinPhony.create(), CountMixinPhony.create()
+        for parent, num in ((one, 3), (two, 2)):
+            for _ in range(num):
+                CountMixinChildPhony.create(parent_prime=parent.prime)
+        assert one.length == 0
+        assert two.length == 0
+
+        assert (
+            CountMixinPhony.count_rebuild(
+                DB.session.connection(), primes=[one.prime]
+            )
+            == 1
+        )
+        DB.session.commit()
+        assert one.length == 3
+        assert two.length == 0
+
+        assert CountMixinPhony.count_rebuild(DB.session.connection()) == 2
+        DB.session.commit()
+        assert one.length == 3
+        assert two.length == 2
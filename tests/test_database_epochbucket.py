@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from pytest import mark
+from sqlalchemy.dialects import postgresql
+
+from observatory.database import epoch_bucket
+from observatory.start.extensions import DB
+
+
+@mark.usefixtures('session')
+class TestEpochBucket:
+    @staticmethod
+    def test_compile():
+        expr = epoch_bucket(DB.column('created'), 60)
+        assert expr.span == 60
+        assert str(expr.compile(dialect=postgresql.dialect())) == (
+            'FLOOR(EXTRACT(EPOCH FROM created) / 60) * 60'
+        )
+        assert str(expr.compile(dialect=DB.engine.dialect)) == (
+            "CAST(strftime('%s', created) AS INTEGER) / 60 * 60"
+        )
+
+    @staticmethod
+    def test_execute():
+        stamp = datetime(2021, 1, 1, 10, 42, 23, 1337)
+        for span, expect in (
+            (1, 1609497743),
+            (60, 1609497720),
+            (60 * 60, 1609495200),
+            (60 * 60 * 24, 1609459200),
+        ):
+            assert (
+                DB.session.execute(
+                    DB.select([epoch_bucket(DB.literal(stamp), span)])
+                ).scalar()
+                == expect
+            )
@@ -1,5 +1,22 @@
-from observatory.instance import SPACE_API
+from observatory.instance import CHARTS_CACHE, RETENTION, SPACE_API, STREAM
+from observatory.logic.charts_cache import ChartsCache
+from observatory.logic.retention import Retention
 from observatory.logic.space_api import SpaceApi
+from observatory.logic.stream import Stream
+
+
+def test_charts_cache():
+    assert CHARTS_CACHE is not None
+    assert isinstance(CHARTS_CACHE, ChartsCache)
+    assert getattr(CHARTS_CACHE, '_content', 'error') == {}
+    assert getattr(CHARTS_CACHE, '_sensors', 'error') == {}
+
+
+def test_retention():
+    assert RETENTION is not None
+    assert isinstance(RETENTION, Retention)
+    assert getattr(RETENTION, '_count', 'error') == 0
+    assert getattr(RETENTION, '_last', 'error') is None
 
 
 def test_space_api():
@@ -7,3 +24,9 @@ def test_space_api():
     assert isinstance(SPACE_API, SpaceApi)
     assert getattr(SPACE_API, '_content', 'error') is None
     assert getattr(SPACE_API, '_last', 'error') is None
+
+
+def test_stream():
+    assert STREAM is not None
+    assert isinstance(STREAM, Stream)
+    assert getattr(STREAM, '_serial', 'error') == 0
@@ -4,7 +4,9 @@ from pytest import mark
 
 from observatory.shared import script_config_data
 from observatory.start.environment import (
+    API_PLOT_POINTS,
     API_PLOT_REFRESH_MS,
+    BACKLOG_DAYS,
     FMT_MOMENT_DAY,
     FMT_MOMENT_DEFAULT,
     FMT_MOMENT_HOUR,
@@ -21,6 +23,7 @@ from observatory.start.environment import (
 @mark.usefixtures('ctx_app')
 @mark.parametrize('enabled', (True, False))
 def test_script_config_data(enabled, monkeypatch):
+    api_plot_backlog_ms = BACKLOG_DAYS * 24 * 60 * 60 * 1000
     api_plot_base_url = url_for('api.charts.plot', slug='', _external=True)
     api_space_api_url = url_for('api.sp_api.json', _external=True)
     if not enabled:
@@ -36,7 +39,9 @@ def test_script_config_data(enabled, monkeypatch):
         assert '="' in line
         assert line.endswith('"')
 
+    assert f'data-api-plot-backlog-ms="{api_plot_backlog_ms}"' in text
     assert f'data-api-plot-base-url="{api_plot_base_url}"' in text
+    assert f'data-api-plot-points="{API_PLOT_POINTS}"' in text
     assert f'data-api-plot-refresh-ms="{API_PLOT_REFRESH_MS}"' in text
     assert f'data-api-space-api-url="{api_space_api_url}"' in text
     assert f'data-moment-default-format="{FMT_MOMENT_DEFAULT}"' in text
@@ -3,6 +3,7 @@ from collections import namedtuple
 from flask import url_for
 from pytest import fixture, mark
 
+from observatory.instance import CHARTS_CACHE
 from observatory.models.prompt import Prompt
 from observatory.models.sensor import Sensor
 
@@ -170,3 +171,23 @@ class TestMgntEditCommon:
         assert changed.description == description
         for key, val in _comm.extra.items():
             assert getattr(changed, key, 'error') == val.val
+
+    @staticmethod
+    def test_form_clears_cache(_comm):
+        _comm.login()
+        original = _comm.gen_common()
+        CHARTS_CACHE.put('demo', (), etag='etag', sensors=[], body=b'')
+
+        _comm.visitor(
+            _comm.endpoint,
+            params={'slug': original.slug},
+            method='post',
+            data={
+                'slug': original.slug,
+                'title': 'Changed',
+                **{key: val.val for key, val in _comm.extra.items()},
+                'submit': True,
+            },
+            code=302,
+        )
+        assert CHARTS_CACHE.get('demo', (), etag='etag') is None